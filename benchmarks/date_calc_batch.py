@@ -0,0 +1,88 @@
+"""Todos per second for the scalar and batch due date and display calculations.
+
+Run from the project root with:
+
+    python -m benchmarks.date_calc_batch [todo_count]
+"""
+
+import datetime
+import random
+import sys
+import time
+import typing
+
+from src import domain
+from src.domain import date_calc, date_calc_batch
+
+
+def main(*, todo_count: int) -> None:
+    rng = random.Random(0)
+
+    start_date = datetime.date(2020, 1, 1)
+
+    def random_frequency() -> domain.Frequency:
+        return rng.choice(
+            (
+                lambda: domain.Frequency.daily(start_date=start_date),
+                lambda: domain.Frequency.weekly(
+                    week_day=rng.choice(list(domain.Weekday)),
+                    advance_display_days=rng.randint(0, 6),
+                    expire_display_days=rng.randint(1, 6),
+                    start_date=start_date,
+                ),
+                lambda: domain.Frequency.xdays(
+                    days=rng.randint(1, 90),
+                    advance_display_days=rng.randint(0, 10),
+                    expire_display_days=rng.randint(1, 10),
+                    start_date=start_date,
+                ),
+                lambda: domain.Frequency.monthly(
+                    month_day=rng.randint(1, 28),
+                    advance_display_days=rng.randint(0, 10),
+                    expire_display_days=rng.randint(1, 10),
+                    start_date=start_date,
+                ),
+                lambda: domain.Frequency.once(
+                    due_date=start_date + datetime.timedelta(days=rng.randint(0, 2_000)),
+                    advance_display_days=rng.randint(0, 10),
+                    expire_display_days=rng.randint(1, 10),
+                    start_date=start_date,
+                ),
+            )
+        )()
+
+    frequencies = [random_frequency() for _ in range(todo_count)]
+    last_completed = [None if i % 2 else start_date + datetime.timedelta(days=i % 2_000) for i in range(todo_count)]
+
+    ref_date = domain.clock.today()
+
+    def scalar() -> None:
+        # the scalar functions are cached for today, clear them to time the calculation rather than the cache
+        date_calc.clear_cache()
+        for frequency, completed in zip(frequencies, last_completed):
+            date_calc.due_date(frequency=frequency, ref_date=ref_date)
+            date_calc.should_display(frequency=frequency, last_completed=completed)
+
+    def batch() -> None:
+        columns = date_calc_batch.FrequencyColumns.from_frequencies(frequencies)
+        date_calc_batch.due_dates(columns=columns, ref_date=ref_date)
+        date_calc_batch.should_display(columns=columns, last_completed=last_completed, ref_date=ref_date)
+
+    print(f"due date and display flag for {todo_count:,} todos")
+
+    for name, fn in (("scalar", scalar), ("batch", batch)):
+        elapsed = _best_of(fn, repeat=3)
+        print(f"{name:>10}: {elapsed:7.3f}s, {todo_count / elapsed:12,.0f} todos/s")
+
+
+def _best_of(fn: typing.Callable[[], None], /, *, repeat: int) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    main(todo_count=int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,148 @@
+"""Calls per second for the occurrence math behind each FrequencyType, before and after the closed-form rewrite.
+
+The legacy implementations are kept here, uncached, so the two can be compared side by side.
+
+Run from the project root with:
+
+    python -m benchmarks.frequency_occurrences [call_count]
+"""
+
+import calendar
+import datetime
+import itertools
+import sys
+import time
+import typing
+
+from src import domain
+from src.domain import date_calc
+from src.domain.irregular import x_weekday_of_month
+from src.domain.memorial_day import calculate_memorial_day
+
+
+def main(*, call_count: int) -> None:
+    ref_dates = [datetime.date(2000, 1, 1) + datetime.timedelta(days=i % 10_000) for i in range(call_count)]
+    week_days = list(domain.Weekday)
+
+    weekly = [
+        domain.Frequency.weekly(
+            week_day=week_days[i % 7],
+            advance_display_days=1,
+            expire_display_days=1,
+            start_date=datetime.date(2000, 1, 1),
+        )
+        for i in range(7)
+    ]
+
+    cases: dict[domain.FrequencyType, tuple[typing.Callable[[], None], typing.Callable[[], None]]] = {
+        domain.FrequencyType.Irregular: (
+            lambda: _each(
+                ref_dates,
+                lambda i, d: _legacy_x_weekday_of_month(
+                    year=d.year, month=d.month, week_num=i % 5 + 1, week_day=week_days[i % 7]
+                ),
+            ),
+            lambda: _each(
+                ref_dates,
+                lambda i, d: x_weekday_of_month(
+                    year=d.year, month=d.month, week_num=i % 5 + 1, week_day=week_days[i % 7]
+                ),
+            ),
+        ),
+        domain.FrequencyType.MemorialDay: (
+            lambda: _each(ref_dates, lambda _, d: _legacy_calculate_memorial_day(year=d.year)),
+            lambda: _each(ref_dates, lambda _, d: calculate_memorial_day(year=d.year)),
+        ),
+        domain.FrequencyType.Monthly: (
+            lambda: _each(ref_dates, lambda _, d: _legacy_monthly_next(year=d.year, month=d.month, month_day=15)),
+            lambda: _each(ref_dates, lambda _, d: date_calc._monthly_next(year=d.year, month=d.month, month_day=15)),
+        ),
+        domain.FrequencyType.Weekly: (
+            lambda: _each(ref_dates, lambda i, d: _legacy_weekly_next(frequency=weekly[i % 7], ref_date=d)),
+            lambda: _each(ref_dates, lambda i, d: date_calc.next_date(frequency=weekly[i % 7], ref_date=d)),
+        ),
+    }
+
+    print(f"{call_count:,} calls per frequency type")
+
+    for frequency_type, (legacy, closed_form) in cases.items():
+        legacy_elapsed = _best_of(legacy, repeat=3)
+        closed_form_elapsed = _best_of(closed_form, repeat=3)
+        print(
+            f"{frequency_type.name:>12}: {call_count / legacy_elapsed:12,.0f} calls/s before, "
+            f"{call_count / closed_form_elapsed:12,.0f} calls/s after, "
+            f"{legacy_elapsed / closed_form_elapsed:5.1f}x"
+        )
+
+
+def _each(ref_dates: list[datetime.date], fn: typing.Callable[[int, datetime.date], typing.Any], /) -> None:
+    for i, ref_date in enumerate(ref_dates):
+        fn(i, ref_date)
+
+
+def _best_of(fn: typing.Callable[[], None], /, *, repeat: int) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _legacy_x_weekday_of_month(*, year: int, month: int, week_num: int, week_day: domain.Weekday) -> datetime.date:
+    days_in_month = calendar.monthrange(year, month)[1]
+    return list(
+        itertools.islice(
+            (
+                dt
+                for day in range(1, days_in_month, 1)
+                if domain.Weekday.from_int((dt := datetime.date(year, month, day)).weekday()) == week_day
+            ),
+            week_num,
+        )
+    )[-1]
+
+
+def _legacy_calculate_memorial_day(*, year: int) -> datetime.date:
+    dt = datetime.date(year, 6, 1) - datetime.timedelta(days=1)
+    while dt.weekday() > 0:
+        dt -= datetime.timedelta(days=1)
+    return dt
+
+
+def _legacy_monthly_next(*, month: int, year: int, month_day: int) -> datetime.date:
+    mo, yr = {
+        1: (2, year),
+        2: (3, year),
+        3: (4, year),
+        4: (5, year),
+        5: (6, year),
+        6: (7, year),
+        7: (8, year),
+        8: (9, year),
+        9: (10, year),
+        10: (11, year),
+        11: (12, year),
+        12: (1, year + 1),
+    }[month]
+    return datetime.date(yr, mo, month_day)
+
+
+def _legacy_weekly_next(*, frequency: domain.Frequency, ref_date: datetime.date) -> datetime.date:
+    assert frequency.week_day is not None
+
+    day_offset = {
+        1: {1: 7, 2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 7: 6},
+        2: {1: 6, 2: 7, 3: 1, 4: 2, 5: 3, 6: 4, 7: 5},
+        3: {1: 5, 2: 6, 3: 7, 4: 1, 5: 2, 6: 3, 7: 4},
+        4: {1: 4, 2: 5, 3: 6, 4: 7, 5: 1, 6: 2, 7: 3},
+        5: {1: 3, 2: 4, 3: 5, 4: 6, 5: 7, 6: 1, 7: 2},
+        6: {1: 2, 2: 3, 3: 4, 4: 5, 5: 6, 6: 7, 7: 1},
+        7: {1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7},
+    }[domain.Weekday.from_date(ref_date).value][frequency.week_day.value]
+
+    return ref_date + datetime.timedelta(days=day_offset)
+
+
+if __name__ == "__main__":
+    main(call_count=int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,95 @@
+"""Rows per second for the fast and strict todo row decoders.
+
+Run from the project root with:
+
+    python -m benchmarks.todo_row_decoding [row_count]
+"""
+
+import dataclasses
+import datetime
+import sys
+import time
+import typing
+
+import sqlalchemy as sa
+
+from src import adapter, domain
+
+
+def main(*, row_count: int) -> None:
+    engine = sa.create_engine("sqlite://")
+
+    create_tables_result = adapter.db.create_tables(schema=None, engine=engine)
+    if isinstance(create_tables_result, domain.Error):
+        raise Exception(str(create_tables_result))
+
+    templates = [
+        dataclasses.replace(todo, category=domain.TODO_CATEGORY, user=domain.DEFAULT_USER) for todo in domain.HOLIDAYS
+    ]
+
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY)
+        adapter.user_repo.add(schema=None, con=con, user=domain.DEFAULT_USER)
+
+        add_result = adapter.todo_repo.add_many(
+            schema=None,
+            con=con,
+            todos=(
+                dataclasses.replace(
+                    templates[i % len(templates)],
+                    todo_id=f"{i:032d}",
+                    last_completed=datetime.date(2020, 1, 1) + datetime.timedelta(days=i % 365),
+                )
+                for i in range(row_count)
+            ),
+            chunk_size=10_000,
+        )
+        if isinstance(add_result, domain.Error):
+            raise Exception(str(add_result))
+
+    with engine.begin() as con:
+        rows = con.execute(sa.select(adapter.db.todo(schema=None))).fetchall()
+
+        # every row refers to a category and user that are loaded here, so decoding never goes back to con
+        lookups = adapter.todo_repo._Lookups.load(schema=None, con=con)
+        if isinstance(lookups, domain.Error):
+            raise Exception(str(lookups))
+
+    def legacy() -> None:
+        # before the fast path every row went through the strict validator and parsed its own frequency
+        for row in rows:
+            adapter.todo_repo._parse_frequency.cache_clear()
+            adapter.todo_repo._strict_decode_row(row, lookups=lookups)
+
+    def strict() -> None:
+        adapter.todo_repo._parse_frequency.cache_clear()
+        for row in rows:
+            adapter.todo_repo._strict_decode_row(row, lookups=lookups)
+
+    def fast() -> None:
+        adapter.todo_repo._parse_frequency.cache_clear()
+        for row in rows:
+            adapter.todo_repo._decode_row(row, lookups=lookups)
+
+    print(f"decoding {len(rows):,} rows")
+
+    for name, fn in (
+        ("strict, uncached frequencies", legacy),
+        ("strict, cached frequencies", strict),
+        ("fast, cached frequencies", fast),
+    ):
+        elapsed = _best_of(fn, repeat=3)
+        print(f"{name:>30}: {elapsed:7.3f}s, {len(rows) / elapsed:12,.0f} rows/s")
+
+
+def _best_of(fn: typing.Callable[[], None], /, *, repeat: int) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    main(row_count=int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
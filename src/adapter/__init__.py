@@ -1,11 +1,22 @@
 from src.adapter.config import db_schema, username
-from src.adapter import category_repo, db, todo_repo, user_repo
+from src.adapter import (
+    category_repo,
+    db,
+    lookup_cache,
+    todo_change_listener,
+    todo_completion_repo,
+    todo_repo,
+    user_repo,
+)
 
 __all__ = (
     "db",
     "db_schema",
     "username",
     "category_repo",
+    "lookup_cache",
+    "todo_change_listener",
+    "todo_completion_repo",
     "todo_repo",
     "user_repo",
 )
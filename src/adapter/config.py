@@ -7,6 +7,7 @@ import typing
 from src import domain
 
 __all__ = (
+    "db_engine_settings",
     "db_schema",
     "username",
 )
@@ -51,3 +52,15 @@ def db_schema(*, config_file_path: pathlib.Path) -> str | None | domain.Error:
         return config.get("db-schema")
     except:  # noqa: E722
         return domain.Error.new("An error occurred while looking up db schema from config.json.")
+
+
+def db_engine_settings(*, config_file_path: pathlib.Path) -> dict[str, typing.Any] | domain.Error:
+    # noinspection PyBroadException
+    try:
+        config = _config(config_file_path=config_file_path)
+        if isinstance(config, domain.Error):
+            return config
+
+        return dict(config.get("db-engine") or {})
+    except:  # noqa: E722
+        return domain.Error.new("An error occurred while looking up db engine settings from config.json.")
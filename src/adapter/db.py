@@ -1,4 +1,5 @@
 import functools
+import typing
 
 import sqlalchemy as sa
 from loguru import logger
@@ -6,16 +7,54 @@ from loguru import logger
 from src import domain
 
 __all__ = (
+    "POSTGRESQL_ENGINE_DEFAULTS",
+    "SQLITE_ENGINE_DEFAULTS",
     "category",
+    "change_counter",
     "create_engine",
     "create_tables",
+    "explain",
+    "sqlite_fts_available",
     "todo",
+    "todo_completion",
+    "todo_fts",
     "user",
 )
 
 
 meta = sa.MetaData()
 
+SQLITE_ENGINE_DEFAULTS: typing.Final[dict[str, typing.Any]] = {
+    "journal-mode": "wal",
+    "synchronous": "normal",
+    "mmap-size": 256 * 1024 * 1024,
+    "cache-size-kib": 64 * 1024,
+    "busy-timeout-ms": 5_000,
+    "foreign-keys": True,
+    "pool-size": 5,
+    "max-overflow": 5,
+}
+
+POSTGRESQL_ENGINE_DEFAULTS: typing.Final[dict[str, typing.Any]] = {
+    "pool-size": 5,
+    "max-overflow": 10,
+    "pool-pre-ping": True,
+    "pool-recycle-seconds": 30 * 60,
+}
+
+
+class _PartialIndexPredicates(typing.TypedDict):
+    postgresql_where: sa.TextClause
+    sqlite_where: sa.TextClause
+
+
+def _active_only() -> _PartialIndexPredicates:
+    # partial index predicate matching the soft-delete filter used by the repos
+    return {
+        "postgresql_where": sa.text("date_deleted IS NULL"),
+        "sqlite_where": sa.text("date_deleted IS NULL"),
+    }
+
 
 @functools.lru_cache
 def todo(*, schema: str | None) -> sa.Table:
@@ -45,6 +84,58 @@ def todo(*, schema: str | None) -> sa.Table:
         sa.Column("month_day", sa.Integer, nullable=True),
         sa.Column("days", sa.Integer, nullable=True),
         sa.Column("due_date", sa.Date, nullable=True),
+        sa.Column("display_start", sa.Date, nullable=True),
+        sa.Column("display_end", sa.Date, nullable=True),
+        sa.Column("display_as_of", sa.Date, nullable=True),
+        sa.Column("display_next_transition", sa.Date, nullable=True),
+        sa.Column("change_seq", sa.BigInteger, nullable=True),
+        sa.Index("ix_todo_active_user_id_category_id", "user_id", "category_id", **_active_only()),
+        sa.Index("ix_todo_active_category_id", "category_id", **_active_only()),
+        sa.Index("ix_todo_active_template_todo_id_user_id", "template_todo_id", "user_id", **_active_only()),
+        sa.Index("ix_todo_active_display_start_display_end", "display_start", "display_end", **_active_only()),
+        sa.Index("ix_todo_active_display_as_of", "display_as_of", **_active_only()),
+        sa.Index("ix_todo_active_display_next_transition", "display_next_transition", **_active_only()),
+        # not partial, deletes have to be visible to changes_since
+        sa.Index("ix_todo_change_seq", "change_seq"),
+        schema=schema,
+    )
+
+
+@functools.lru_cache
+def todo_completion(*, schema: str | None) -> sa.Table:
+    """Append-only log of completions, an undo is logged as a row of its own rather than deleting the completion.
+
+    completion_id orders the events of a todo, an undo row repeats the completed_on and user_id of the completion it
+    takes back.
+    """
+    return sa.Table(
+        "todo_completion",
+        meta,
+        sa.Column(
+            "completion_id",
+            sa.BigInteger().with_variant(sa.Integer, "sqlite"),
+            primary_key=True,
+            autoincrement=True,
+        ),
+        sa.Column("todo_id", sa.Text, nullable=False),
+        sa.Column("user_id", sa.Text, nullable=True),
+        sa.Column("completed_on", sa.Date, nullable=False),
+        sa.Column("is_undo", sa.Boolean, nullable=False),
+        sa.Column("date_added", sa.DateTime, nullable=False),
+        sa.Index("ix_todo_completion_todo_id_completed_on", "todo_id", "completed_on"),
+        sa.Index("ix_todo_completion_user_id_completed_on", "user_id", "completed_on"),
+        schema=schema,
+    )
+
+
+@functools.lru_cache
+def change_counter(*, schema: str | None) -> sa.Table:
+    """One row per table whose writes are sequenced, value is the last sequence number handed out."""
+    return sa.Table(
+        "change_counter",
+        meta,
+        sa.Column("name", sa.Text, primary_key=True),
+        sa.Column("value", sa.BigInteger, nullable=False),
         schema=schema,
     )
 
@@ -60,6 +151,7 @@ def category(*, schema: str | None) -> sa.Table:
         sa.Column("date_added", sa.DateTime, nullable=False),
         sa.Column("date_updated", sa.DateTime, nullable=True),
         sa.Column("date_deleted", sa.DateTime, nullable=True),
+        sa.Index("ix_category_active_name", "name", **_active_only()),
         schema=schema,
     )
 
@@ -76,21 +168,42 @@ def user(*, schema: str | None) -> sa.Table:
         sa.Column("date_added", sa.DateTime, nullable=False),
         sa.Column("date_updated", sa.DateTime, nullable=True),
         sa.Column("date_deleted", sa.DateTime, nullable=True),
+        sa.Index("ix_user_username", "username"),
         schema=schema,
     )
 
 
 def create_tables(*, schema: str | None, engine: sa.engine.Engine) -> None | domain.Error:
     try:
-        meta.create_all(
-            bind=engine,
-            tables=[
-                todo(schema=schema),
-                category(schema=schema),
-                user(schema=schema),
-            ],
-            checkfirst=True,
-        )
+        tables = [
+            todo(schema=schema),
+            todo_completion(schema=schema),
+            category(schema=schema),
+            user(schema=schema),
+            change_counter(schema=schema),
+        ]
+
+        meta.create_all(bind=engine, tables=tables, checkfirst=True)
+
+        for table in tables:
+            added_column_names = _add_missing_columns(engine=engine, table=table)
+
+            # the display columns are derived together, so when one is new every row's have to be worked out again
+            if table.name == "todo" and any(column_name.startswith("display_") for column_name in added_column_names):
+                with engine.begin() as con:
+                    con.execute(sa.update(table).values(display_as_of=None))
+
+            # create_all only creates indexes along with a new table, so add any that are missing from older databases
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+
+        _seed_change_counter(engine=engine, schema=schema, table=todo(schema=schema))
+
+        if engine.dialect.name == "sqlite" and sqlite_fts_available(dialect=engine.dialect):
+            _create_sqlite_todo_fts(engine=engine, schema=schema)
+        elif engine.dialect.name == "postgresql":
+            _create_postgresql_todo_search_indexes(engine=engine, schema=schema)
+
         return None
     except Exception as e:
         logger.error(f"{__file__}.create_tables({schema=!r}, ...): {e!s}")
@@ -98,10 +211,74 @@ def create_tables(*, schema: str | None, engine: sa.engine.Engine) -> None | dom
         return domain.Error.new(str(e))
 
 
-def create_engine(*, url: str) -> sa.engine.Engine | domain.Error:
+@functools.lru_cache
+def todo_fts(*, schema: str | None) -> sa.TableClause:
+    """The SQLite FTS5 index over todo.description and todo.note that create_tables maintains.
+
+    The todo_fts column is FTS5's hidden column named after the table, it's the left-hand side of a MATCH.
+    """
+    return sa.table(
+        "todo_fts",
+        sa.column("todo_id"),
+        sa.column("rank"),
+        sa.column("todo_fts"),
+        schema=schema,
+    )
+
+
+def sqlite_fts_available(*, dialect: sa.Dialect) -> bool:
+    # the trigram tokenizer, which gives FTS5 the same substring semantics as ILIKE, arrived in SQLite 3.34
+    return dialect.name == "sqlite" and dialect.dbapi.sqlite_version_info >= (3, 34, 0)  # type: ignore[union-attr]
+
+
+def explain(*, con: sa.Connection, qry: sa.ClauseElement) -> list[str] | domain.Error:
+    """Return the database's query plan for qry, one line per plan step."""
+    try:
+        sql = qry.compile(dialect=con.dialect, compile_kwargs={"literal_binds": True})
+
+        if con.dialect.name == "sqlite":
+            return [row.detail for row in con.execute(sa.text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()]
+
+        return [row[0] for row in con.execute(sa.text(f"EXPLAIN {sql}")).fetchall()]
+    except Exception as e:
+        logger.error(f"{__file__}.explain(...) failed: {e!s}")
+
+        return domain.Error.new(str(e))
+
+
+def create_engine(
+    *,
+    url: str,
+    settings: typing.Mapping[str, typing.Any] | None = None,
+) -> sa.engine.Engine | domain.Error:
+    """Create an engine tuned for the url's backend.
+
+    settings is the "db-engine" section of config.json, it can hold a "sqlite" and a "postgresql" object whose keys
+    override the defaults in SQLITE_ENGINE_DEFAULTS and POSTGRESQL_ENGINE_DEFAULTS respectively.
+    """
     # noinspection PyBroadException
     try:
-        return sa.create_engine(url=url)
+        sa_url = sa.engine.make_url(url)
+
+        backend_name = sa_url.get_backend_name()
+
+        backend_settings = dict((settings or {}).get(backend_name) or {})
+
+        if backend_name == "sqlite":
+            return _create_sqlite_engine(url=sa_url, settings={**SQLITE_ENGINE_DEFAULTS, **backend_settings})
+
+        if backend_name == "postgresql":
+            postgresql_settings = {**POSTGRESQL_ENGINE_DEFAULTS, **backend_settings}
+
+            return sa.create_engine(
+                url=sa_url,
+                pool_size=int(postgresql_settings["pool-size"]),
+                max_overflow=int(postgresql_settings["max-overflow"]),
+                pool_pre_ping=bool(postgresql_settings["pool-pre-ping"]),
+                pool_recycle=int(postgresql_settings["pool-recycle-seconds"]),
+            )
+
+        return sa.create_engine(url=sa_url)
     except:  # noqa: E722
         import traceback
 
@@ -109,3 +286,165 @@ def create_engine(*, url: str) -> sa.engine.Engine | domain.Error:
         logger.error(f"{__file__}.create_engine(...) failed.")
 
         return domain.Error.new("An error occurred while creating engine.")
+
+
+def _create_sqlite_engine(*, url: sa.engine.URL, settings: typing.Mapping[str, typing.Any]) -> sa.engine.Engine:
+    journal_mode = str(settings["journal-mode"]).lower()
+    if journal_mode not in ("delete", "truncate", "persist", "memory", "wal", "off"):
+        raise ValueError(f"Invalid sqlite journal-mode, {journal_mode!r}.")
+
+    synchronous = str(settings["synchronous"]).lower()
+    if synchronous not in ("off", "normal", "full", "extra"):
+        raise ValueError(f"Invalid sqlite synchronous setting, {synchronous!r}.")
+
+    pragmas = (
+        f"PRAGMA journal_mode = {journal_mode}",
+        f"PRAGMA synchronous = {synchronous}",
+        f"PRAGMA mmap_size = {int(settings['mmap-size'])}",
+        # a negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size = -{int(settings['cache-size-kib'])}",
+        f"PRAGMA busy_timeout = {int(settings['busy-timeout-ms'])}",
+        f"PRAGMA foreign_keys = {'ON' if settings['foreign-keys'] else 'OFF'}",
+    )
+
+    if url.database in (None, "", ":memory:"):
+        # an in-memory database only lives as long as its connection, so keep SQLAlchemy's single connection pool
+        engine = sa.create_engine(url=url)
+    else:
+        # WAL lets readers run alongside the single writer, so a small pool of connections is worth keeping open
+        engine = sa.create_engine(
+            url=url,
+            poolclass=sa.pool.QueuePool,
+            pool_size=int(settings["pool-size"]),
+            max_overflow=int(settings["max-overflow"]),
+        )
+
+    def apply_pragmas(dbapi_connection: typing.Any, _: typing.Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    sa.event.listen(engine, "connect", apply_pragmas)
+
+    return engine
+
+
+def _seed_change_counter(*, engine: sa.engine.Engine, schema: str | None, table: sa.Table) -> None:
+    counters = change_counter(schema=schema)
+
+    with engine.begin() as con:
+        if con.execute(sa.select(counters.c.name).where(counters.c.name == table.name)).one_or_none() is None:
+            con.execute(
+                sa.insert(counters).values(
+                    name=table.name,
+                    value=sa.select(sa.func.coalesce(sa.func.max(table.c.change_seq), 0)).scalar_subquery(),
+                )
+            )
+
+
+def _create_sqlite_todo_fts(*, engine: sa.engine.Engine, schema: str | None) -> None:
+    """Create the external-content FTS5 table for todo along with the triggers that keep it in sync.
+
+    todo_fts stores only the index, the text itself is read from todo by rowid. Soft-deleted rows stay in the index, the
+    queries join back to todo and filter on date_deleted as usual.
+    """
+    preparer = engine.dialect.identifier_preparer
+
+    prefix = "" if schema is None else f"{preparer.quote_schema(schema)}."
+
+    fts_already_existed = sa.inspect(engine).has_table("todo_fts", schema=schema)
+
+    with engine.begin() as con:
+        con.execute(
+            sa.text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {prefix}todo_fts USING fts5("
+                "todo_id UNINDEXED, description, note, content='todo', content_rowid='rowid', tokenize='trigram')"
+            )
+        )
+
+        # trigger bodies can only reference tables in the trigger's own schema, so those names stay unqualified
+        con.execute(
+            sa.text(
+                f"CREATE TRIGGER IF NOT EXISTS {prefix}todo_fts_after_insert AFTER INSERT ON todo BEGIN "
+                "INSERT INTO todo_fts (rowid, todo_id, description, note) "
+                "VALUES (new.rowid, new.todo_id, new.description, new.note); "
+                "END"
+            )
+        )
+        con.execute(
+            sa.text(
+                f"CREATE TRIGGER IF NOT EXISTS {prefix}todo_fts_after_delete AFTER DELETE ON todo BEGIN "
+                "INSERT INTO todo_fts (todo_fts, rowid, todo_id, description, note) "
+                "VALUES ('delete', old.rowid, old.todo_id, old.description, old.note); "
+                "END"
+            )
+        )
+        con.execute(
+            sa.text(
+                f"CREATE TRIGGER IF NOT EXISTS {prefix}todo_fts_after_update "
+                "AFTER UPDATE OF todo_id, description, note ON todo BEGIN "
+                "INSERT INTO todo_fts (todo_fts, rowid, todo_id, description, note) "
+                "VALUES ('delete', old.rowid, old.todo_id, old.description, old.note); "
+                "INSERT INTO todo_fts (rowid, todo_id, description, note) "
+                "VALUES (new.rowid, new.todo_id, new.description, new.note); "
+                "END"
+            )
+        )
+
+        # index the todos that were written before the FTS table existed
+        if not fts_already_existed:
+            con.execute(sa.text(f"INSERT INTO {prefix}todo_fts (todo_fts) VALUES ('rebuild')"))
+
+
+def _create_postgresql_todo_search_indexes(*, engine: sa.engine.Engine, schema: str | None) -> None:
+    """Add trigram GIN indexes so the ILIKE search over todo.description and todo.note can use an index."""
+    preparer = engine.dialect.identifier_preparer
+
+    table_name = preparer.format_table(todo(schema=schema))
+
+    try:
+        with engine.begin() as con:
+            con.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except Exception as e:
+        # searching still works without the extension, it just can't use an index
+        logger.warning(f"{__file__}._create_postgresql_todo_search_indexes(): pg_trgm is not available: {e!s}")
+        return None
+
+    with engine.begin() as con:
+        for column_name in ("description", "note"):
+            con.execute(
+                sa.text(
+                    f"CREATE INDEX IF NOT EXISTS ix_todo_{column_name}_trgm "
+                    f"ON {table_name} USING gin ({column_name} gin_trgm_ops)"
+                )
+            )
+
+
+def _add_missing_columns(*, engine: sa.engine.Engine, table: sa.Table) -> list[str]:
+    existing_column_names = {
+        column["name"] for column in sa.inspect(engine).get_columns(table.name, schema=table.schema)
+    }
+
+    missing_columns = [column for column in table.columns if column.name not in existing_column_names]
+    if not missing_columns:
+        return []
+
+    preparer = engine.dialect.identifier_preparer
+
+    with engine.begin() as con:
+        for column in missing_columns:
+            assert column.nullable, f"Cannot add the non-nullable column, {column.name}, to an existing table."
+
+            logger.info(f"Adding column, {column.name}, to {table.name}.")
+
+            con.execute(
+                sa.text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}"
+                )
+            )
+
+    return [column.name for column in missing_columns]
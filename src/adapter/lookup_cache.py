@@ -0,0 +1,94 @@
+import threading
+import time
+import typing
+import weakref
+
+import sqlalchemy as sa
+
+from src import domain
+from src.adapter import category_repo, user_repo
+
+__all__ = (
+    "MAX_AGE_SECONDS",
+    "categories",
+    "invalidate_categories",
+    "invalidate_users",
+    "users",
+)
+
+MAX_AGE_SECONDS: typing.Final[float] = 5 * 60
+
+_T = typing.TypeVar("_T")
+
+
+class _TableCache(typing.Generic[_T]):
+    """Process-wide read-through cache of a small, rarely written table, kept per engine, schema and active flag.
+
+    The services invalidate it after committing a write to the table. Entries also expire after MAX_AGE_SECONDS, so
+    writes made by other processes against a shared database are picked up eventually.
+    """
+
+    def __init__(self, *, load: typing.Callable[..., list[_T] | domain.Error]):
+        self._load: typing.Final = load
+        self._lock: typing.Final = threading.Lock()
+
+        # keyed weakly by engine, so an engine that is disposed of takes its entries with it
+        self._entries: weakref.WeakKeyDictionary[
+            sa.Engine, dict[tuple[str | None, bool], tuple[float, tuple[_T, ...]]]
+        ] = weakref.WeakKeyDictionary()
+
+        # bumped on every invalidation, so a load that raced with a write doesn't store what it read
+        self._generation: weakref.WeakKeyDictionary[sa.Engine, int] = weakref.WeakKeyDictionary()
+
+    def get(self, *, schema: str | None, con: sa.Connection, active: bool) -> list[_T] | domain.Error:
+        key = (schema, active)
+
+        with self._lock:
+            loaded_at, rows = self._entries.get(con.engine, {}).get(key, (None, ()))
+            if loaded_at is not None and time.monotonic() - loaded_at < MAX_AGE_SECONDS:
+                return list(rows)
+
+            generation = self._generation.get(con.engine, 0)
+
+        loaded_at = time.monotonic()
+
+        result = self._load(schema=schema, con=con, active=active)
+        if isinstance(result, domain.Error):
+            return result
+
+        with self._lock:
+            if self._generation.get(con.engine, 0) == generation:
+                self._entries.setdefault(con.engine, {})[key] = (loaded_at, tuple(result))
+
+        return result
+
+    def invalidate(self, *, schema: str | None, engine: sa.Engine) -> None:
+        with self._lock:
+            self._generation[engine] = self._generation.get(engine, 0) + 1
+
+            entries = self._entries.get(engine, {})
+            for key in [key for key in entries if key[0] == schema]:
+                del entries[key]
+
+
+_categories: typing.Final[_TableCache[domain.Category]] = _TableCache(load=category_repo.where)
+
+_users: typing.Final[_TableCache[domain.User]] = _TableCache(load=user_repo.where)
+
+
+def categories(*, schema: str | None, con: sa.Connection, active: bool) -> list[domain.Category] | domain.Error:
+    """Same result as category_repo.where, served from memory when possible."""
+    return _categories.get(schema=schema, con=con, active=active)
+
+
+def users(*, schema: str | None, con: sa.Connection, active: bool) -> list[domain.User] | domain.Error:
+    """Same result as user_repo.where, served from memory when possible."""
+    return _users.get(schema=schema, con=con, active=active)
+
+
+def invalidate_categories(*, schema: str | None, engine: sa.Engine) -> None:
+    _categories.invalidate(schema=schema, engine=engine)
+
+
+def invalidate_users(*, schema: str | None, engine: sa.Engine) -> None:
+    _users.invalidate(schema=schema, engine=engine)
@@ -0,0 +1,101 @@
+import select
+import typing
+
+import sqlalchemy as sa
+from loguru import logger
+
+from src import domain
+
+__all__ = (
+    "TodoChangeListener",
+    "channel",
+)
+
+
+def channel(*, schema: str | None) -> str:
+    """The PostgreSQL notification channel todo writes are announced on."""
+    if schema is None:
+        return "todo_changed"
+
+    return f"{schema}.todo_changed"
+
+
+class TodoChangeListener:
+    """Holds a dedicated PostgreSQL connection that LISTENs for the notifications todo_repo sends on every write.
+
+    The connection is taken out of the engine's pool for as long as the listener is open, and should only be used from
+    one thread at a time.
+    """
+
+    def __init__(self, *, schema: str | None, engine: sa.engine.Engine):
+        self._schema: typing.Final[str | None] = schema
+        self._engine: typing.Final[sa.engine.Engine] = engine
+
+        self._raw_con: typing.Any = None
+
+    def close(self) -> None:
+        if self._raw_con is not None:
+            try:
+                self._raw_con.close()
+            except Exception as e:
+                logger.warning(f"{self.__class__.__name__}.close() failed: {e!s}")
+
+            self._raw_con = None
+
+    def open(self) -> None | domain.Error:
+        """Start listening, only writes committed after this returns are guaranteed to be announced."""
+        try:
+            if self._raw_con is not None:
+                return None
+
+            raw_con = self._engine.raw_connection()
+
+            driver_con = raw_con.driver_connection
+            if driver_con is None:
+                raw_con.close()
+
+                return domain.Error.new("The connection has no driver connection to listen on.")
+
+            driver_con.autocommit = True
+
+            with driver_con.cursor() as cursor:
+                cursor.execute(f'LISTEN "{channel(schema=self._schema)}"')
+
+            self._raw_con = raw_con
+
+            return None
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.open() failed: {e!s}")
+
+            return domain.Error.new(str(e))
+
+    def wait(self, *, timeout_seconds: float) -> bool | domain.Error:
+        """Block until a notification arrives or timeout_seconds pass, returns whether anything was announced."""
+        try:
+            open_result = self.open()
+            if isinstance(open_result, domain.Error):
+                return open_result
+
+            driver_con = self._raw_con.driver_connection
+
+            # notifications that arrived while nobody was waiting are already buffered on the connection
+            driver_con.poll()
+            if not driver_con.notifies:
+                readable, _, _ = select.select([driver_con], [], [], timeout_seconds)
+                if not readable:
+                    return False
+
+                driver_con.poll()
+
+            # a burst of writes is reported once
+            announced = bool(driver_con.notifies)
+            driver_con.notifies.clear()
+
+            return announced
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.wait({timeout_seconds=!r}) failed: {e!s}")
+
+            # the connection may be broken, so start over with a new one next time
+            self.close()
+
+            return domain.Error.new(str(e), timeout_seconds=timeout_seconds)
@@ -0,0 +1,198 @@
+import datetime
+import typing
+
+import sqlalchemy as sa
+from loguru import logger
+
+from src import domain
+from src.adapter import db
+
+__all__ = (
+    "add_many",
+    "add_undo_many",
+    "history",
+    "history_many",
+    "where",
+)
+
+# keeps the IN lists under SQLite's bound parameter limit
+_MAX_IDS_PER_QUERY: typing.Final[int] = 500
+
+
+def add_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo_ids: typing.Iterable[str],
+    completed_by_user_id: str | None,
+    completed_on: datetime.date,
+) -> None | domain.Error:
+    """Log a completion of each todo that exists and hasn't been deleted, copied from the todo rows in one INSERT."""
+    try:
+        todos = db.todo(schema=schema)
+        completions = db.todo_completion(schema=schema)
+
+        unique_todo_ids = list(dict.fromkeys(todo_ids))
+
+        for chunk_start in range(0, len(unique_todo_ids), _MAX_IDS_PER_QUERY):
+            chunk = unique_todo_ids[chunk_start : chunk_start + _MAX_IDS_PER_QUERY]
+
+            # noinspection PyComparisonWithNone
+            con.execute(
+                sa.insert(completions).from_select(
+                    ["todo_id", "user_id", "completed_on", "is_undo", "date_added"],
+                    sa.select(
+                        todos.c.todo_id,
+                        sa.literal(completed_by_user_id, sa.Text),
+                        sa.literal(completed_on, sa.Date),
+                        sa.false(),
+                        sa.literal(datetime.datetime.now(), sa.DateTime),
+                    ).where(todos.c.todo_id.in_(chunk) & (todos.c.date_deleted == None)),  # noqa: E711
+                )
+            )
+
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.add_many(..., {completed_by_user_id=!r}, {completed_on=!r}) failed: {e!s}")
+
+        return domain.Error.new(str(e), completed_by_user_id=completed_by_user_id, completed_on=completed_on)
+
+
+def add_undo_many(*, schema: str | None, con: sa.Connection, todo_ids: typing.Iterable[str]) -> None | domain.Error:
+    """Log an undo of the latest completion of each todo that has one, copied from the todo row in one INSERT."""
+    try:
+        todos = db.todo(schema=schema)
+        completions = db.todo_completion(schema=schema)
+
+        unique_todo_ids = list(dict.fromkeys(todo_ids))
+
+        for chunk_start in range(0, len(unique_todo_ids), _MAX_IDS_PER_QUERY):
+            chunk = unique_todo_ids[chunk_start : chunk_start + _MAX_IDS_PER_QUERY]
+
+            # noinspection PyComparisonWithNone
+            con.execute(
+                sa.insert(completions).from_select(
+                    ["todo_id", "user_id", "completed_on", "is_undo", "date_added"],
+                    sa.select(
+                        todos.c.todo_id,
+                        todos.c.last_completed_by,
+                        todos.c.last_completed,
+                        sa.true(),
+                        sa.literal(datetime.datetime.now(), sa.DateTime),
+                    ).where(todos.c.todo_id.in_(chunk) & (todos.c.last_completed != None)),  # noqa: E711
+                )
+            )
+
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.add_undo_many(...) failed: {e!s}")
+
+        return domain.Error.new(str(e))
+
+
+def history(*, schema: str | None, con: sa.Connection, todo_id: str) -> list[domain.TodoCompletion] | domain.Error:
+    """The completions of a todo that haven't been undone, latest first."""
+    histories = history_many(schema=schema, con=con, todo_ids=(todo_id,))
+    if isinstance(histories, domain.Error):
+        return histories
+
+    return histories.get(todo_id, [])
+
+
+def history_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo_ids: typing.Iterable[str],
+) -> dict[str, list[domain.TodoCompletion]] | domain.Error:
+    """The completions of each todo that haven't been undone, latest first. Todos without any are left out."""
+    try:
+        completions = db.todo_completion(schema=schema)
+
+        unique_todo_ids = list(dict.fromkeys(todo_ids))
+
+        histories: dict[str, list[domain.TodoCompletion]] = {}
+        for chunk_start in range(0, len(unique_todo_ids), _MAX_IDS_PER_QUERY):
+            chunk = unique_todo_ids[chunk_start : chunk_start + _MAX_IDS_PER_QUERY]
+
+            result = con.execute(
+                sa.select(
+                    completions.c.todo_id,
+                    completions.c.user_id,
+                    completions.c.completed_on,
+                    completions.c.is_undo,
+                )
+                .where(completions.c.todo_id.in_(chunk))
+                .order_by(completions.c.completion_id)
+            )
+
+            for todo_id, replayed in _replay(result).items():
+                if replayed:
+                    histories[todo_id] = replayed[::-1]
+
+        return histories
+    except Exception as e:
+        logger.error(f"{__file__}.history_many(...) failed: {e!s}")
+
+        return domain.Error.new(str(e))
+
+
+def where(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    user_id: str | domain.Unspecified,
+    completed_from: datetime.date,
+    completed_to: datetime.date,
+) -> list[domain.TodoCompletion] | domain.Error:
+    """The completions from completed_from through completed_to that haven't been undone, latest first.
+
+    An undo repeats the completed_on and user_id of what it takes back, so it always falls inside the same filters as
+    its completion and the range can be read on its own.
+    """
+    try:
+        completions = db.todo_completion(schema=schema)
+
+        predicates: list[sa.ColumnElement[bool]] = [completions.c.completed_on.between(completed_from, completed_to)]
+        if isinstance(user_id, str):
+            predicates.append(completions.c.user_id == user_id)
+
+        result = con.execute(
+            sa.select(
+                completions.c.todo_id,
+                completions.c.user_id,
+                completions.c.completed_on,
+                completions.c.is_undo,
+            )
+            .where(*predicates)
+            .order_by(completions.c.completion_id)
+        )
+
+        return sorted(
+            (completion for replayed in _replay(result).values() for completion in replayed),
+            key=lambda completion: completion.completed_on,
+            reverse=True,
+        )
+    except Exception as e:
+        logger.error(f"{__file__}.where({user_id=!r}, {completed_from=!r}, {completed_to=!r}) failed: {e!s}")
+
+        return domain.Error.new(str(e), user_id=user_id, completed_from=completed_from, completed_to=completed_to)
+
+
+def _replay(rows: typing.Iterable[sa.Row[typing.Any]], /) -> dict[str, list[domain.TodoCompletion]]:
+    # rows are in the order they were logged, each undo takes back the latest matching completion of its todo
+    replayed: dict[str, list[domain.TodoCompletion]] = {}
+    for todo_id, user_id, completed_on, is_undo in rows:
+        todo_completions = replayed.setdefault(todo_id, [])
+
+        completion = domain.TodoCompletion(todo_id=todo_id, completed_on=completed_on, completed_by_user_id=user_id)
+        if not is_undo:
+            todo_completions.append(completion)
+            continue
+
+        for ix in range(len(todo_completions) - 1, -1, -1):
+            if todo_completions[ix] == completion:
+                del todo_completions[ix]
+                break
+
+    return replayed
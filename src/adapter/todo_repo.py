@@ -1,18 +1,36 @@
 import dataclasses
 import datetime
+import functools
+import operator
 import typing
 
 import sqlalchemy as sa
 from loguru import logger
+from sqlalchemy.dialects import postgresql, sqlite
 
 from src import domain
-from src.adapter import db, category_repo, user_repo
+from src.adapter import db, lookup_cache, todo_change_listener, todo_completion_repo
 
 __all__ = (
     "add",
+    "add_many",
+    "change_cursor",
+    "changes_since",
     "delete",
+    "delete_many",
+    "explain_where",
     "get",
+    "get_many",
+    "iter_where",
+    "mark_complete",
+    "mark_complete_many",
+    "mark_incomplete",
+    "mark_incomplete_many",
+    "next_appearance",
+    "refresh_display_windows",
+    "save",
     "update",
+    "update_many",
     "where",
 )
 
@@ -42,6 +60,23 @@ FREQUENCY_NAME_LKP = {
 }
 
 
+# the columns a todo's completions are recorded in, those are only written by mark_complete and mark_incomplete
+_COMPLETION_COLUMN_NAMES = (
+    "last_completed",
+    "last_completed_by",
+    "prior_completed",
+    "prior_completed_by",
+)
+
+# save leaves these as they are when the todo already exists
+_SAVE_PRESERVED_COLUMNS = frozenset(
+    ("todo_id", "date_added", "date_updated", "date_deleted", *_COMPLETION_COLUMN_NAMES)
+)
+
+# stay well below SQLite's limit on the number of bound parameters per statement
+_MAX_IDS_PER_QUERY = 500
+
+
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class ValidRow:
     todo_id: str
@@ -68,7 +103,6 @@ class ValidRow:
     start_date: datetime.date
 
 
-# noinspection PyComparisonWithNone
 def add(
     *,
     schema: str | None,
@@ -79,59 +113,140 @@ def add(
         if todo.todo_id == "":
             return domain.Error.new(f"Not a valid uuid: {todo.todo_id}", todo=todo)
 
-        if todo.frequency.week_day is None:
-            week_day = None
-        else:
-            week_day = todo.frequency.week_day.to_int()
+        change_seq = _next_change_seq(schema=schema, con=con)
 
-        if todo.frequency.month is None:
-            month = None
-        else:
-            month = todo.frequency.month.to_int()
+        con.execute(sa.insert(db.todo(schema=schema)).values(**_row_values(todo=todo, change_seq=change_seq)))
 
-        if todo.last_completed_by:
-            last_completed_by_user_id = todo.last_completed_by.user_id
-        else:
-            last_completed_by_user_id = None
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.add({todo=!r}) failed: {e}")
 
-        if todo.prior_completed_by:
-            prior_completed_by_user_id = todo.prior_completed_by.user_id
-        else:
-            prior_completed_by_user_id = None
+        return domain.Error.new(str(e), todo=todo)
 
-        con.execute(
-            sa.insert(db.todo(schema=schema)).values(
-                todo_id=todo.todo_id,
-                template_todo_id=todo.template_todo_id,
-                expire_days=todo.frequency.expire_display_days,
-                advance_days=todo.frequency.advance_display_days,
-                user_id=todo.user.user_id,
-                category_id=todo.category.category_id,
-                description=todo.description,
-                note=todo.note,
-                start_date=todo.frequency.start_date,
-                date_added=todo.date_added,
-                date_updated=todo.date_updated,
-                date_deleted=None,
-                frequency=FREQUENCY_NAME_LKP[todo.frequency.name],
-                week_day=week_day,
-                week_number=todo.frequency.week_number,
-                month=month,
-                month_day=todo.frequency.month_day,
-                days=todo.frequency.days,
-                due_date=todo.frequency.due_date,
-                last_completed=todo.last_completed,
-                prior_completed=todo.prior_completed,
-                last_completed_by=last_completed_by_user_id,
-                prior_completed_by=prior_completed_by_user_id,
+
+def add_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todos: typing.Iterable[domain.Todo],
+    chunk_size: int,
+) -> None | domain.Error:
+    """Insert the todos with one executemany per chunk of chunk_size rows."""
+    try:
+        if chunk_size < 1:
+            return domain.Error.new("chunk_size must be greater than 0.", chunk_size=chunk_size)
+
+        change_seq = _next_change_seq(schema=schema, con=con)
+
+        rows: list[dict[str, typing.Any]] = []
+        for todo in todos:
+            if todo.todo_id == "":
+                return domain.Error.new(f"Not a valid uuid: {todo.todo_id}", todo=todo)
+
+            rows.append(_row_values(todo=todo, change_seq=change_seq))
+
+        for chunk_start in range(0, len(rows), chunk_size):
+            con.execute(sa.insert(db.todo(schema=schema)), rows[chunk_start : chunk_start + chunk_size])
+
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.add_many(..., {chunk_size=!r}) failed: {e}")
+
+        return domain.Error.new(str(e), chunk_size=chunk_size)
+
+
+def change_cursor(*, schema: str | None, con: sa.Connection) -> int | domain.Error:
+    """The change sequence number of the latest todo write, to pass to changes_since later on."""
+    try:
+        counters = db.change_counter(schema=schema)
+
+        cursor: int = con.execute(sa.select(counters.c.value).where(counters.c.name == "todo")).scalar_one()
+
+        return cursor
+    except Exception as e:
+        logger.error(f"{__file__}.change_cursor() failed: {e}")
+
+        return domain.Error.new(str(e))
+
+
+def changes_since(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    cursor: int,
+    category_id: str | domain.Unspecified,
+    user_id: str | domain.Unspecified,
+    description_like: str | domain.Unspecified,
+    due_on: datetime.date | domain.Unspecified,
+) -> domain.TodoChanges | domain.Error:
+    """The todos written after cursor, split by whether they still match the filters where() was called with.
+
+    A todo that was deleted, or that no longer matches the filters, is reported in deleted_todo_ids, so a caller can
+    drop it from what it is showing. Ids it isn't showing can be ignored.
+    """
+    try:
+        lookups = _Lookups.load(schema=schema, con=con)
+        if isinstance(lookups, domain.Error):
+            return lookups
+
+        todos = db.todo(schema=schema)
+
+        predicates = _filters(
+            schema=schema,
+            category_id=category_id,
+            user_id=user_id,
+            template_todo_id=domain.Unspecified(),
+            due_on=due_on,
+        )
+        if isinstance(description_like, str) and description_like:
+            predicates.append(
+                todos.c.description.ilike(f"%{description_like}%") | todos.c.note.ilike(f"%{description_like}%")
             )
+
+        # the todo columns come first, so _decode_row can read the rows as is
+        qry = (
+            sa.select(todos, sa.and_(*predicates).label("matches_filters"))
+            .where(todos.c.change_seq > cursor)
+            .order_by(todos.c.change_seq)
         )
 
-        return None
+        new_cursor = cursor
+        upserted: list[domain.Todo] = []
+        deleted_todo_ids: list[str] = []
+        for row in con.execute(qry):
+            new_cursor = max(new_cursor, row.change_seq)
+
+            if not row.matches_filters:
+                deleted_todo_ids.append(row.todo_id)
+                continue
+
+            todo = _decode_row(row, lookups=lookups)
+            if todo is None:
+                todo = _strict_decode_row(row, lookups=lookups)
+                if isinstance(todo, domain.Error):
+                    return todo
+
+            upserted.append(todo)
+
+        return domain.TodoChanges(
+            cursor=new_cursor,
+            upserted=tuple(upserted),
+            deleted_todo_ids=tuple(deleted_todo_ids),
+        )
     except Exception as e:
-        logger.error(f"{__file__}.add({todo=!r}) failed: {e}")
+        logger.error(
+            f"{__file__}.changes_since({cursor=!r}, {category_id=!r}, {user_id=!r}, {description_like=!r}, "
+            f"{due_on=!r}) failed: {e}"
+        )
 
-        return domain.Error.new(str(e), todo=todo)
+        return domain.Error.new(
+            str(e),
+            cursor=cursor,
+            category_id=category_id,
+            user_id=user_id,
+            description_like=description_like,
+            due_on=due_on,
+        )
 
 
 def delete(
@@ -144,7 +259,7 @@ def delete(
         con.execute(
             sa.update(db.todo(schema=schema))
             .where(db.todo(schema=schema).c.todo_id == todo_id)
-            .values(date_deleted=datetime.datetime.now())
+            .values(date_deleted=datetime.datetime.now(), change_seq=_next_change_seq(schema=schema, con=con))
         )
 
         return None
@@ -154,6 +269,42 @@ def delete(
         return domain.Error.new(str(e), todo_id=todo_id)
 
 
+def delete_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo_ids: typing.Iterable[str],
+    chunk_size: int,
+) -> None | domain.Error:
+    """Soft-delete the todos, chunk_size ids per statement."""
+    try:
+        if chunk_size < 1:
+            return domain.Error.new("chunk_size must be greater than 0.", chunk_size=chunk_size)
+
+        todos = db.todo(schema=schema)
+
+        unique_todo_ids = list(dict.fromkeys(todo_ids))
+
+        date_deleted = datetime.datetime.now()
+
+        change_seq = _next_change_seq(schema=schema, con=con)
+
+        for chunk_start in range(0, len(unique_todo_ids), min(chunk_size, _MAX_IDS_PER_QUERY)):
+            chunk = unique_todo_ids[chunk_start : chunk_start + min(chunk_size, _MAX_IDS_PER_QUERY)]
+
+            con.execute(
+                sa.update(todos)
+                .where(todos.c.todo_id.in_(chunk))
+                .values(date_deleted=date_deleted, change_seq=change_seq)
+            )
+
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.delete_many(..., {chunk_size=!r}) failed: {e}")
+
+        return domain.Error.new(str(e), chunk_size=chunk_size)
+
+
 def get(
     *,
     schema: str | None,
@@ -161,88 +312,48 @@ def get(
     todo_id: str,
 ) -> domain.Todo | None | domain.Error:
     try:
-        result = con.execute(sa.select(db.todo(schema=schema)).where(db.todo(schema=schema).c.todo_id == todo_id))
+        result = con.execute(_hydrated_query(schema=schema).where(db.todo(schema=schema).c.todo_id == todo_id))
 
         row = result.one_or_none()
 
         if row is None:
             return None
 
-        valid_row = _validate_row(row)
-        if isinstance(valid_row, domain.Error):
-            return valid_row
+        return _hydrate_row(row)
+    except Exception as e:
+        logger.error(f"{__file__}.get({todo_id=!r}) failed: {e}")
 
-        user = user_repo.get(
-            schema=schema,
-            con=con,
-            user_id=valid_row.user_id,
-        )
-        if isinstance(user, domain.Error):
-            return user
+        return domain.Error.new(str(e), todo_id=todo_id)
 
-        if valid_row.last_completed_by_user_id:
-            last_completed_by = user_repo.get(
-                schema=schema,
-                con=con,
-                user_id=valid_row.last_completed_by_user_id,
-            )
-            if isinstance(last_completed_by, domain.Error):
-                return last_completed_by
-        else:
-            last_completed_by = None
 
-        if valid_row.prior_completed_by_user_id:
-            prior_completed_by = user_repo.get(
-                schema=schema,
-                con=con,
-                user_id=valid_row.prior_completed_by_user_id,
-            )
-            if isinstance(prior_completed_by, domain.Error):
-                return prior_completed_by
-        else:
-            prior_completed_by = None
+def get_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo_ids: typing.Iterable[str],
+) -> list[domain.Todo] | domain.Error:
+    """Fetch the todos with the given ids, ids that are not found are skipped."""
+    try:
+        unique_todo_ids = list(dict.fromkeys(todo_ids))
 
-        category = category_repo.get(
-            schema=schema,
-            con=con,
-            category_id=valid_row.category_id,
-        )
-        if isinstance(category, domain.Error):
-            return category
+        todos: list[domain.Todo] = []
+        for chunk_start in range(0, len(unique_todo_ids), _MAX_IDS_PER_QUERY):
+            chunk = unique_todo_ids[chunk_start : chunk_start + _MAX_IDS_PER_QUERY]
 
-        if category is None:
-            return domain.Error.new(f"category_id, {valid_row.category_id}, not found.")
-
-        return domain.Todo(
-            todo_id=valid_row.todo_id,
-            template_todo_id=valid_row.template_todo_id,
-            category=category,
-            user=user or domain.DEFAULT_USER,
-            description=valid_row.description,
-            frequency=_parse_frequency(
-                advance_display_days=valid_row.advance_days,
-                days=valid_row.days,
-                due_date=valid_row.due_date,
-                expire_display_days=valid_row.expire_days,
-                frequency=valid_row.frequency,
-                month=valid_row.month,
-                month_day=valid_row.month_day,
-                start_date=valid_row.start_date,
-                week_day=valid_row.week_day,
-                week_number=valid_row.week_number,
-            ),
-            note=valid_row.note,
-            last_completed=valid_row.last_completed,
-            last_completed_by=last_completed_by,
-            prior_completed=valid_row.prior_completed,
-            prior_completed_by=prior_completed_by,
-            date_added=valid_row.date_added,
-            date_updated=valid_row.date_updated,
-        )
+            result = con.execute(_hydrated_query(schema=schema).where(db.todo(schema=schema).c.todo_id.in_(chunk)))
+
+            for row in result.fetchall():
+                todo = _hydrate_row(row)
+                if isinstance(todo, domain.Error):
+                    return todo
+
+                todos.append(todo)
+
+        return todos
     except Exception as e:
-        logger.error(f"{__file__}.get({todo_id=!r}) failed: {e}")
+        logger.error(f"{__file__}.get_many(...) failed: {e}")
 
-        return domain.Error.new(str(e), todo_id=todo_id)
+        return domain.Error.new(str(e))
 
 
 def cleanup(
@@ -274,49 +385,423 @@ def cleanup(
         return domain.Error.new(str(e), days_to_keep=days_to_keep)
 
 
-def update(
+def mark_complete(
     *,
     schema: str | None,
     con: sa.Connection,
-    todo: domain.Todo,
+    todo_id: str,
+    completed_by_user_id: str | None,
+    completed_on: datetime.date,
+) -> None | domain.Error:
+    return mark_complete_many(
+        schema=schema,
+        con=con,
+        todo_ids=(todo_id,),
+        completed_by_user_id=completed_by_user_id,
+        completed_on=completed_on,
+    )
+
+
+def mark_complete_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo_ids: typing.Iterable[str],
+    completed_by_user_id: str | None,
+    completed_on: datetime.date,
 ) -> None | domain.Error:
+    """Shift last_completed into prior_completed and stamp the new completion in a single UPDATE.
+
+    The right-hand side of each assignment sees the row's values from before the statement, so the shift is atomic and
+    there is no read-modify-write window for a concurrent completion to fall into. The completion is also appended to
+    the todo_completion log. Ids of todos that don't exist or were deleted are skipped.
+    """
     try:
-        if todo.frequency.week_day is None:
-            week_day = None
-        else:
-            week_day = todo.frequency.week_day.to_int()
+        todos = db.todo(schema=schema)
 
-        if todo.frequency.month is None:
-            month = None
-        else:
-            month = todo.frequency.month.to_int()
+        unique_todo_ids = list(dict.fromkeys(todo_ids))
+
+        change_seq = _next_change_seq(schema=schema, con=con)
+
+        log_result = todo_completion_repo.add_many(
+            schema=schema,
+            con=con,
+            todo_ids=unique_todo_ids,
+            completed_by_user_id=completed_by_user_id,
+            completed_on=completed_on,
+        )
+        if isinstance(log_result, domain.Error):
+            return log_result
+
+        for chunk_start in range(0, len(unique_todo_ids), _MAX_IDS_PER_QUERY):
+            chunk = unique_todo_ids[chunk_start : chunk_start + _MAX_IDS_PER_QUERY]
+
+            # noinspection PyComparisonWithNone
+            con.execute(
+                sa.update(todos)
+                .where(todos.c.todo_id.in_(chunk) & (todos.c.date_deleted == None))  # noqa: E711
+                .values(
+                    prior_completed=todos.c.last_completed,
+                    prior_completed_by=sa.case(
+                        (todos.c.last_completed == None, None),  # noqa: E711
+                        else_=todos.c.last_completed_by,
+                    ),
+                    last_completed=completed_on,
+                    last_completed_by=completed_by_user_id,
+                    change_seq=change_seq,
+                )
+            )
+
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.mark_complete_many({completed_by_user_id=!r}, {completed_on=!r}) failed: {e}")
+
+        return domain.Error.new(str(e), completed_by_user_id=completed_by_user_id, completed_on=completed_on)
+
+
+def mark_incomplete(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo_id: str,
+) -> None | domain.Error:
+    return mark_incomplete_many(schema=schema, con=con, todo_ids=(todo_id,))
+
+
+def mark_incomplete_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo_ids: typing.Iterable[str],
+) -> None | domain.Error:
+    """Undo the latest completion of each todo, restoring the two before it from the todo_completion log.
+
+    Todos completed before the log existed have no history to restore from, for those prior_completed is shifted back
+    into last_completed instead.
+    """
+    try:
+        todos = db.todo(schema=schema)
+
+        unique_todo_ids = list(dict.fromkeys(todo_ids))
+
+        change_seq = _next_change_seq(schema=schema, con=con)
+
+        # noinspection PyComparisonWithNone
+        restore_qry = (
+            sa.update(todos)
+            .where((todos.c.todo_id == sa.bindparam("b_todo_id")) & (todos.c.last_completed != None))  # noqa: E711
+            .values(
+                last_completed=sa.bindparam("b_last_completed"),
+                last_completed_by=sa.bindparam("b_last_completed_by"),
+                prior_completed=sa.bindparam("b_prior_completed"),
+                prior_completed_by=sa.bindparam("b_prior_completed_by"),
+                change_seq=change_seq,
+            )
+        )
+
+        for chunk_start in range(0, len(unique_todo_ids), _MAX_IDS_PER_QUERY):
+            chunk = unique_todo_ids[chunk_start : chunk_start + _MAX_IDS_PER_QUERY]
+
+            undo_result = todo_completion_repo.add_undo_many(schema=schema, con=con, todo_ids=chunk)
+            if isinstance(undo_result, domain.Error):
+                return undo_result
+
+            histories = todo_completion_repo.history_many(schema=schema, con=con, todo_ids=chunk)
+            if isinstance(histories, domain.Error):
+                return histories
+
+            restored_rows = [
+                {
+                    "b_todo_id": todo_id,
+                    "b_last_completed": history[0].completed_on,
+                    "b_last_completed_by": history[0].completed_by_user_id,
+                    "b_prior_completed": history[1].completed_on if len(history) > 1 else None,
+                    "b_prior_completed_by": history[1].completed_by_user_id if len(history) > 1 else None,
+                }
+                for todo_id, history in histories.items()
+            ]
+            if restored_rows:
+                con.execute(restore_qry, restored_rows)
+
+            if unlogged_todo_ids := [todo_id for todo_id in chunk if todo_id not in histories]:
+                # noinspection PyComparisonWithNone
+                con.execute(
+                    sa.update(todos)
+                    .where(todos.c.todo_id.in_(unlogged_todo_ids) & (todos.c.last_completed != None))  # noqa: E711
+                    .values(
+                        last_completed=todos.c.prior_completed,
+                        last_completed_by=todos.c.prior_completed_by,
+                        prior_completed=None,
+                        prior_completed_by=None,
+                        change_seq=change_seq,
+                    )
+                )
+
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.mark_incomplete_many(...) failed: {e}")
+
+        return domain.Error.new(str(e))
+
+
+def next_appearance(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    category_id: str | domain.Unspecified,
+    user_id: str | domain.Unspecified,
+    description_like: str | domain.Unspecified,
+    ref_date: datetime.date,
+) -> datetime.date | None | domain.Error:
+    """The first date after ref_date on which a todo matching the filters that isn't due on ref_date could come due.
+
+    This is a single MIN over the persisted display_next_transition column, so the display windows have to be current
+    as of ref_date.
+    """
+    try:
+        todos = db.todo(schema=schema)
+
+        # a todo without a display window isn't due either
+        is_hidden = sa.not_(sa.func.coalesce(_is_due(schema=schema, due_on=ref_date), sa.false()))
+
+        hidden_transitions = (
+            _where_query(
+                schema=schema,
+                dialect=con.dialect,
+                category_id=category_id,
+                user_id=user_id,
+                description_like=description_like,
+                template_todo_id=domain.Unspecified(),
+                due_on=domain.Unspecified(),
+            )
+            .where(is_hidden & (todos.c.display_next_transition > ref_date))
+            .with_only_columns(todos.c.display_next_transition)
+            .order_by(None)
+            .subquery("hidden_transitions")
+        )
+
+        next_appearance_date: datetime.date | None = con.execute(
+            sa.select(sa.func.min(hidden_transitions.c.display_next_transition))
+        ).scalar_one()
+
+        return next_appearance_date
+    except Exception as e:
+        logger.error(
+            f"{__file__}.next_appearance({category_id=!r}, {user_id=!r}, {description_like=!r}, {ref_date=!r}) "
+            f"failed: {e}"
+        )
+
+        return domain.Error.new(
+            str(e),
+            category_id=category_id,
+            user_id=user_id,
+            description_like=description_like,
+            ref_date=ref_date,
+        )
+
+
+def refresh_display_windows(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    ref_date: datetime.date,
+) -> int | domain.Error:
+    """Recompute the persisted display windows that were calculated before ref_date.
+
+    Only the rows whose window actually moved are rewritten, the rest just have their display_as_of bumped.
+    Returns the number of rows whose window changed.
+    """
+    try:
+        todos = db.todo(schema=schema)
+
+        # noinspection PyComparisonWithNone
+        is_stale = (todos.c.date_deleted == None) & (  # noqa: E711
+            (todos.c.display_as_of == None) | (todos.c.display_as_of < ref_date)  # noqa: E711
+        )
+
+        result = con.execute(
+            sa.select(
+                todos.c.todo_id,
+                todos.c.frequency,
+                todos.c.month,
+                todos.c.week_day,
+                todos.c.week_number,
+                todos.c.month_day,
+                todos.c.days,
+                todos.c.due_date,
+                todos.c.advance_days,
+                todos.c.expire_days,
+                todos.c.start_date,
+                todos.c.display_start,
+                todos.c.display_end,
+                todos.c.display_next_transition,
+            ).where(is_stale)
+        )
+
+        changed_rows: list[dict[str, typing.Any]] = []
+        for row in result.fetchall():
+            frequency = _parse_frequency(
+                advance_display_days=row.advance_days,
+                days=row.days,
+                due_date=row.due_date,
+                expire_display_days=row.expire_days,
+                frequency=row.frequency,
+                month=row.month,
+                month_day=row.month_day,
+                start_date=row.start_date,
+                week_day=row.week_day,
+                week_number=row.week_number,
+            )
+
+            values = _display_window_values(frequency=frequency, ref_date=ref_date)
+            if (
+                values["due_date"],
+                values["display_start"],
+                values["display_end"],
+                values["display_next_transition"],
+            ) != (
+                row.due_date,
+                row.display_start,
+                row.display_end,
+                row.display_next_transition,
+            ):
+                changed_rows.append({"b_todo_id": row.todo_id, **{f"b_{k}": v for k, v in values.items()}})
+
+        if changed_rows:
+            con.execute(
+                sa.update(todos)
+                .where(todos.c.todo_id == sa.bindparam("b_todo_id"))
+                .values(
+                    due_date=sa.bindparam("b_due_date"),
+                    display_start=sa.bindparam("b_display_start"),
+                    display_end=sa.bindparam("b_display_end"),
+                    display_next_transition=sa.bindparam("b_display_next_transition"),
+                    display_as_of=sa.bindparam("b_display_as_of"),
+                ),
+                changed_rows,
+            )
+
+        con.execute(sa.update(todos).where(is_stale).values(display_as_of=ref_date))
+
+        return len(changed_rows)
+    except Exception as e:
+        logger.error(f"{__file__}.refresh_display_windows({ref_date=!r}) failed: {e}")
+
+        return domain.Error.new(str(e), ref_date=ref_date)
+
+
+def save(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo: domain.Todo,
+) -> domain.Todo | domain.Error:
+    """Insert the todo, or overwrite it if it already exists, and return it as persisted.
+
+    On SQLite 3.35+ and PostgreSQL this is a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement.
+    A new todo comes back with date_updated set to None, an existing one keeps its date_added and gets a new
+    date_updated.
+
+    Only the editable columns of an existing todo are overwritten. Its completions and date_deleted are left as they
+    are, so saving a copy that was read before another client completed or deleted the todo doesn't undo that. When
+    the persisted completions differ from the copy's, the todo is read back so the result has them.
+    """
+    try:
+        if todo.todo_id == "":
+            return domain.Error.new(f"Not a valid uuid: {todo.todo_id}", todo=todo)
+
+        todos = db.todo(schema=schema)
+
+        values = _row_values(todo=todo, change_seq=_next_change_seq(schema=schema, con=con))
+        values["date_updated"] = None
+
+        now = datetime.datetime.now()
+
+        overwritten_column_names = [column_name for column_name in values if column_name not in _SAVE_PRESERVED_COLUMNS]
+
+        if con.dialect.name in ("postgresql", "sqlite") and con.dialect.insert_returning:
+            # both dialects' inserts support ON CONFLICT DO UPDATE, but they are separate classes
+            insert_qry: postgresql.Insert | sqlite.Insert
+            if con.dialect.name == "postgresql":
+                insert_qry = postgresql.insert(todos).values(**values)
+            else:
+                insert_qry = sqlite.insert(todos).values(**values)
+
+            upsert_qry = insert_qry.on_conflict_do_update(
+                index_elements=[todos.c.todo_id],
+                set_={
+                    **{column_name: insert_qry.excluded[column_name] for column_name in overwritten_column_names},
+                    "date_updated": now,
+                },
+            ).returning(
+                todos.c.date_added,
+                todos.c.date_updated,
+                *(todos.c[column_name] for column_name in _COMPLETION_COLUMN_NAMES),
+            )
+
+            row = con.execute(upsert_qry).one()
+
+            if tuple(row[2:]) != tuple(values[column_name] for column_name in _COMPLETION_COLUMN_NAMES):
+                return _get_saved(schema=schema, con=con, todo=todo)
+
+            return dataclasses.replace(todo, date_added=row.date_added, date_updated=row.date_updated)
+
+        # older SQLite builds can't use RETURNING, so check then write within the same transaction
+        preexisting_row = con.execute(
+            sa.select(
+                todos.c.date_added,
+                *(todos.c[column_name] for column_name in _COMPLETION_COLUMN_NAMES),
+            ).where(todos.c.todo_id == todo.todo_id)
+        ).one_or_none()
+
+        if preexisting_row is None:
+            con.execute(sa.insert(todos).values(**values))
+
+            return dataclasses.replace(todo, date_updated=None)
 
+        con.execute(
+            sa.update(todos)
+            .where(todos.c.todo_id == todo.todo_id)
+            .values(
+                **{column_name: values[column_name] for column_name in overwritten_column_names},
+                date_updated=now,
+            )
+        )
+
+        if tuple(preexisting_row[1:]) != tuple(values[column_name] for column_name in _COMPLETION_COLUMN_NAMES):
+            return _get_saved(schema=schema, con=con, todo=todo)
+
+        return dataclasses.replace(todo, date_added=preexisting_row.date_added, date_updated=now)
+    except Exception as e:
+        logger.error(f"{__file__}.save({todo=!r}) failed: {e}")
+
+        return domain.Error.new(str(e), todo=todo)
+
+
+def _get_saved(*, schema: str | None, con: sa.Connection, todo: domain.Todo) -> domain.Todo | domain.Error:
+    saved_todo = get(schema=schema, con=con, todo_id=todo.todo_id)
+    if saved_todo is None:
+        return domain.Error.new(f"The todo, {todo.todo_id}, was not found after saving it.", todo=todo)
+
+    return saved_todo
+
+
+def update(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todo: domain.Todo,
+) -> None | domain.Error:
+    try:
         con.execute(
             sa.update(db.todo(schema=schema))
             .where(db.todo(schema=schema).c.todo_id == todo.todo_id)
             .values(
-                template_todo_id=todo.template_todo_id,
-                user_id=todo.user.user_id,
-                expire_days=todo.frequency.expire_display_days,
-                advance_days=todo.frequency.advance_display_days,
-                category_id=todo.category.category_id,
-                description=todo.description,
-                note=todo.note,
-                start_date=todo.frequency.start_date,
-                date_added=todo.date_added,
-                date_updated=todo.date_updated,
-                date_deleted=None,
-                frequency=FREQUENCY_NAME_LKP[todo.frequency.name],
-                week_day=week_day,
-                week_number=todo.frequency.week_number,
-                month=month,
-                month_day=todo.frequency.month_day,
-                days=todo.frequency.days,
-                due_date=domain.date_calc.due_date(frequency=todo.frequency, ref_date=datetime.date.today()),
-                last_completed=todo.last_completed,
-                prior_completed=todo.prior_completed,
-                last_completed_by=None if todo.last_completed_by is None else todo.last_completed_by.user_id,
-                prior_completed_by=None if todo.prior_completed_by is None else todo.prior_completed_by.user_id,
+                **{
+                    k: v
+                    for k, v in _row_values(todo=todo, change_seq=_next_change_seq(schema=schema, con=con)).items()
+                    if k != "todo_id"
+                }
             )
         )
 
@@ -327,6 +812,49 @@ def update(
         return domain.Error.new(str(e), todo=todo)
 
 
+def update_many(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    todos: typing.Iterable[domain.Todo],
+    chunk_size: int,
+) -> None | domain.Error:
+    """Overwrite the todos with one executemany per chunk of chunk_size rows."""
+    try:
+        if chunk_size < 1:
+            return domain.Error.new("chunk_size must be greater than 0.", chunk_size=chunk_size)
+
+        todo_table = db.todo(schema=schema)
+
+        # the b_ prefix keeps the bind parameter names from colliding with the column names
+        change_seq = _next_change_seq(schema=schema, con=con)
+
+        rows = [{f"b_{k}": v for k, v in _row_values(todo=todo, change_seq=change_seq).items()} for todo in todos]
+        if not rows:
+            return None
+
+        qry = (
+            sa.update(todo_table)
+            .where(todo_table.c.todo_id == sa.bindparam("b_todo_id"))
+            .values(
+                {
+                    column_name.removeprefix("b_"): sa.bindparam(column_name)
+                    for column_name in rows[0]
+                    if column_name != "b_todo_id"
+                }
+            )
+        )
+
+        for chunk_start in range(0, len(rows), chunk_size):
+            con.execute(qry, rows[chunk_start : chunk_start + chunk_size])
+
+        return None
+    except Exception as e:
+        logger.error(f"{__file__}.update_many(..., {chunk_size=!r}) failed: {e}")
+
+        return domain.Error.new(str(e), chunk_size=chunk_size)
+
+
 def where(
     *,
     schema: str | None,
@@ -335,101 +863,740 @@ def where(
     user_id: str | domain.Unspecified,
     description_like: str | domain.Unspecified,
     template_todo_id: str | domain.Unspecified,
+    due_on: datetime.date | domain.Unspecified,
 ) -> list[domain.Todo] | domain.Error:
+    todos: list[domain.Todo] = []
+    for todo in iter_where(
+        schema=schema,
+        con=con,
+        category_id=category_id,
+        user_id=user_id,
+        description_like=description_like,
+        template_todo_id=template_todo_id,
+        due_on=due_on,
+        occurs_between=domain.Unspecified(),
+    ):
+        if isinstance(todo, domain.Error):
+            return todo
+
+        todos.append(todo)
+
+    return todos
+
+
+def iter_where(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    category_id: str | domain.Unspecified,
+    user_id: str | domain.Unspecified,
+    description_like: str | domain.Unspecified,
+    template_todo_id: str | domain.Unspecified,
+    due_on: datetime.date | domain.Unspecified,
+    occurs_between: tuple[datetime.date, datetime.date] | domain.Unspecified,
+    batch_size: int = 1_000,
+) -> typing.Generator[domain.Todo | domain.Error, None, None]:
+    """Stream the matching todos in due date order, or best match first for a search, fetching batch_size rows at a
+    time through a server-side cursor.
+
+    occurs_between narrows the todos down to those that can fall on a date in that range, inclusive. It only rules out
+    what the columns can, a todo that starts after the range or a one-off dated outside it.
+
+    Rows are validated and hydrated as they are consumed. If anything goes wrong a domain.Error is yielded in place of
+    the next todo and the generator stops, so the generator has to be consumed while con is still open.
+    """
     try:
-        categories = category_repo.where(schema=schema, con=con, active=False)
-        if isinstance(categories, domain.Error):
-            return categories
+        lookups = _Lookups.load(schema=schema, con=con)
+        if isinstance(lookups, domain.Error):
+            yield lookups
+            return
 
-        users = user_repo.where(
+        qry = _where_query(
             schema=schema,
-            con=con,
-            active=False,
+            dialect=con.dialect,
+            category_id=category_id,
+            user_id=user_id,
+            description_like=description_like,
+            template_todo_id=template_todo_id,
+            due_on=due_on,
+        )
+        if isinstance(occurs_between, tuple):
+            qry = qry.where(_may_occur_between(schema=schema, start=occurs_between[0], end=occurs_between[1]))
+
+        # yield_per implies stream_results, so the driver hands rows over batch by batch instead of all at once
+        result = con.execute(qry, execution_options={"yield_per": batch_size})
+
+        try:
+            for row in result:
+                todo = _decode_row(row, lookups=lookups)
+                if todo is None:
+                    todo = _strict_decode_row(row, lookups=lookups)
+                    if isinstance(todo, domain.Error):
+                        yield todo
+                        return
+
+                yield todo
+        finally:
+            # release the cursor if the consumer stops early
+            result.close()
+    except Exception as e:
+        logger.error(
+            f"{__file__}.iter_where({category_id=!r}, {user_id=!r}, {description_like=!r}, {due_on=!r}) failed: {e}"
         )
-        if isinstance(users, domain.Error):
-            return users
 
-        qry = sa.select(db.todo(schema=schema)).where(db.todo(schema=schema).c.date_deleted == None)  # noqa
+        yield domain.Error.new(
+            str(e),
+            category_id=category_id,
+            user_id=user_id,
+            description_starts_with=description_like,
+            due_on=due_on,
+        )
 
-        if isinstance(category_id, str):
-            if category_id:
-                qry = qry.where(db.todo(schema=schema).c.category_id == category_id)
 
-        if isinstance(user_id, str):
-            if user_id:
-                qry = qry.where(db.todo(schema=schema).c.user_id == user_id)
+def explain_where(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    category_id: str | domain.Unspecified,
+    user_id: str | domain.Unspecified,
+    description_like: str | domain.Unspecified,
+    template_todo_id: str | domain.Unspecified,
+    due_on: datetime.date | domain.Unspecified,
+) -> list[str] | domain.Error:
+    """Query plan for the statement where() would run, so index usage can be checked."""
+    return db.explain(
+        con=con,
+        qry=_where_query(
+            schema=schema,
+            dialect=con.dialect,
+            category_id=category_id,
+            user_id=user_id,
+            description_like=description_like,
+            template_todo_id=template_todo_id,
+            due_on=due_on,
+        ),
+    )
 
-        if isinstance(description_like, str):
-            qry = qry.where(db.todo(schema=schema).c.description.ilike(f"%{description_like}%"))
 
-        if isinstance(template_todo_id, str):
-            qry = qry.where(db.todo(schema=schema).c.template_todo_id == template_todo_id)
+def _where_query(
+    *,
+    schema: str | None,
+    dialect: sa.Dialect,
+    category_id: str | domain.Unspecified,
+    user_id: str | domain.Unspecified,
+    description_like: str | domain.Unspecified,
+    template_todo_id: str | domain.Unspecified,
+    due_on: datetime.date | domain.Unspecified,
+) -> sa.Select[typing.Any]:
+    qry = sa.select(db.todo(schema=schema)).where(
+        *_filters(
+            schema=schema,
+            category_id=category_id,
+            user_id=user_id,
+            template_todo_id=template_todo_id,
+            due_on=due_on,
+        )
+    )
 
-        category_by_id: dict[str, domain.Category] = {category.category_id: category for category in categories}
+    if isinstance(description_like, str) and description_like:
+        return _search(qry, schema=schema, dialect=dialect, text=description_like)
 
-        user_by_id: dict[str, domain.User] = {user.user_id: user for user in users}
+    # the persisted due date is only as current as the display window it was worked out with
+    return qry.order_by(db.todo(schema=schema).c.due_date.nulls_first())
 
-        todos: list[domain.Todo] = []
-        for row in con.execute(qry).fetchall():
-            valid_row = _validate_row(row)
-            if isinstance(valid_row, domain.Error):
-                return valid_row
 
-            category = category_by_id.get(valid_row.category_id, domain.TODO_CATEGORY)
+def _filters(
+    *,
+    schema: str | None,
+    category_id: str | domain.Unspecified,
+    user_id: str | domain.Unspecified,
+    template_todo_id: str | domain.Unspecified,
+    due_on: datetime.date | domain.Unspecified,
+) -> list[sa.ColumnElement[bool]]:
+    todos = db.todo(schema=schema)
 
-            user = user_by_id.get(valid_row.user_id, domain.DEFAULT_USER)
+    predicates: list[sa.ColumnElement[bool]] = [todos.c.date_deleted == None]  # noqa
 
-            if valid_row.last_completed_by_user_id is None:
-                last_completed_by: domain.User | None = None
-            else:
-                last_completed_by = user_by_id.get(valid_row.last_completed_by_user_id)
+    if isinstance(category_id, str):
+        if category_id:
+            predicates.append(todos.c.category_id == category_id)
 
-            if valid_row.prior_completed_by_user_id is None:
-                prior_completed_by: domain.User | None = None
-            else:
-                prior_completed_by = user_by_id.get(valid_row.prior_completed_by_user_id)
-
-            todo = domain.Todo(
-                todo_id=valid_row.todo_id,
-                template_todo_id=valid_row.template_todo_id,
-                category=category,
-                user=user,
-                description=valid_row.description,
-                frequency=_parse_frequency(
-                    advance_display_days=valid_row.advance_days,
-                    days=valid_row.days,
-                    due_date=valid_row.due_date,
-                    expire_display_days=valid_row.expire_days,
-                    frequency=valid_row.frequency,
-                    month=valid_row.month,
-                    month_day=valid_row.month_day,
-                    start_date=valid_row.start_date,
-                    week_day=valid_row.week_day,
-                    week_number=valid_row.week_number,
-                ),
-                note=valid_row.note,
-                last_completed=valid_row.last_completed,
-                last_completed_by=last_completed_by,
-                prior_completed=valid_row.prior_completed,
-                prior_completed_by=prior_completed_by,
-                date_added=valid_row.date_added,
-                date_updated=valid_row.date_updated,
-            )
+    if isinstance(user_id, str):
+        if user_id:
+            predicates.append(todos.c.user_id == user_id)
 
-            todos.append(todo)
+    if isinstance(template_todo_id, str):
+        predicates.append(todos.c.template_todo_id == template_todo_id)
 
-        return todos
-    except Exception as e:
-        logger.error(f"{__file__}.where({category_id=!r}, {user_id=!r}, {description_like=!r}) failed: {e}")
+    if isinstance(due_on, datetime.date):
+        predicates.append(_is_due(schema=schema, due_on=due_on))
 
-        return domain.Error.new(
-            str(e),
-            category_id=category_id,
-            user_id=user_id,
-            description_starts_with=description_like,
+    return predicates
+
+
+def _search(
+    qry: sa.Select[typing.Any],
+    /,
+    *,
+    schema: str | None,
+    dialect: sa.Dialect,
+    text: str,
+) -> sa.Select[typing.Any]:
+    """Filter qry to the todos whose description or note contains text, best match first.
+
+    Where the backend can't rank the matches, they come back in due date order.
+
+    On SQLite this goes through the todo_fts trigram index. Its tokens are 3 characters long, so shorter search terms
+    fall back to a scan with ILIKE.
+    """
+    todos = db.todo(schema=schema)
+
+    if len(text) >= 3 and db.sqlite_fts_available(dialect=dialect):
+        todo_fts = db.todo_fts(schema=schema)
+
+        # quoting the search text as an FTS5 string makes the whole thing one phrase, so it's matched as a substring
+        matches = (
+            sa.select(todo_fts.c.todo_id, todo_fts.c.rank)
+            .where(todo_fts.c.todo_fts.op("MATCH")('"' + text.replace('"', '""') + '"'))
+            .subquery("todo_fts_match")
+        )
+
+        return qry.join(matches, matches.c.todo_id == todos.c.todo_id).order_by(matches.c.rank, todos.c.due_date)
+
+    qry = qry.where(todos.c.description.ilike(f"%{text}%") | todos.c.note.ilike(f"%{text}%"))
+
+    if dialect.name == "postgresql":
+        document = sa.func.to_tsvector("simple", todos.c.description + " " + todos.c.note)
+
+        return qry.order_by(
+            sa.func.ts_rank(document, sa.func.plainto_tsquery("simple", text)).desc(),
+            todos.c.due_date,
         )
 
+    return qry.order_by(todos.c.due_date)
+
+
+def _hydrated_query(*, schema: str | None) -> sa.Select[typing.Any]:
+    """Select a todo along with its owner, completers and category in a single statement."""
+    todos = db.todo(schema=schema)
+    categories = db.category(schema=schema)
+    owners = db.user(schema=schema).alias("owner")
+    last_completed_by_users = db.user(schema=schema).alias("last_completed_by_user")
+    prior_completed_by_users = db.user(schema=schema).alias("prior_completed_by_user")
+
+    return sa.select(
+        todos,
+        *_prefixed_columns(owners, prefix="owner__"),
+        *_prefixed_columns(last_completed_by_users, prefix="last_completed_by__"),
+        *_prefixed_columns(prior_completed_by_users, prefix="prior_completed_by__"),
+        *_prefixed_columns(categories, prefix="category__"),
+    ).select_from(
+        todos.outerjoin(owners, owners.c.user_id == todos.c.user_id)
+        .outerjoin(last_completed_by_users, last_completed_by_users.c.user_id == todos.c.last_completed_by)
+        .outerjoin(prior_completed_by_users, prior_completed_by_users.c.user_id == todos.c.prior_completed_by)
+        .outerjoin(categories, categories.c.category_id == todos.c.category_id)
+    )
+
+
+def _prefixed_columns(table: sa.FromClause, /, *, prefix: str) -> list[sa.Label[typing.Any]]:
+    return [column.label(f"{prefix}{column.name}") for column in table.columns]
+
+
+def _hydrate_row(row: sa.Row[typing.Any], /) -> domain.Todo | domain.Error:
+    valid_row = _validate_row(row)
+    if isinstance(valid_row, domain.Error):
+        return valid_row
+
+    values = row._mapping
+
+    user = _joined_user(values, prefix="owner__")
+    if isinstance(user, domain.Error):
+        return user
+
+    if valid_row.last_completed_by_user_id:
+        last_completed_by = _joined_user(values, prefix="last_completed_by__")
+        if isinstance(last_completed_by, domain.Error):
+            return last_completed_by
+    else:
+        last_completed_by = None
+
+    if valid_row.prior_completed_by_user_id:
+        prior_completed_by = _joined_user(values, prefix="prior_completed_by__")
+        if isinstance(prior_completed_by, domain.Error):
+            return prior_completed_by
+    else:
+        prior_completed_by = None
+
+    if values["category__category_id"] is None:
+        return domain.Error.new(f"category_id, {valid_row.category_id}, not found.")
+
+    category = domain.Category(
+        category_id=values["category__category_id"],
+        name=values["category__name"],
+        note=values["category__note"],
+        date_added=values["category__date_added"],
+        date_updated=values["category__date_updated"],
+        date_deleted=values["category__date_deleted"],
+    )
+
+    return domain.Todo(
+        todo_id=valid_row.todo_id,
+        template_todo_id=valid_row.template_todo_id,
+        category=category,
+        user=user or domain.DEFAULT_USER,
+        description=valid_row.description,
+        frequency=_parse_frequency(
+            advance_display_days=valid_row.advance_days,
+            days=valid_row.days,
+            due_date=valid_row.due_date,
+            expire_display_days=valid_row.expire_days,
+            frequency=valid_row.frequency,
+            month=valid_row.month,
+            month_day=valid_row.month_day,
+            start_date=valid_row.start_date,
+            week_day=valid_row.week_day,
+            week_number=valid_row.week_number,
+        ),
+        note=valid_row.note,
+        last_completed=valid_row.last_completed,
+        last_completed_by=last_completed_by,
+        prior_completed=valid_row.prior_completed,
+        prior_completed_by=prior_completed_by,
+        date_added=valid_row.date_added,
+        date_updated=valid_row.date_updated,
+    )
+
+
+def _joined_user(values: sa.RowMapping, /, *, prefix: str) -> domain.User | None | domain.Error:
+    if values[f"{prefix}user_id"] is None:
+        return None
+
+    errors: list[str] = []
+    for column_name, expected_type in (
+        ("user_id", str),
+        ("username", str),
+        ("display_name", str),
+        ("is_admin", bool),
+        ("date_added", datetime.datetime),
+    ):
+        if not isinstance(values[f"{prefix}{column_name}"], expected_type):
+            errors.append(f"{column_name}, {values[f'{prefix}{column_name}']!r}, is not a {expected_type.__name__}.")
+
+    if errors:
+        error_csv = ", ".join(errors)
+        return domain.Error.new(f"Invalid User columns, {prefix!r}: {error_csv}")
+
+    return domain.User(
+        user_id=values[f"{prefix}user_id"],
+        username=values[f"{prefix}username"],
+        display_name=values[f"{prefix}display_name"],
+        is_admin=values[f"{prefix}is_admin"],
+        date_added=values[f"{prefix}date_added"],
+        date_updated=values[f"{prefix}date_updated"],
+    )
+
+
+def _row_values(*, todo: domain.Todo, change_seq: int) -> dict[str, typing.Any]:
+    """Column values for writing a todo, including its display window as of today."""
+    if todo.frequency.week_day is None:
+        week_day = None
+    else:
+        week_day = todo.frequency.week_day.to_int()
+
+    if todo.frequency.month is None:
+        month = None
+    else:
+        month = todo.frequency.month.to_int()
+
+    return {
+        "todo_id": todo.todo_id,
+        "template_todo_id": todo.template_todo_id,
+        "expire_days": todo.frequency.expire_display_days,
+        "advance_days": todo.frequency.advance_display_days,
+        "user_id": todo.user.user_id,
+        "category_id": todo.category.category_id,
+        "description": todo.description,
+        "note": todo.note,
+        "start_date": todo.frequency.start_date,
+        "date_added": todo.date_added,
+        "date_updated": todo.date_updated,
+        "date_deleted": None,
+        "frequency": FREQUENCY_NAME_LKP[todo.frequency.name],
+        "week_day": week_day,
+        "week_number": todo.frequency.week_number,
+        "month": month,
+        "month_day": todo.frequency.month_day,
+        "days": todo.frequency.days,
+        "last_completed": todo.last_completed,
+        "prior_completed": todo.prior_completed,
+        "last_completed_by": None if todo.last_completed_by is None else todo.last_completed_by.user_id,
+        "prior_completed_by": None if todo.prior_completed_by is None else todo.prior_completed_by.user_id,
+        **_display_window_values(frequency=todo.frequency, ref_date=domain.clock.today()),
+        "change_seq": change_seq,
+    }
+
+
+def _display_window_values(
+    *,
+    frequency: domain.Frequency,
+    ref_date: datetime.date,
+) -> dict[str, datetime.date | None]:
+    window = domain.date_calc.display_window(frequency=frequency, ref_date=ref_date)
+    if window is None:
+        display_start, display_end = None, None
+    else:
+        display_start, display_end = window
+
+    return {
+        "due_date": domain.date_calc.due_date(frequency=frequency, ref_date=ref_date),
+        "display_start": display_start,
+        "display_end": display_end,
+        "display_next_transition": domain.date_calc.next_transition(frequency=frequency, ref_date=ref_date),
+        "display_as_of": ref_date,
+    }
+
+
+def _is_due(*, schema: str | None, due_on: datetime.date) -> sa.ColumnElement[bool]:
+    # mirrors domain.Todo.should_display against the persisted display window
+    todos = db.todo(schema=schema)
+
+    latest_completed = sa.func.coalesce(todos.c.last_completed, todos.c.prior_completed)
+
+    # noinspection PyComparisonWithNone
+    return (
+        (todos.c.display_start <= due_on)
+        & (todos.c.display_end >= due_on)
+        & (
+            (latest_completed == None)  # noqa: E711
+            | (latest_completed < todos.c.display_start)
+            | (latest_completed > todos.c.display_end)
+        )
+    )
+
+
+def _may_occur_between(*, schema: str | None, start: datetime.date, end: datetime.date) -> sa.ColumnElement[bool]:
+    # mirrors the range checks in domain.date_calc.occurrences, a one-off's due_date column is its own date
+    todos = db.todo(schema=schema)
+
+    return (todos.c.start_date <= end) & (
+        (todos.c.frequency != FREQUENCY_NAME_LKP[domain.FrequencyType.Once])
+        | (todos.c.due_date.between(start, end) & (todos.c.due_date >= todos.c.start_date))
+    )
+
+
+def _next_change_seq(*, schema: str | None, con: sa.Connection) -> int:
+    """Hand out the next change sequence number for a todo write.
+
+    The counter row stays locked until the transaction ends, so on PostgreSQL concurrent writers take turns and the
+    sequence numbers become visible in the order they were handed out. A reader never skips past a write that commits
+    late, which a SEQUENCE can't promise.
+
+    On PostgreSQL the write is also announced to todo_change_listener from the same statement, the notification is
+    delivered on commit.
+    """
+    counters = db.change_counter(schema=schema)
+
+    increment_qry = sa.update(counters).where(counters.c.name == "todo").values(value=counters.c.value + 1)
+
+    if con.dialect.name == "postgresql":
+        notify = sa.func.pg_notify(todo_change_listener.channel(schema=schema), sa.cast(counters.c.value, sa.Text))
+
+        change_seq: int = con.execute(increment_qry.returning(counters.c.value, notify)).one().value
+    elif con.dialect.update_returning:
+        change_seq = con.execute(increment_qry.returning(counters.c.value)).scalar_one()
+    else:
+        # SQLite before 3.35 has no RETURNING
+        con.execute(increment_qry)
+
+        change_seq = con.execute(sa.select(counters.c.value).where(counters.c.name == "todo")).scalar_one()
+
+    return change_seq
+
+
+class _Lookups:
+    """The categories and users the todos being decoded refer to, read through lookup_cache.
+
+    An id the cache doesn't know may belong to a category or user another client added since the cache was loaded,
+    so the first miss on each table drops the cached table and loads it again. Only an id that is still missing falls
+    back to the default, and that is logged.
+    """
+
+    def __init__(self, *, schema: str | None, con: sa.Connection):
+        self._schema: typing.Final[str | None] = schema
+        self._con: typing.Final[sa.Connection] = con
+
+        self._category_by_id: dict[str, domain.Category] = {}
+        self._user_by_id: dict[str, domain.User] = {}
+
+        self._categories_reloaded = False
+        self._users_reloaded = False
 
+    @classmethod
+    def load(cls, *, schema: str | None, con: sa.Connection) -> "_Lookups | domain.Error":
+        lookups = cls(schema=schema, con=con)
+
+        categories_result = lookups._load_categories()
+        if isinstance(categories_result, domain.Error):
+            return categories_result
+
+        users_result = lookups._load_users()
+        if isinstance(users_result, domain.Error):
+            return users_result
+
+        return lookups
+
+    def category(self, category_id: str, /) -> domain.Category:
+        category = self._category_by_id.get(category_id)
+        if category is None and not self._categories_reloaded:
+            self._categories_reloaded = True
+
+            lookup_cache.invalidate_categories(schema=self._schema, engine=self._con.engine)
+
+            reload_result = self._load_categories()
+            if isinstance(reload_result, domain.Error):
+                logger.error(f"{self.__class__.__name__}.category({category_id=!r}) reload failed: {reload_result!s}")
+
+            category = self._category_by_id.get(category_id)
+
+        if category is None:
+            logger.error(f"category_id, {category_id}, not found, using {domain.TODO_CATEGORY.name} instead.")
+
+            return domain.TODO_CATEGORY
+
+        return category
+
+    def user(self, user_id: str, /) -> domain.User:
+        user = self._find_user(user_id)
+        if user is None:
+            logger.error(f"user_id, {user_id}, not found, using {domain.DEFAULT_USER.username} instead.")
+
+            return domain.DEFAULT_USER
+
+        return user
+
+    def completed_by(self, user_id: str, /) -> domain.User | None:
+        user = self._find_user(user_id)
+        if user is None:
+            logger.error(f"user_id, {user_id}, not found, leaving the completion's user empty.")
+
+        return user
+
+    def _find_user(self, user_id: str, /) -> domain.User | None:
+        user = self._user_by_id.get(user_id)
+        if user is None and not self._users_reloaded:
+            self._users_reloaded = True
+
+            lookup_cache.invalidate_users(schema=self._schema, engine=self._con.engine)
+
+            reload_result = self._load_users()
+            if isinstance(reload_result, domain.Error):
+                logger.error(f"{self.__class__.__name__}._find_user({user_id=!r}) reload failed: {reload_result!s}")
+
+            user = self._user_by_id.get(user_id)
+
+        return user
+
+    def _load_categories(self) -> None | domain.Error:
+        categories = lookup_cache.categories(schema=self._schema, con=self._con, active=False)
+        if isinstance(categories, domain.Error):
+            return categories
+
+        self._category_by_id = {category.category_id: category for category in categories}
+
+        return None
+
+    def _load_users(self) -> None | domain.Error:
+        users = lookup_cache.users(schema=self._schema, con=self._con, active=False)
+        if isinstance(users, domain.Error):
+            return users
+
+        self._user_by_id = {user.user_id: user for user in users}
+
+        return None
+
+
+# positions of the columns _decode_row reads, in the order db.todo declares them
+_DECODED_COLUMN_NAMES = (
+    "todo_id",
+    "description",
+    "note",
+    "user_id",
+    "category_id",
+    "advance_days",
+    "expire_days",
+    "start_date",
+    "last_completed",
+    "last_completed_by",
+    "prior_completed",
+    "prior_completed_by",
+    "template_todo_id",
+    "date_added",
+    "date_updated",
+    "frequency",
+    "month",
+    "week_day",
+    "week_number",
+    "month_day",
+    "days",
+    "due_date",
+)
+
+_decoded_column_values = operator.itemgetter(
+    *(
+        [column.name for column in db.todo(schema=None).columns].index(column_name)
+        for column_name in _DECODED_COLUMN_NAMES
+    )
+)
+
+
+def _decode_row(
+    row: sa.Row[typing.Any],
+    /,
+    *,
+    lookups: _Lookups,
+) -> domain.Todo | None:
+    """Build a todo straight from the positions of a row selected from db.todo.
+
+    The column types already did the conversions, so this only makes cheap exact-type checks. It returns None when one
+    of them fails, in which case the caller should fall back to _strict_decode_row for a descriptive error.
+    """
+    (
+        todo_id,
+        description,
+        note,
+        user_id,
+        category_id,
+        advance_days,
+        expire_days,
+        start_date,
+        last_completed,
+        last_completed_by_user_id,
+        prior_completed,
+        prior_completed_by_user_id,
+        template_todo_id,
+        date_added,
+        date_updated,
+        frequency,
+        month,
+        week_day,
+        week_number,
+        month_day,
+        days,
+        due_date,
+    ) = _decoded_column_values(row)
+
+    if not (
+        type(todo_id) is str
+        and type(description) is str
+        and type(note) is str
+        and type(user_id) is str
+        and type(category_id) is str
+        and type(frequency) is str
+        and type(advance_days) is int
+        and type(expire_days) is int
+        and type(start_date) is datetime.date
+        and type(date_added) is datetime.datetime
+        and (date_updated is None or type(date_updated) is datetime.datetime)
+        and (last_completed is None or type(last_completed) is datetime.date)
+        and (prior_completed is None or type(prior_completed) is datetime.date)
+        and (due_date is None or type(due_date) is datetime.date)
+        and (last_completed_by_user_id is None or type(last_completed_by_user_id) is str)
+        and (prior_completed_by_user_id is None or type(prior_completed_by_user_id) is str)
+        and (template_todo_id is None or type(template_todo_id) is str)
+        and (month is None or type(month) is int)
+        and (week_day is None or type(week_day) is int)
+        and (week_number is None or type(week_number) is int)
+        and (month_day is None or type(month_day) is int)
+        and (days is None or type(days) is int)
+    ):
+        return None
+
+    return domain.Todo(
+        todo_id=todo_id,
+        template_todo_id=template_todo_id,
+        category=lookups.category(category_id),
+        user=lookups.user(user_id),
+        description=description,
+        frequency=_parse_frequency(
+            advance_display_days=advance_days,
+            days=days,
+            due_date=due_date,
+            expire_display_days=expire_days,
+            frequency=frequency,
+            month=month,
+            month_day=month_day,
+            start_date=start_date,
+            week_day=week_day,
+            week_number=week_number,
+        ),
+        note=note,
+        last_completed=last_completed,
+        last_completed_by=(
+            None if last_completed_by_user_id is None else lookups.completed_by(last_completed_by_user_id)
+        ),
+        prior_completed=prior_completed,
+        prior_completed_by=(
+            None if prior_completed_by_user_id is None else lookups.completed_by(prior_completed_by_user_id)
+        ),
+        date_added=date_added,
+        date_updated=date_updated,
+    )
+
+
+def _strict_decode_row(
+    row: sa.Row[typing.Any],
+    /,
+    *,
+    lookups: _Lookups,
+) -> domain.Todo | domain.Error:
+    valid_row = _validate_row(row)
+    if isinstance(valid_row, domain.Error):
+        return valid_row
+
+    category = lookups.category(valid_row.category_id)
+
+    user = lookups.user(valid_row.user_id)
+
+    if valid_row.last_completed_by_user_id is None:
+        last_completed_by: domain.User | None = None
+    else:
+        last_completed_by = lookups.completed_by(valid_row.last_completed_by_user_id)
+
+    if valid_row.prior_completed_by_user_id is None:
+        prior_completed_by: domain.User | None = None
+    else:
+        prior_completed_by = lookups.completed_by(valid_row.prior_completed_by_user_id)
+
+    return domain.Todo(
+        todo_id=valid_row.todo_id,
+        template_todo_id=valid_row.template_todo_id,
+        category=category,
+        user=user,
+        description=valid_row.description,
+        frequency=_parse_frequency(
+            advance_display_days=valid_row.advance_days,
+            days=valid_row.days,
+            due_date=valid_row.due_date,
+            expire_display_days=valid_row.expire_days,
+            frequency=valid_row.frequency,
+            month=valid_row.month,
+            month_day=valid_row.month_day,
+            start_date=valid_row.start_date,
+            week_day=valid_row.week_day,
+            week_number=valid_row.week_number,
+        ),
+        note=valid_row.note,
+        last_completed=valid_row.last_completed,
+        last_completed_by=last_completed_by,
+        prior_completed=valid_row.prior_completed,
+        prior_completed_by=prior_completed_by,
+        date_added=valid_row.date_added,
+        date_updated=valid_row.date_updated,
+    )
+
+
+# frequencies are immutable and most todos share a handful of them, so decode each distinct one once
+@functools.lru_cache(maxsize=10000)
 def _parse_frequency(
     *,
     advance_display_days: int,
@@ -10,6 +10,7 @@ from src.adapter import db
 __all__ = (
     "add",
     "delete",
+    "explain_delete",
     "get",
     "update",
     "where",
@@ -50,12 +51,7 @@ def delete(
     user_id: str,
 ) -> None | domain.Error:
     try:
-        # noinspection PyComparisonWithNone,PyTypeChecker
-        todos_for_user = con.execute(
-            sa.select(sa.func.count(db.todo(schema=schema).c.todo_id)).where(
-                (db.todo(schema=schema).c.user_id == user_id) & (db.todo(schema=schema).c.date_deleted == None)  # noqa: E711
-            )
-        ).scalar_one()
+        todos_for_user = con.execute(_active_todo_count_query(schema=schema, user_id=user_id)).scalar_one()
 
         if todos_for_user is not None and todos_for_user > 0:
             return domain.Error.new(
@@ -76,6 +72,16 @@ def delete(
         return domain.Error.new(str(e), user_id=user_id)
 
 
+def explain_delete(
+    *,
+    schema: str | None,
+    con: sa.Connection,
+    user_id: str,
+) -> list[str] | domain.Error:
+    """Query plan for the todo count delete() runs, so index usage can be checked."""
+    return db.explain(con=con, qry=_active_todo_count_query(schema=schema, user_id=user_id))
+
+
 def get(
     *,
     schema: str | None,
@@ -150,6 +156,13 @@ def where(
         return domain.Error.new(str(e))
 
 
+def _active_todo_count_query(*, schema: str | None, user_id: str) -> sa.Select[typing.Any]:
+    # noinspection PyComparisonWithNone,PyTypeChecker
+    return sa.select(sa.func.count(db.todo(schema=schema).c.todo_id)).where(
+        (db.todo(schema=schema).c.user_id == user_id) & (db.todo(schema=schema).c.date_deleted == None)  # noqa: E711
+    )
+
+
 def _row_to_domain(row: sa.Row[typing.Any], /) -> domain.User | domain.Error:
     try:
         errors: list[str] = []
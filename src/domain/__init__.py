@@ -1,4 +1,5 @@
-from src.domain import date_calc, exceptions, fs, permissions
+from src.domain import agenda, clock, date_calc, date_calc_batch, exceptions, fs, permissions
+from src.domain.agenda import AgendaEntry
 from src.domain.category import Category, ALL_CATEGORY, TODO_CATEGORY
 from src.domain.category_service import CategoryService
 from src.domain.create_uuid import create_uuid
@@ -9,6 +10,8 @@ from src.domain.holidays import HOLIDAYS, HOLIDAY_CATEGORY
 from src.domain.month import Month
 from src.domain.standardize_str import standardize_str
 from src.domain.todo import DEFAULT_TODO, Todo
+from src.domain.todo_changes import TodoChanges
+from src.domain.todo_completion import TodoCompletion
 from src.domain.todo_service import TodoService
 from src.domain.unspecified import Unspecified
 from src.domain.user import User, ALL_USER, DEFAULT_USER
@@ -19,6 +22,7 @@ from src.domain.view import View
 __all__ = (
     "ALL_CATEGORY",
     "ALL_USER",
+    "AgendaEntry",
     "Category",
     "CategoryService",
     "DEFAULT_TODO",
@@ -31,14 +35,19 @@ __all__ = (
     "Month",
     "TODO_CATEGORY",
     "Todo",
+    "TodoChanges",
+    "TodoCompletion",
     "TodoService",
     "Unspecified",
     "User",
     "UserService",
     "View",
     "Weekday",
+    "agenda",
+    "clock",
     "create_uuid",
     "date_calc",
+    "date_calc_batch",
     "exceptions",
     "fs",
     "permissions",
@@ -0,0 +1,45 @@
+import dataclasses
+import datetime
+import heapq
+import typing
+
+from src.domain import date_calc
+from src.domain.todo import Todo
+
+__all__ = (
+    "AgendaEntry",
+    "agenda",
+)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class AgendaEntry:
+    date: datetime.date
+    todo: Todo
+
+    @property
+    def key(self) -> str:
+        return f"{self.todo.todo_id}:{self.date:%Y-%m-%d}"
+
+
+def agenda(*, todos: typing.Iterable[Todo], start: datetime.date, end: datetime.date) -> typing.Iterator[AgendaEntry]:
+    """Yield every occurrence of todos from start through end, in date order, ties broken by description.
+
+    Each todo contributes its own lazy occurrence stream and the streams are merged, so taking the first n entries
+    calculates one date per todo plus n more, however long the range is.
+    """
+    streams = (_sort_keyed_occurrences(todo=todo, start=start, end=end) for todo in todos)
+
+    for dt, _, _, todo in heapq.merge(*streams):
+        yield AgendaEntry(date=dt, todo=todo)
+
+
+def _sort_keyed_occurrences(
+    *,
+    todo: Todo,
+    start: datetime.date,
+    end: datetime.date,
+) -> typing.Iterator[tuple[datetime.date, str, str, Todo]]:
+    # todo_id makes the keys unique, so the merge never falls through to comparing todos
+    for dt in date_calc.occurrences(frequency=todo.frequency, start=start, end=end):
+        yield dt, todo.description, todo.todo_id, todo
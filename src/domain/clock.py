@@ -0,0 +1,58 @@
+import abc
+import datetime
+import threading
+import typing
+
+__all__ = (
+    "Clock",
+    "FixedClock",
+    "SystemClock",
+    "set_clock",
+    "today",
+)
+
+
+class Clock(abc.ABC):
+    @abc.abstractmethod
+    def today(self) -> datetime.date:
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    def today(self) -> datetime.date:
+        return datetime.date.today()
+
+
+class FixedClock(Clock):
+    """A clock that stays on one day until it's told otherwise, for tests."""
+
+    def __init__(self, *, today: datetime.date):
+        self._today = today
+        self._lock: typing.Final = threading.Lock()
+
+    def advance(self, *, days: int) -> None:
+        with self._lock:
+            self._today += datetime.timedelta(days=days)
+
+    def set_today(self, /, today: datetime.date) -> None:
+        with self._lock:
+            self._today = today
+
+    def today(self) -> datetime.date:
+        return self._today
+
+
+_clock: Clock = SystemClock()
+
+
+def set_clock(clock: Clock, /) -> Clock:
+    """Make clock the source of today's date for the domain, returns the clock it replaced."""
+    global _clock
+
+    prior_clock, _clock = _clock, clock
+
+    return prior_clock
+
+
+def today() -> datetime.date:
+    return _clock.today()
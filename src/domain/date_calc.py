@@ -1,24 +1,50 @@
 import datetime
-import functools
 import math
+import typing
 
+from src.domain import clock
+from src.domain.day_cache import CacheStats, DayCache
 from src.domain.easter import calculate_easter
 from src.domain.frequency import Frequency
 from src.domain.frequency_type import FrequencyType
 from src.domain.irregular import x_weekday_of_month
 from src.domain.memorial_day import calculate_memorial_day
-from src.domain.weekday import Weekday
 
 __all__ = (
+    "cache_stats",
+    "clear_cache",
+    "display_window",
     "due_date",
     "next_date",
+    "next_transition",
+    "occurrences",
     "prior_date",
     "should_display",
 )
 
 
-@functools.lru_cache(10000)
+# due dates and display flags as of today, shared by every caller and dropped when the day rolls over
+_cache = DayCache()
+
+
+def cache_stats() -> CacheStats:
+    return _cache.stats()
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
 def due_date(*, frequency: Frequency, ref_date: datetime.date) -> datetime.date | None:
+    return _cache.get(
+        today=clock.today(),
+        ref_date=ref_date,
+        key=("due_date", frequency),
+        compute=lambda: _due_date(frequency=frequency, ref_date=ref_date),
+    )
+
+
+def _due_date(*, frequency: Frequency, ref_date: datetime.date) -> datetime.date | None:
     if frequency.name == FrequencyType.Once:
         assert frequency.due_date is not None, "Frequency was Once, but [due_date] was None."
         return frequency.due_date
@@ -104,15 +130,7 @@ def next_date(*, frequency: Frequency, ref_date: datetime.date) -> datetime.date
     elif frequency.name == FrequencyType.Weekly:
         assert frequency.week_day is not None, f"The frequency was 'weekly' but [week_day] was {frequency.week_day!r}."
 
-        day_offset = {
-            1: {1: 7, 2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 7: 6},
-            2: {1: 6, 2: 7, 3: 1, 4: 2, 5: 3, 6: 4, 7: 5},
-            3: {1: 5, 2: 6, 3: 7, 4: 1, 5: 2, 6: 3, 7: 4},
-            4: {1: 4, 2: 5, 3: 6, 4: 7, 5: 1, 6: 2, 7: 3},
-            5: {1: 3, 2: 4, 3: 5, 4: 6, 5: 7, 6: 1, 7: 2},
-            6: {1: 2, 2: 3, 3: 4, 4: 5, 5: 6, 6: 7, 7: 1},
-            7: {1: 1, 2: 2, 3: 3, 4: 4, 5: 5, 6: 6, 7: 7},
-        }[Weekday.from_date(ref_date).value][frequency.week_day.value]
+        day_offset = (frequency.week_day.value - _weekday_value(ref_date)) % 7 or 7
 
         return ref_date + datetime.timedelta(days=day_offset)
     elif frequency.name == FrequencyType.XDays:
@@ -207,15 +225,7 @@ def prior_date(*, frequency: Frequency, ref_date: datetime.date) -> datetime.dat
                 frequency.week_day is not None
             ), f"The frequency was 'weekly' but [week_day] was {frequency.week_day!r}."
 
-            day_offset = {
-                1: {1: -7, 2: -6, 3: -5, 4: -4, 5: -3, 6: -2, 7: -1},
-                2: {1: -1, 2: -7, 3: -6, 4: -5, 5: -4, 6: -3, 7: -2},
-                3: {1: -2, 2: -1, 3: -7, 4: -6, 5: -5, 6: -4, 7: -3},
-                4: {1: -3, 2: -2, 3: -1, 4: -7, 5: -6, 6: -5, 7: -4},
-                5: {1: -4, 2: -3, 3: -2, 4: -1, 5: -7, 6: -6, 7: -5},
-                6: {1: -5, 2: -4, 3: -3, 4: -2, 5: -1, 6: -7, 7: -6},
-                7: {1: -6, 2: -5, 3: -4, 4: -3, 5: -2, 6: -1, 7: -7},
-            }[Weekday.from_date(ref_date).value][frequency.week_day.value]
+            day_offset = -((_weekday_value(ref_date) - frequency.week_day.value) % 7 or 7)
 
             return ref_date + datetime.timedelta(days=day_offset)
         case FrequencyType.XDays:
@@ -253,20 +263,164 @@ def prior_date(*, frequency: Frequency, ref_date: datetime.date) -> datetime.dat
             raise ValueError(f"Unrecognized frequency name, {frequency!r}")
 
 
-@functools.lru_cache(maxsize=10000)
+def next_transition(*, frequency: Frequency, ref_date: datetime.date) -> datetime.date | None:
+    """The first date after ref_date on which the due date or display window for frequency can move.
+
+    Until then due_date and display_window return the same thing they do on ref_date, so should_display can't change
+    either, whatever the last completed date is. Returns None when nothing will ever change again, like a Once
+    frequency whose window has closed.
+    """
+    # before start_date the due date is walked back from whatever next_date gives, which can move on any day
+    if ref_date < frequency.start_date:
+        return ref_date + datetime.timedelta(days=1)
+
+    due = due_date(frequency=frequency, ref_date=ref_date)
+    if due is None:
+        return None
+
+    candidates = [
+        due - datetime.timedelta(days=frequency.advance_display_days),
+        due + datetime.timedelta(days=frequency.expire_display_days + 1),
+    ]
+
+    if (following_due := next_date(frequency=frequency, ref_date=due)) is not None:
+        candidates.append(following_due - datetime.timedelta(days=frequency.advance_display_days))
+
+    # due_date looks no further ahead than two occurrences past ref_date, so when the windows overlap the due date
+    # can also move whenever the next occurrence is passed
+    if (next_occurrence := next_date(frequency=frequency, ref_date=ref_date)) is not None:
+        candidates.append(next_occurrence)
+
+    return min((dt for dt in candidates if dt > ref_date), default=None)
+
+
+def occurrences(*, frequency: Frequency, start: datetime.date, end: datetime.date) -> typing.Iterator[datetime.date]:
+    """Yield each date frequency falls on from start through end, in order, skipping any before its start_date.
+
+    Each date is worked out directly rather than by chaining next_date, and nothing is computed until it's asked for,
+    so callers can stop early. Monthly and yearly frequencies skip the months that don't have their month_day.
+    """
+    start = max(start, frequency.start_date)
+    if start > end:
+        return None
+
+    match frequency.name:
+        case FrequencyType.Daily:
+            for ordinal in range(start.toordinal(), end.toordinal() + 1):
+                yield datetime.date.fromordinal(ordinal)
+        case FrequencyType.Easter:
+            for year in range(start.year, end.year + 1):
+                if start <= (dt := calculate_easter(year)) <= end:
+                    yield dt
+        case FrequencyType.Irregular:
+            assert frequency.month is not None, f"The frequency was 'irregular', but [month] was {frequency.month!r}."
+            assert (
+                frequency.week_day is not None
+            ), f"The frequency was 'irregular', but [week_day] was {frequency.week_day!r}."
+
+            for year in range(start.year, end.year + 1):
+                dt = x_weekday_of_month(
+                    year=year,
+                    month=frequency.month.to_int(),
+                    week_num=frequency.week_number,
+                    week_day=frequency.week_day,
+                )
+                if start <= dt <= end:
+                    yield dt
+        case FrequencyType.MemorialDay:
+            for year in range(start.year, end.year + 1):
+                if start <= (dt := calculate_memorial_day(year=year)) <= end:
+                    yield dt
+        case FrequencyType.Monthly:
+            assert (
+                frequency.month_day is not None
+            ), f"The frequency was 'monthly' but [month_day] was {frequency.month_day!r}."
+
+            for month_index in range(start.year * 12 + start.month - 1, end.year * 12 + end.month):
+                year, month = divmod(month_index, 12)
+                try:
+                    dt = datetime.date(year, month + 1, frequency.month_day)
+                except ValueError:
+                    continue
+                if start <= dt <= end:
+                    yield dt
+        case FrequencyType.Once:
+            assert (
+                frequency.due_date is not None
+            ), f"The frequency was 'once' but [due_date] was {frequency.due_date!r}."
+
+            if start <= frequency.due_date <= end:
+                yield frequency.due_date
+        case FrequencyType.Weekly:
+            assert (
+                frequency.week_day is not None
+            ), f"The frequency was 'weekly' but [week_day] was {frequency.week_day!r}."
+
+            first = start.toordinal() + (frequency.week_day.value - _weekday_value(start)) % 7
+            for ordinal in range(first, end.toordinal() + 1, 7):
+                yield datetime.date.fromordinal(ordinal)
+        case FrequencyType.XDays:
+            assert frequency.days is not None, f"The frequency was 'xdays' but [days] was {frequency.days!r}."
+
+            # start is on or after start_date here, so round up to the first period that ends on or after it
+            periods = math.ceil((start - frequency.start_date).days / frequency.days)
+            first = frequency.start_date.toordinal() + periods * frequency.days
+            for ordinal in range(first, end.toordinal() + 1, frequency.days):
+                yield datetime.date.fromordinal(ordinal)
+        case FrequencyType.Yearly:
+            assert frequency.month is not None, f"The frequency was 'yearly' but [month] was {frequency.month!r}."
+            assert (
+                frequency.month_day is not None
+            ), f"The frequency was 'yearly' but [month_day] was {frequency.month_day!r}."
+
+            for year in range(start.year, end.year + 1):
+                try:
+                    dt = datetime.date(year, frequency.month.value, frequency.month_day)
+                except ValueError:
+                    continue
+                if start <= dt <= end:
+                    yield dt
+        case _:
+            raise ValueError(f"Unrecognized frequency name, {frequency!r}")
+
+
+def display_window(*, frequency: Frequency, ref_date: datetime.date) -> tuple[datetime.date, datetime.date] | None:
+    next_due_date = due_date(frequency=frequency, ref_date=ref_date)
+    if next_due_date is None:
+        return None
+
+    return (
+        next_due_date - datetime.timedelta(days=frequency.advance_display_days),
+        next_due_date + datetime.timedelta(days=frequency.expire_display_days),
+    )
+
+
 def should_display(
     *,
     frequency: Frequency,
     last_completed: datetime.date | None,
 ) -> bool:
-    today = datetime.date.today()
+    today = clock.today()
 
-    next_due_date = due_date(frequency=frequency, ref_date=today)
-    if next_due_date is None:
+    return _cache.get(
+        today=today,
+        ref_date=today,
+        key=("should_display", frequency, last_completed),
+        compute=lambda: _should_display(frequency=frequency, last_completed=last_completed, today=today),
+    )
+
+
+def _should_display(
+    *,
+    frequency: Frequency,
+    last_completed: datetime.date | None,
+    today: datetime.date,
+) -> bool:
+    window = display_window(frequency=frequency, ref_date=today)
+    if window is None:
         return False
     else:
-        start_date = next_due_date - datetime.timedelta(days=frequency.advance_display_days)
-        end_date = next_due_date + datetime.timedelta(days=frequency.expire_display_days)
+        start_date, end_date = window
 
         if last_completed is None:
             return start_date <= today <= end_date
@@ -277,49 +431,28 @@ def should_display(
         return start_date <= today <= end_date
 
 
-@functools.lru_cache(maxsize=10000)
 def _monthly_next(
     *,
     month: int,
     year: int,
     month_day: int,
 ) -> datetime.date:
-    mo, yr = {
-        1: (2, year),
-        2: (3, year),
-        3: (4, year),
-        4: (5, year),
-        5: (6, year),
-        6: (7, year),
-        7: (8, year),
-        8: (9, year),
-        9: (10, year),
-        10: (11, year),
-        11: (12, year),
-        12: (1, year + 1),
-    }[month]
-    return datetime.date(yr, mo, month_day)
-
-
-@functools.lru_cache(maxsize=10000)
+    if month == 12:
+        return datetime.date(year + 1, 1, month_day)
+    return datetime.date(year, month + 1, month_day)
+
+
 def _monthly_prior(
     *,
     month: int,
     year: int,
     month_day: int,
 ) -> datetime.date:
-    mo, yr = {
-        1: (12, year - 1),
-        2: (1, year),
-        3: (2, year),
-        4: (3, year),
-        5: (4, year),
-        6: (5, year),
-        7: (6, year),
-        8: (7, year),
-        9: (8, year),
-        10: (9, year),
-        11: (10, year),
-        12: (11, year),
-    }[month]
-    return datetime.date(yr, mo, month_day)
+    if month == 1:
+        return datetime.date(year - 1, 12, month_day)
+    return datetime.date(year, month - 1, month_day)
+
+
+def _weekday_value(date: datetime.date, /) -> int:
+    # Weekday.from_date(date).value, Sunday = 1 through Saturday = 7
+    return date.isoweekday() % 7 + 1
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import typing
+
+from src.domain import date_calc
+from src.domain.frequency import Frequency
+from src.domain.frequency_type import FrequencyType
+from src.domain.month import Month
+from src.domain.weekday import Weekday
+
+__all__ = (
+    "FrequencyColumns",
+    "due_dates",
+    "should_display",
+)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class FrequencyColumns:
+    """The fields of many frequencies laid out column by column, one row per todo.
+
+    month is 1-12 and week_day is a Weekday value, 1 (Sunday) through 7 (Saturday).
+    """
+
+    name: tuple[FrequencyType, ...]
+    month: tuple[int | None, ...]
+    week_day: tuple[int | None, ...]
+    week_number: tuple[int | None, ...]
+    month_day: tuple[int | None, ...]
+    days: tuple[int | None, ...]
+    due_date: tuple[datetime.date | None, ...]
+    start_date: tuple[datetime.date, ...]
+    advance_display_days: tuple[int, ...]
+    expire_display_days: tuple[int, ...]
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    @staticmethod
+    def from_frequencies(frequencies: typing.Iterable[Frequency], /) -> FrequencyColumns:
+        frequencies = tuple(frequencies)
+
+        return FrequencyColumns(
+            name=tuple(frequency.name for frequency in frequencies),
+            month=tuple(None if frequency.month is None else frequency.month.to_int() for frequency in frequencies),
+            week_day=tuple(
+                None if frequency.week_day is None else frequency.week_day.value for frequency in frequencies
+            ),
+            week_number=tuple(frequency.week_number for frequency in frequencies),
+            month_day=tuple(frequency.month_day for frequency in frequencies),
+            days=tuple(frequency.days for frequency in frequencies),
+            due_date=tuple(frequency.due_date for frequency in frequencies),
+            start_date=tuple(frequency.start_date for frequency in frequencies),
+            advance_display_days=tuple(frequency.advance_display_days for frequency in frequencies),
+            expire_display_days=tuple(frequency.expire_display_days for frequency in frequencies),
+        )
+
+    def frequency(self, /, row: int) -> Frequency:
+        month = self.month[row]
+        week_day = self.week_day[row]
+
+        return Frequency(
+            name=self.name[row],
+            month=None if month is None else Month.from_int(month),
+            week_day=None if week_day is None else Weekday(week_day),
+            week_number=self.week_number[row],
+            month_day=self.month_day[row],
+            days=self.days[row],
+            start_date=self.start_date[row],
+            advance_display_days=self.advance_display_days[row],
+            expire_display_days=self.expire_display_days[row],
+            due_date=self.due_date[row],
+        )
+
+
+def due_dates(*, columns: FrequencyColumns, ref_date: datetime.date) -> list[datetime.date | None]:
+    """Same as date_calc.due_date for every row of columns.
+
+    Daily, once, weekly and xdays frequencies are worked out with day-number arithmetic. The calendar based ones only
+    change from year to year, so they are calculated once per distinct frequency and shared between the rows.
+    """
+    ref = ref_date.toordinal()
+    # Weekday values count from Sunday = 1
+    ref_weekday = ref_date.isoweekday() % 7 + 1
+
+    calendar_due_dates: dict[tuple[typing.Any, ...], datetime.date | None] = {}
+
+    result: list[datetime.date | None] = []
+    for row, name in enumerate(columns.name):
+        if name is FrequencyType.Daily:
+            result.append(ref_date)
+        elif name is FrequencyType.Once:
+            assert columns.due_date[row] is not None, "Frequency was Once, but [due_date] was None."
+
+            result.append(columns.due_date[row])
+        elif name is FrequencyType.Weekly:
+            week_day = columns.week_day[row]
+            assert week_day is not None, f"The frequency was 'weekly' but [week_day] was {week_day!r}."
+
+            result.append(
+                datetime.date.fromordinal(
+                    _weekly_due(
+                        ref=ref,
+                        ref_weekday=ref_weekday,
+                        week_day=week_day,
+                        start=columns.start_date[row].toordinal(),
+                        advance_days=columns.advance_display_days[row],
+                    )
+                )
+            )
+        elif name is FrequencyType.XDays:
+            days = columns.days[row]
+            assert days is not None, f"The frequency was 'xdays' but [days] was {days!r}."
+
+            result.append(
+                datetime.date.fromordinal(
+                    _xdays_due(
+                        ref=ref,
+                        days=days,
+                        start=columns.start_date[row].toordinal(),
+                        advance_days=columns.advance_display_days[row],
+                    )
+                )
+            )
+        else:
+            key = (
+                name,
+                columns.month[row],
+                columns.week_day[row],
+                columns.week_number[row],
+                columns.month_day[row],
+                columns.start_date[row],
+                columns.advance_display_days[row],
+            )
+            if key not in calendar_due_dates:
+                calendar_due_dates[key] = date_calc.due_date(frequency=columns.frequency(row), ref_date=ref_date)
+
+            result.append(calendar_due_dates[key])
+
+    return result
+
+
+def should_display(
+    *,
+    columns: FrequencyColumns,
+    last_completed: typing.Sequence[datetime.date | None],
+    ref_date: datetime.date,
+) -> list[bool]:
+    """Same as date_calc.should_display for every row of columns, as of ref_date rather than today."""
+    assert len(last_completed) == len(columns), "There must be one last_completed per row."
+
+    ref = ref_date.toordinal()
+
+    result: list[bool] = []
+    for row, due_date in enumerate(due_dates(columns=columns, ref_date=ref_date)):
+        if due_date is None:
+            result.append(False)
+            continue
+
+        due = due_date.toordinal()
+        window_start = due - columns.advance_display_days[row]
+        window_end = due + columns.expire_display_days[row]
+
+        completed = last_completed[row]
+        if completed is not None and window_start <= completed.toordinal() <= window_end:
+            result.append(False)
+        else:
+            result.append(window_start <= ref <= window_end)
+
+    return result
+
+
+def _weekly_due(*, ref: int, ref_weekday: int, week_day: int, start: int, advance_days: int) -> int:
+    # date_calc.due_date tries the occurrence after next, then steps back a week at a time, 3 times at most
+    next_due = ref + ((week_day - ref_weekday) % 7 or 7)
+
+    if ref >= start:
+        for candidate in (next_due + 7, next_due, next_due - 7):
+            if ref >= candidate - advance_days:
+                return candidate
+
+    return next_due - 14
+
+
+def _xdays_due(*, ref: int, days: int, start: int, advance_days: int) -> int:
+    candidate = _xdays_next(ref=_xdays_next(ref=ref, days=days, start=start), days=days, start=start)
+
+    for _ in range(3):
+        if ref >= candidate - advance_days and ref >= start:
+            return candidate
+
+        candidate = _xdays_prior(ref=candidate, days=days, start=start)
+
+    return candidate
+
+
+def _xdays_next(*, ref: int, days: int, start: int) -> int:
+    days_since_start = ref - start
+    if days_since_start < 0:
+        return start
+
+    next_due = start - (-days_since_start // days) * days
+    if next_due > ref:
+        return next_due
+    return next_due + days
+
+
+def _xdays_prior(*, ref: int, days: int, start: int) -> int:
+    days_since_start = ref - start
+    if days_since_start < 0:
+        return start
+
+    prior_due = start + (days_since_start // days) * days
+    if prior_due < ref:
+        return prior_due
+    return prior_due - days
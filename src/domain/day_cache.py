@@ -0,0 +1,100 @@
+import dataclasses
+import datetime
+import threading
+import typing
+
+__all__ = (
+    "CacheStats",
+    "DayCache",
+)
+
+_T = typing.TypeVar("_T")
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class CacheStats:
+    day: datetime.date | None
+    size: int
+    hits: int
+    misses: int
+    bypasses: int
+    evictions: int
+
+
+class DayCache:
+    """Memoizes calculations made as of one reference date, the current day.
+
+    Lookups for any other date are computed without being cached, so the entries can't go stale. When the day rolls
+    over, every entry is evicted at once. A day's entries are also capped at max_entries, when the cap is reached the
+    day starts over empty.
+    """
+
+    def __init__(self, *, max_entries: int = 50_000):
+        self._max_entries: typing.Final[int] = max_entries
+        self._lock: typing.Final = threading.Lock()
+
+        self._day: datetime.date | None = None
+        self._entries: dict[typing.Hashable, typing.Any] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._bypasses = 0
+        self._evictions = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._evictions += len(self._entries)
+            self._entries = {}
+
+    def get(
+        self,
+        *,
+        today: datetime.date,
+        ref_date: datetime.date,
+        key: typing.Hashable,
+        compute: typing.Callable[[], _T],
+    ) -> _T:
+        if ref_date != today:
+            self._bypasses += 1
+            return compute()
+
+        if today != self._day:
+            with self._lock:
+                if today != self._day:
+                    self._evictions += len(self._entries)
+                    self._entries = {}
+                    self._day = today
+
+        entries = self._entries
+        try:
+            value: _T = entries[key]
+            self._hits += 1
+            return value
+        except KeyError:
+            pass
+
+        self._misses += 1
+
+        value = compute()
+
+        with self._lock:
+            # skip storing if the day rolled over while computing, the entry would belong to a day that's gone
+            if entries is self._entries:
+                if len(self._entries) >= self._max_entries:
+                    self._evictions += len(self._entries)
+                    self._entries = {}
+
+                self._entries[key] = value
+
+        return value
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                day=self._day,
+                size=len(self._entries),
+                hits=self._hits,
+                misses=self._misses,
+                bypasses=self._bypasses,
+                evictions=self._evictions,
+            )
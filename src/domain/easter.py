@@ -1,10 +1,8 @@
 import datetime
-import functools
 
 __all__ = ("calculate_easter",)
 
 
-@functools.lru_cache(maxsize=2000)
 def calculate_easter(year: int, /) -> datetime.date:
     a = year % 19
     b = year // 100
@@ -1,23 +1,23 @@
 import calendar
 import datetime
-import functools
-import itertools
 
 from src.domain.weekday import Weekday
 
 __all__ = ("x_weekday_of_month",)
 
 
-@functools.lru_cache(maxsize=10000)
-def x_weekday_of_month(*, year: int, month: int, week_num: int, week_day: Weekday) -> datetime.date:
-    days_in_month = calendar.monthrange(year, month)[1]
-    return list(
-        itertools.islice(
-            (
-                dt
-                for day in range(1, days_in_month, 1)
-                if Weekday.from_int((dt := datetime.date(year, month, day)).weekday()) == week_day
-            ),
-            week_num,
-        )
-    )[-1]
+def x_weekday_of_month(*, year: int, month: int, week_num: int | None, week_day: Weekday) -> datetime.date:
+    """The week_num-th week_day of the month, or the last one if the month has fewer than week_num of them.
+
+    A week_num of None also means the last one.
+    """
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+
+    # Weekday counts from Sunday = 1, date.weekday() from Monday = 0
+    first_day = 1 + ((week_day.value + 5) % 7 - first_weekday) % 7
+
+    last_week_num = (days_in_month - first_day) // 7 + 1
+    if week_num is None or week_num > last_week_num:
+        week_num = last_week_num
+
+    return datetime.date(year, month, first_day + 7 * (week_num - 1))
@@ -6,7 +6,7 @@ import typing
 
 from loguru import logger
 
-from src.domain import date_calc
+from src.domain import clock, date_calc
 from src.domain.category import Category, TODO_CATEGORY
 from src.domain.frequency import Frequency
 from src.domain.frequency_type import FrequencyType
@@ -48,16 +48,16 @@ class Todo:
 
             next_date = date_calc.next_date(frequency=self.frequency, ref_date=due_date)
             if next_date:
-                return (next_date - datetime.date.today()).days
+                return (next_date - clock.today()).days
             return None
 
-        return (due_date - datetime.date.today()).days
+        return (due_date - clock.today()).days
 
     def due_date(self) -> datetime.date:
         try:
             return date_calc.due_date(
                 frequency=self.frequency,
-                ref_date=datetime.date.today(),
+                ref_date=clock.today(),
             ) or datetime.date(1900, 1, 1)
         except Exception as e:
             logger.exception(f"Failed to calculate due_date() for todo, {self.description}\n{e}")
@@ -0,0 +1,18 @@
+import dataclasses
+
+from src.domain.todo import Todo
+
+__all__ = ("TodoChanges",)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class TodoChanges:
+    """The todos written since a change cursor.
+
+    upserted holds the changed todos that match the filters they were requested with, deleted_todo_ids the ones that
+    were deleted or no longer match. cursor is the value to pass in on the next request.
+    """
+
+    cursor: int
+    upserted: tuple[Todo, ...]
+    deleted_todo_ids: tuple[str, ...]
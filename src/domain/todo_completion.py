@@ -0,0 +1,11 @@
+import dataclasses
+import datetime
+
+__all__ = ("TodoCompletion",)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class TodoCompletion:
+    todo_id: str
+    completed_on: datetime.date
+    completed_by_user_id: str | None
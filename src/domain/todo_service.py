@@ -1,7 +1,11 @@
 import abc
+import datetime
+import typing
 
 from src.domain.error import Error
 from src.domain.todo import Todo
+from src.domain.todo_changes import TodoChanges
+from src.domain.todo_completion import TodoCompletion
 from src.domain.unspecified import Unspecified
 from src.domain.user import User
 
@@ -13,14 +17,56 @@ class TodoService(abc.ABC):
     def add(self, *, todo: Todo) -> None | Error:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def add_many(self, *, todos: typing.Iterable[Todo], chunk_size: int = 500) -> None | Error:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def change_cursor(self) -> int | Error:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def changes_since(
+        self,
+        *,
+        cursor: int,
+        due_filter: bool | Unspecified,
+        description_like: str | Unspecified,
+        category_id_filter: str | Unspecified,
+        user_id_filter: str | Unspecified,
+    ) -> TodoChanges | Error:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def completion_history(self, *, todo_id: str) -> list[TodoCompletion] | Error:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def completions(
+        self,
+        *,
+        user_id_filter: str | Unspecified,
+        completed_from: datetime.date,
+        completed_to: datetime.date,
+    ) -> list[TodoCompletion] | Error:
+        raise NotImplementedError
+
     @abc.abstractmethod
     def delete(self, *, todo_id: str) -> None | Error:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def delete_many(self, *, todo_ids: typing.Iterable[str], chunk_size: int = 500) -> None | Error:
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get(self, *, todo_id: str) -> Todo | None | Error:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_many(self, *, todo_ids: typing.Iterable[str]) -> list[Todo] | Error:
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_by_template_id_and_user_id(
         self,
@@ -39,6 +85,15 @@ class TodoService(abc.ABC):
     ) -> None | Error:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def mark_complete_many(
+        self,
+        *,
+        todo_ids: typing.Iterable[str],
+        user: User | None,
+    ) -> None | Error:
+        raise NotImplementedError
+
     @abc.abstractmethod
     def where(
         self,
@@ -54,6 +109,54 @@ class TodoService(abc.ABC):
     def mark_incomplete(self, *, todo_id: str) -> None | Error:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def mark_incomplete_many(self, *, todo_ids: typing.Iterable[str]) -> None | Error:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def next_appearance(
+        self,
+        *,
+        description_like: str | Unspecified,
+        category_id_filter: str | Unspecified,
+        user_id_filter: str | Unspecified,
+    ) -> datetime.date | None | Error:
+        """The first date after today on which a todo matching the filters that isn't due today could come due."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def occurring_between(
+        self,
+        *,
+        start: datetime.date,
+        end: datetime.date,
+        category_id_filter: str | Unspecified,
+        user_id_filter: str | Unspecified,
+    ) -> list[Todo] | Error:
+        """The todos matching the filters that could fall on a date from start through end."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def refresh_display_windows(self) -> None | Error:
+        """Bring the persisted display windows up to today, at startup and whenever the date rolls over.
+
+        Reads don't refresh them, so where and changes_since filter on the windows as of the last refresh.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def save(self, *, todo: Todo) -> Todo | Error:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def wait_for_changes(self, *, cursor: int, timeout_seconds: float) -> int | Error:
+        """Block until a todo is written after cursor or timeout_seconds pass, returns the latest change cursor."""
+        raise NotImplementedError
+
     @abc.abstractmethod
     def update(self, *, todo: Todo) -> None | Error:
         raise NotImplementedError
+
+    @abc.abstractmethod
+    def update_many(self, *, todos: typing.Iterable[Todo], chunk_size: int = 500) -> None | Error:
+        raise NotImplementedError
@@ -23,7 +23,11 @@ def run(
 
         presentation.theme.cobalt.apply_theme(app)
 
-        engine = adapter.db.create_engine(url=db_url)
+        engine_settings = adapter.config.db_engine_settings(config_file_path=config_file_path)
+        if isinstance(engine_settings, domain.Error):
+            return engine_settings
+
+        engine = adapter.db.create_engine(url=db_url, settings=engine_settings)
         if isinstance(engine, domain.Error):
             return engine
 
@@ -65,6 +69,11 @@ def run(
             username=username,
         )
 
+        # the dashboard refreshes them again whenever the date rolls over while it is open
+        refresh_display_windows_result = todo_service.refresh_display_windows()
+        if isinstance(refresh_display_windows_result, domain.Error):
+            return refresh_display_windows_result
+
         app_icon = presentation.theme.icons.app_icon()
         if isinstance(app_icon, domain.Error):
             return app_icon
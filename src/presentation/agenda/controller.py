@@ -0,0 +1,91 @@
+import datetime
+import itertools
+import typing
+
+# noinspection PyPep8Naming
+from PyQt6 import QtCore as qtc
+from loguru import logger
+
+from src import domain
+from src.presentation.agenda import requests
+from src.presentation.agenda.state import AgendaState
+
+__all__ = ("AgendaController",)
+
+# entries handed to the view at a time, the rest of the range isn't calculated until the view scrolls to the end
+PAGE_SIZE: typing.Final[int] = 200
+
+
+class AgendaController(qtc.QObject):
+    states = qtc.pyqtSignal(AgendaState)
+
+    def __init__(
+        self,
+        *,
+        todo_service: domain.TodoService,
+        agenda_requests: requests.AgendaRequests,
+    ):
+        super().__init__()
+
+        self._todo_service: typing.Final[domain.TodoService] = todo_service
+        self._requests: typing.Final[requests.AgendaRequests] = agenda_requests
+
+        self._entries: typing.Iterator[domain.AgendaEntry] = iter(())
+
+        self._requests.fetch_more.connect(self._on_fetch_more_request)
+        self._requests.refresh.connect(self._on_refresh_request)
+
+    # declared as slots, so they run on the thread the controller was moved to rather than the one it was built on
+    @qtc.pyqtSlot()
+    def _on_fetch_more_request(self) -> None:
+        logger.debug(f"{self.__class__.__name__}._on_fetch_more_request()")
+
+        try:
+            entries = tuple(itertools.islice(self._entries, PAGE_SIZE))
+
+            self.states.emit(AgendaState(more_entries=entries, has_more=len(entries) == PAGE_SIZE))
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}._on_fetch_more_request() failed: {e!s}")
+
+            self._set_status(str(e))
+
+    @qtc.pyqtSlot(requests.RefreshRequest)
+    def _on_refresh_request(self, /, request: requests.RefreshRequest) -> None:
+        logger.debug(f"{self.__class__.__name__}._on_refresh_request({request=!r})")
+
+        try:
+            self._set_status("Refreshing agenda...")
+
+            today = domain.clock.today()
+            end = today + datetime.timedelta(days=request.horizon_days)
+
+            todos = self._todo_service.occurring_between(
+                start=today,
+                end=end,
+                category_id_filter=request.category.category_id,
+                user_id_filter=request.user.user_id,
+            )
+            if isinstance(todos, domain.Error):
+                logger.error(f"{self.__class__.__name__}._on_refresh_request({request=!r}): {todos!s}")
+                self._set_status(todos.error_message)
+                return None
+
+            self._entries = domain.agenda.agenda(todos=todos, start=today, end=end)
+
+            entries = tuple(itertools.islice(self._entries, PAGE_SIZE))
+
+            self.states.emit(
+                AgendaState(
+                    entries=entries,
+                    has_more=len(entries) == PAGE_SIZE,
+                    today=today,
+                    status="Agenda refreshed.",
+                )
+            )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}._on_refresh_request({request=!r}) failed: {e!s}")
+
+            self._set_status(str(e))
+
+    def _set_status(self, /, status: str) -> None:
+        self.states.emit(AgendaState(status=status))
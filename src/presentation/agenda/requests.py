@@ -0,0 +1,26 @@
+import dataclasses
+
+# noinspection PyPep8Naming
+from PyQt6 import QtCore as qtc
+
+from src import domain
+
+__all__ = (
+    "AgendaRequests",
+    "RefreshRequest",
+)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class RefreshRequest:
+    horizon_days: int
+    category: domain.Category
+    user: domain.User
+
+
+class AgendaRequests(qtc.QObject):
+    fetch_more = qtc.pyqtSignal()
+    refresh = qtc.pyqtSignal(RefreshRequest)
+
+    def __init__(self, parent: qtc.QObject | None):
+        super().__init__(parent=parent)
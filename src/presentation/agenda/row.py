@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import typing
+
+from src import domain
+
+__all__ = ("AgendaRow",)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class AgendaRow:
+    key: str
+    todo: domain.Todo
+    date: datetime.date
+    days: int
+    description: str
+    user: str
+    category: str
+
+    @staticmethod
+    def from_entries(entries: typing.Iterable[domain.AgendaEntry], /, *, today: datetime.date) -> list[AgendaRow]:
+        return [
+            AgendaRow(
+                key=entry.key,
+                todo=entry.todo,
+                date=entry.date,
+                days=(entry.date - today).days,
+                description=entry.todo.description,
+                user=entry.todo.user.display_name,
+                category=entry.todo.category.name,
+            )
+            for entry in entries
+        ]
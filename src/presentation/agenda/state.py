@@ -0,0 +1,17 @@
+import dataclasses
+import datetime
+
+from src import domain
+
+__all__ = ("AgendaState",)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class AgendaState:
+    """entries replaces what the agenda shows, more_entries is the next page to append to it."""
+
+    entries: tuple[domain.AgendaEntry, ...] | domain.Unspecified = domain.Unspecified()
+    more_entries: tuple[domain.AgendaEntry, ...] | domain.Unspecified = domain.Unspecified()
+    has_more: bool | domain.Unspecified = domain.Unspecified()
+    today: datetime.date | domain.Unspecified = domain.Unspecified()
+    status: str | domain.Unspecified = domain.Unspecified()
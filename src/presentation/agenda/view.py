@@ -0,0 +1,169 @@
+import datetime
+import typing
+
+from PyQt6 import QtCore as qtc, QtGui as qtg, QtWidgets as qtw  # noqa
+from loguru import logger
+
+from src import domain
+from src.presentation.agenda import requests
+from src.presentation.agenda.row import AgendaRow
+from src.presentation.agenda.state import AgendaState
+from src.presentation.category_selector import CategorySelectorWidget
+from src.presentation.shared.theme import font, icons
+from src.presentation.shared.widgets import table_view, StatusBar
+from src.presentation.user_selector import UserSelectorWidget
+
+__all__ = ("AgendaView",)
+
+
+class AgendaView(qtw.QWidget):
+    def __init__(
+        self,
+        *,
+        agenda_requests: requests.AgendaRequests,
+        states: qtc.pyqtBoundSignal,
+        category_selector: CategorySelectorWidget,
+        user_selector: UserSelectorWidget,
+        parent: qtw.QWidget | None,
+    ):
+        super().__init__(parent=parent)
+
+        self._requests: typing.Final[requests.AgendaRequests] = agenda_requests
+        self._category_selector: typing.Final[CategorySelectorWidget] = category_selector
+        self._user_selector: typing.Final[UserSelectorWidget] = user_selector
+
+        # set while the controller still has entries left in the range, and cleared once the next page is asked for
+        self._has_more = False
+        self._today = domain.clock.today()
+
+        refresh_btn_icon = icons.refresh_btn_icon(parent=self)
+        self._refresh_btn = qtw.QPushButton(refresh_btn_icon, "")
+        self._refresh_btn.setFixedWidth(font.BOLD_FONT_METRICS.height() + 8)
+        self._refresh_btn.setToolTip("Refresh")
+
+        horizon_lbl = qtw.QLabel("Days")
+        horizon_lbl.setFont(font.BOLD_FONT)
+        self._horizon_sb = qtw.QSpinBox()
+        self._horizon_sb.setRange(1, 3_660)
+        self._horizon_sb.setValue(30)
+        self._horizon_sb.setFixedWidth(font.DEFAULT_FONT_METRICS.boundingRect("  88888  ").width() + 20)
+
+        category_lbl = qtw.QLabel("Category")
+        category_lbl.setFont(font.BOLD_FONT)
+
+        user_lbl = qtw.QLabel("User")
+        user_lbl.setFont(font.BOLD_FONT)
+
+        toolbar_layout = qtw.QHBoxLayout()
+        toolbar_layout.addWidget(self._refresh_btn)
+        toolbar_layout.addSpacerItem(
+            qtw.QSpacerItem(10, 0, qtw.QSizePolicy.Policy.Minimum, qtw.QSizePolicy.Policy.Minimum)
+        )
+        toolbar_layout.addWidget(horizon_lbl)
+        toolbar_layout.addWidget(self._horizon_sb)
+        toolbar_layout.addWidget(user_lbl)
+        toolbar_layout.addWidget(self._user_selector)
+        toolbar_layout.addWidget(category_lbl)
+        toolbar_layout.addWidget(self._category_selector)
+        toolbar_layout.addStretch()
+
+        attrs: tuple[table_view.Attr[AgendaRow, typing.Any], ...] = (
+            table_view.date(
+                name="date",
+                display_name="Date",
+            ),
+            table_view.integer(
+                name="days",
+                display_name="Days",
+                width=font.BOLD_FONT_METRICS.boundingRect("  Days  ").width(),
+            ),
+            table_view.text(
+                name="description",
+                display_name="Description",
+                width=400,
+            ),
+            table_view.text(
+                name="user",
+                display_name="User",
+                width=140,
+                alignment="center",
+            ),
+            table_view.text(
+                name="category",
+                display_name="Category",
+                alignment="center",
+            ),
+        )
+
+        self._table: table_view.TableView[AgendaRow, str] = table_view.TableView(
+            attrs=attrs,
+            key_attr_name="key",
+            parent=self,
+            normal_font=font.DEFAULT_FONT,
+            bold_font=font.BOLD_FONT,
+            size_rows_lazily=True,
+        )
+
+        self._status_bar: typing.Final[StatusBar] = StatusBar(parent=self)
+
+        layout = qtw.QVBoxLayout()
+        layout.addLayout(toolbar_layout)
+        layout.addWidget(self._table, stretch=2)
+        layout.addWidget(self._status_bar)
+        self.setLayout(layout)
+
+        states.connect(self.set_state)
+        # noinspection PyUnresolvedReferences
+        self._refresh_btn.clicked.connect(self._on_refresh_btn_clicked)
+        # noinspection PyUnresolvedReferences
+        self._horizon_sb.editingFinished.connect(self._refresh_btn.click)
+        self._category_selector.item_selected.connect(self._refresh_btn.click)
+        self._user_selector.item_selected.connect(self._refresh_btn.click)
+        if scroll_bar := self._table.verticalScrollBar():
+            # noinspection PyUnresolvedReferences
+            scroll_bar.valueChanged.connect(self._on_scrolled)
+
+    def refresh(self) -> None:
+        self._refresh_btn.click()
+
+    def set_state(self, /, state: AgendaState) -> None:
+        try:
+            if isinstance(state.today, datetime.date):
+                self._today = state.today
+
+            if not isinstance(state.entries, domain.Unspecified):
+                self._table.set_items(AgendaRow.from_entries(state.entries, today=self._today))
+
+            if not isinstance(state.more_entries, domain.Unspecified):
+                for row in AgendaRow.from_entries(state.more_entries, today=self._today):
+                    self._table.add_item(row)
+
+            if isinstance(state.has_more, bool):
+                self._has_more = state.has_more
+
+            if isinstance(state.status, str):
+                self._status_bar.set_status(state.status)
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.set_state(...) failed: {e}")
+
+            self._status_bar.set_status(str(e))
+
+    def _on_refresh_btn_clicked(self, /, _: bool) -> None:
+        logger.debug(f"{self.__class__.__name__}._on_refresh_btn_clicked()")
+
+        self._has_more = False
+
+        self._requests.refresh.emit(
+            requests.RefreshRequest(
+                horizon_days=self._horizon_sb.value(),
+                category=self._category_selector.selected_item(),
+                user=self._user_selector.get_selected_item(),
+            )
+        )
+
+    def _on_scrolled(self, /, value: int) -> None:
+        scroll_bar = self._table.verticalScrollBar()
+        if self._has_more and scroll_bar is not None and value >= scroll_bar.maximum():
+            self._has_more = False
+
+            self._requests.fetch_more.emit()
@@ -0,0 +1,85 @@
+import typing
+
+from PyQt6 import QtCore as qtc, QtGui as qtg, QtWidgets as qtw  # noqa
+
+from src import domain
+from src.presentation.agenda.controller import AgendaController
+from src.presentation.agenda.requests import AgendaRequests
+from src.presentation.agenda.view import AgendaView
+from src.presentation.category_selector import CategorySelectorWidget
+from src.presentation.user_selector import UserSelectorWidget
+
+__all__ = ("AgendaWidget",)
+
+
+class AgendaWidget(qtw.QWidget):
+    def __init__(
+        self,
+        *,
+        category_service: domain.CategoryService,
+        todo_service: domain.TodoService,
+        user_service: domain.UserService,
+        current_user: domain.User,
+        parent: qtw.QWidget | None,
+    ):
+        super().__init__(parent=parent)
+
+        self._current_user: typing.Final[domain.User] = current_user
+
+        agenda_requests = AgendaRequests(parent=self)
+
+        self._controller: typing.Final[AgendaController] = AgendaController(
+            todo_service=todo_service,
+            agenda_requests=agenda_requests,
+        )
+        self._controller_thread = qtc.QThread(parent=self)
+        self._controller.moveToThread(self._controller_thread)
+
+        self._category_selector = CategorySelectorWidget(
+            category_service=category_service,
+            include_all_category=True,
+            parent=self,
+        )
+
+        self._user_selector = UserSelectorWidget(
+            user_service=user_service,
+            include_all_user=True,
+            parent=self,
+        )
+
+        self._view: typing.Final[AgendaView] = AgendaView(
+            agenda_requests=agenda_requests,
+            states=self._controller.states,
+            category_selector=self._category_selector,
+            user_selector=self._user_selector,
+            parent=self,
+        )
+
+        layout = qtw.QStackedLayout()
+        layout.addWidget(self._view)
+        self.setLayout(layout)
+
+        # the todos and their occurrences are worked out on the controller's thread, so the GUI stays responsive
+        self._controller_thread.start()
+
+        if app := qtw.QApplication.instance():
+            app.aboutToQuit.connect(self._stop_controller_thread)
+
+    def on_load(self) -> None:
+        self.refresh_categories()
+        self.refresh_users()
+        self._user_selector.select_item(self._current_user)
+        self.refresh()
+
+    def refresh(self) -> None:
+        self._view.refresh()
+
+    def refresh_categories(self) -> None:
+        self._category_selector.refresh()
+
+    def refresh_users(self) -> None:
+        self._user_selector.refresh()
+
+    def _stop_controller_thread(self) -> None:
+        self._controller_thread.quit()
+        self._controller_thread.wait()
@@ -13,14 +13,11 @@ class BoundButtonEnabledSelector:
         self._model: typing.Final[TableViewModel] = model
 
     def is_enabled(self, /, index: qtc.QModelIndex) -> bool:
-        if self._model.items:
-            item = self._model.items[index.row()]
-
+        if self._model.rowCount():
             attr = self._model.get_attr_for_column_number(index.column())
-            selector = attr.enabled_selector
-            if selector is None:
+            if attr.enabled_selector is None:
                 raise Exception(f"enabled_selector for attr, {attr.name}, is None.")
 
-            return selector(item)
+            return self._model.is_button_enabled(index)
 
         return False
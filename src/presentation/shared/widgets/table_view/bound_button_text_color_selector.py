@@ -14,7 +14,7 @@ class BoundButtonTextColorSelector:
 
     def get_text_color(self, /, index: qtc.QModelIndex) -> qtg.QColor | qtc.Qt.GlobalColor | None:
         if self._model.items:
-            item = self._model.items[index.row()]
+            item = self._model.get_item_for_row(index.row())
 
             attr = self._model.get_attr_for_column_number(index.column())
             selector = attr.color_selector
@@ -13,14 +13,11 @@ class BoundButtonTextSelector:
         self._model: typing.Final[TableViewModel] = model
 
     def get_text(self, /, index: qtc.QModelIndex) -> str:
-        if self._model.items:
-            item = self._model.items[index.row()]
-
+        if self._model.rowCount():
             attr = self._model.get_attr_for_column_number(index.column())
-            selector = attr.value_selector
-            if selector is None:
+            if attr.value_selector is None:
                 raise Exception(f"value_selector for attr, {attr.name}, is None.")
 
-            return str(selector(item))
+            return self._model.get_button_text(index)
 
         return ""
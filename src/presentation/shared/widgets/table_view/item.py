@@ -1,5 +1,11 @@
 import typing
 
-__all__ = ("Item",)
+__all__ = (
+    "ContravariantItem",
+    "Item",
+)
 
-Item = typing.TypeVar("Item", contravariant=True)
+Item = typing.TypeVar("Item")
+
+# the selector protocols only take an item, so one for a base class can stand in for one of a subclass
+ContravariantItem = typing.TypeVar("ContravariantItem", contravariant=True)
@@ -1,3 +1,6 @@
+import bisect
+import dataclasses
+import functools
 import typing
 import warnings
 
@@ -10,6 +13,22 @@ from src.presentation.shared.widgets.table_view.key import Key
 
 __all__ = ("TableViewModel",)
 
+# set_items signals each range of removed or inserted rows on its own, past this many it resets the rows instead
+_MAX_DIFF_RANGES: typing.Final[int] = 50
+
+# how many columns a sort keeps falling back on to break ties
+_MAX_SORT_COLUMNS: typing.Final[int] = 3
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class _RenderedRow:
+    """What data() returns for each column of a row, indexed by column number."""
+
+    display: tuple[str | None, ...]
+    foreground: tuple[qtg.QBrush | None, ...]
+    button_text: tuple[str, ...]
+    button_enabled: tuple[bool, ...]
+
 
 # noinspection PyPep8Naming,PyMethodMayBeStatic
 class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
@@ -42,24 +61,46 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
 
         self._attr_by_name: typing.Final[dict[str, Attr[Item, typing.Any]]] = {attr.name: attr for attr in self._attrs}
 
+        self._alignment_by_col_num: typing.Final[tuple[qtc.Qt.AlignmentFlag, ...]] = tuple(
+            _alignment(attr) for attr in self._attrs
+        )
+
         self._items: list[Item] = []
         self._row_num_by_key: dict[Key, int] = {}
 
+        # filled as rows are painted, an entry only goes when its item is replaced or removed, so scrolling back over a
+        # row doesn't run its selectors again
+        self._rendered_row_by_key: dict[Key, _RenderedRow] = {}
+
+        # the same goes for the values rows are sorted on, which for some columns take a date calculation to select
+        self._sort_key_by_key_by_col_num: dict[int, dict[Key, tuple[bool, typing.Any]]] = {}
+
+        # the columns the rows are sorted on, the last one clicked first, reapplied whenever the items are replaced
+        self._sort_order: list[tuple[int, qtc.Qt.SortOrder]] = []
+
     @property
     def items(self) -> list[Item]:
         return self._items.copy()
 
     def add_item(self, /, item: Item) -> None:
-        self.beginInsertRows(
-            qtc.QModelIndex(),
-            self.rowCount(),
-            self.rowCount(),
-        )
-        key = getattr(item, self._key_attr_name)
-        self._row_num_by_key[key] = len(self._items)
-        self._items.append(item)
+        """Insert the item where the table's sort puts it, or at the end if the table isn't sorted."""
+        self._forget_rendered(getattr(item, self._key_attr_name))
+
+        row_num = self._sorted_row_num(item)
+
+        self.beginInsertRows(qtc.QModelIndex(), row_num, row_num)
+        self._items.insert(row_num, item)
+        self._reindex_rows(start=row_num)
         self.endInsertRows()
 
+    def clear_render_cache(self) -> None:
+        """Run the selectors for every row again, for when what they return moves without the items changing."""
+        self._rendered_row_by_key.clear()
+        self._sort_key_by_key_by_col_num.clear()
+
+        if self._items:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._items) - 1, len(self._column_header) - 1))
+
     def columnCount(self, parent: qtc.QModelIndex = qtc.QModelIndex()) -> int:  # noqa: B008
         return len(self._column_header)
 
@@ -80,7 +121,9 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
         if not index.isValid():
             return qtc.QVariant()
 
-        attr = self._attr_by_col_num[index.column()]
+        col_num = index.column()
+
+        attr = self._attr_by_col_num[col_num]
 
         if attr.data_type == "button":
             if role == qtc.Qt.ItemDataRole.DecorationRole:
@@ -90,35 +133,12 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
             return qtc.QVariant()
 
         if role == qtc.Qt.ItemDataRole.TextAlignmentRole:
-            match self._attr_by_name[attr.name].alignment:
-                case "center":
-                    return qtc.Qt.AlignmentFlag.AlignTop | qtc.Qt.AlignmentFlag.AlignHCenter
-                case "left":
-                    return qtc.Qt.AlignmentFlag.AlignTop | qtc.Qt.AlignmentFlag.AlignLeft
-                case "right":
-                    return qtc.Qt.AlignmentFlag.AlignTop | qtc.Qt.AlignmentFlag.AlignRight
-                case _:
-                    return qtc.Qt.AlignmentFlag.AlignTop
+            return self._alignment_by_col_num[col_num]
 
         if role == qtc.Qt.ItemDataRole.DisplayRole:
-            item = self._items[index.row()]
-
-            if attr.value_selector is None:
-                value: typing.Any = getattr(item, attr.name)
-                if value is None:
-                    return qtc.QVariant()
-            else:
-                value = attr.value_selector(item)
-
-            match attr.data_type:
-                case "date":
-                    return qtc.QVariant(value.strftime(self._date_format))
-                case "datetime":
-                    return qtc.QVariant(value.strftime(self._datetime_format))
-                case "text":
-                    return qtc.QVariant("{0}".format(value.strip(" \n\t")))
-                case _:
-                    return qtc.QVariant("{0}".format(value))
+            if (display := self._rendered_row(index.row()).display[col_num]) is None:
+                return qtc.QVariant()
+            return qtc.QVariant(display)
 
         # if role == qtc.Qt.FontRole:
         #     attr = self._attr_by_name[attr.name]
@@ -127,13 +147,8 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
         # return fonts.NORMAL
 
         if role == qtc.Qt.ItemDataRole.ForegroundRole:
-            item = self._items[index.row()]
-
-            if attr.color_selector is not None:
-                if color := attr.color_selector(item):
-                    brush = qtg.QBrush()
-                    brush.setColor(color)
-                    return brush
+            if (brush := self._rendered_row(index.row()).foreground[col_num]) is not None:
+                return brush
 
         return qtc.QVariant()
 
@@ -143,6 +158,9 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
     def get_attr_for_column_number(self, /, col_num: int) -> Attr[Item, typing.Any]:
         return self._attr_by_col_num[col_num]
 
+    def get_button_text(self, /, index: qtc.QModelIndex) -> str:
+        return self._rendered_row(index.row()).button_text[index.column()]
+
     def get_column_number_for_attr_name(self, /, attr_name: str) -> int:
         try:
             return next(i for i, attr in enumerate(self._attrs) if attr.name == attr_name)
@@ -152,12 +170,18 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
                 f"The attr, {attr_name!r}, was not found.  Available attrs include the following: {attr_names}"
             ) from e
 
+    def get_display_texts(self, /, row_num: int) -> tuple[str | None, ...]:
+        return self._rendered_row(row_num).display
+
     def get_item(self, /, key: Key) -> Item | None:
-        if self._items:
-            row_num = self._row_num_by_key[key]
-            return self._items[row_num]
+        row_num = self._row_num_by_key.get(key)
+        if row_num is None:
+            return None
 
-        return None
+        return self._items[row_num]
+
+    def get_item_for_row(self, /, row_num: int) -> Item:
+        return self._items[row_num]
 
     def get_row_num_for_key(self, /, key: Key) -> int | None:
         return self._row_num_by_key.get(key)
@@ -181,6 +205,9 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
         # if role == qtc.Qt.FontRole:
         #     return fonts.BOLD
 
+    def is_button_enabled(self, /, index: qtc.QModelIndex) -> bool:
+        return self._rendered_row(index.row()).button_enabled[index.column()]
+
     def removeRow(self, row: int, parent: qtc.QModelIndex = qtc.QModelIndex()) -> bool:  # noqa: B008
         if len(self._items) < row + 1:
             warnings.warn(
@@ -191,7 +218,8 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
 
         self.beginRemoveRows(parent, row, row)
 
-        self._items.pop(row)
+        removed_item = self._items.pop(row)
+        self._forget_rendered(getattr(removed_item, self._key_attr_name))
 
         self._reindex_rows()
 
@@ -203,61 +231,320 @@ class TableViewModel(qtc.QAbstractTableModel, typing.Generic[Item, Key]):
         return len(self._items)
 
     def set_items(self, /, items: typing.Iterable[Item]) -> None:
-        self.layoutAboutToBeChanged.emit()
+        """Replace the items, signalling only the rows that were removed, moved, changed or inserted.
 
-        self._items.clear()
-        for item in items:
-            self._items.append(item)
+        Rows are matched up by key, so a refresh that brings back the same items emits nothing and the view keeps its
+        selection, scroll position and row heights. A diff scattered over too many ranges of rows costs more in signals
+        than it saves, so those replace every row at once instead, as do items with duplicate keys.
 
-        self._reindex_rows()
+        The new items are put in the order the table is sorted in, if it is.
+        """
+        new_items = list(items)
 
-        self.layoutChanged.emit()
+        new_item_by_key: dict[Key, Item] = {getattr(item, self._key_attr_name): item for item in new_items}
+
+        changed_keys = {
+            key
+            for key, new_item in new_item_by_key.items()
+            if (row_num := self._row_num_by_key.get(key)) is not None
+            and (item := self._items[row_num]) is not new_item
+            and item != new_item
+        }
+
+        if self._sort_order:
+            # the sort keys of the changed items were selected from the old ones
+            for key in changed_keys:
+                self._forget_rendered(key)
+
+            new_items = self._sorted(new_items)
+
+        removed_row_nums = [
+            row_num
+            for row_num, item in enumerate(self._items)
+            if getattr(item, self._key_attr_name) not in new_item_by_key
+        ]
+        inserted_row_nums = [
+            row_num
+            for row_num, item in enumerate(new_items)
+            if getattr(item, self._key_attr_name) not in self._row_num_by_key
+        ]
+
+        if (
+            len(new_item_by_key) != len(new_items)
+            or len(_ranges(removed_row_nums)) + len(_ranges(inserted_row_nums)) > _MAX_DIFF_RANGES
+        ):
+            self._replace_items(new_items)
+            return None
+
+        self._remove_rows(removed_row_nums)
+
+        self._reorder_rows(
+            [key for item in new_items if (key := getattr(item, self._key_attr_name)) in self._row_num_by_key]
+        )
+
+        self._update_changed_rows(new_item_by_key=new_item_by_key, changed_keys=changed_keys)
+
+        self._insert_rows(new_items=new_items, row_nums=inserted_row_nums)
 
     def sort(
         self,
         col: int,
         order: qtc.Qt.SortOrder = qtc.Qt.SortOrder.AscendingOrder,
     ) -> None:
+        """Sort on col, breaking ties with the columns sorted on before it. A col of -1 leaves the rows as they come."""
+        if col < 0:
+            self._sort_order.clear()
+            return None
+
         attr = self._attr_by_col_num[col]
         if attr.data_type == "button":
-            return
+            return None
 
-        self.layoutAboutToBeChanged.emit()
+        self._sort_order = [(col, order), *((c, o) for c, o in self._sort_order if c != col)][:_MAX_SORT_COLUMNS]
 
-        def key_fn(item: Item, /) -> tuple[bool, typing.Any]:
-            if attr.value_selector:
-                val = attr.value_selector(item)
+        self._reorder_rows([getattr(item, self._key_attr_name) for item in self._sorted(self._items)])
+
+    def update_item(self, /, updated_item: Item) -> None:
+        key = getattr(updated_item, self._key_attr_name)
+        row_num = self._row_num_by_key[key]
+        self._items[row_num] = updated_item
+        self._forget_rendered(key)
+        last_col = len(self._column_header)
+        start_index = self.index(row_num, 0)
+        end_index = self.index(row_num, last_col)
+        self.dataChanged.emit(start_index, end_index, [qtc.Qt.ItemDataRole.DisplayRole])
+
+    def _render(self, /, item: Item) -> _RenderedRow:
+        display: list[str | None] = []
+        foreground: list[qtg.QBrush | None] = []
+        button_text: list[str] = []
+        button_enabled: list[bool] = []
+        for attr in self._attrs:
+            if attr.data_type == "button":
+                display.append(None)
+                foreground.append(None)
+                button_text.append(attr.display_name if attr.value_selector is None else str(attr.value_selector(item)))
+                button_enabled.append(True if attr.enabled_selector is None else attr.enabled_selector(item))
+                continue
+
+            if attr.value_selector is None:
+                value: typing.Any = getattr(item, attr.name)
             else:
-                val = getattr(item, attr.name)
+                value = attr.value_selector(item)
 
-            if val is None:
-                return False, None
+            if value is None:
+                display.append(None)
+            else:
+                match attr.data_type:
+                    case "date":
+                        display.append(value.strftime(self._date_format))
+                    case "datetime":
+                        display.append(value.strftime(self._datetime_format))
+                    case "text":
+                        display.append("{0}".format(value.strip(" \n\t")))
+                    case _:
+                        display.append("{0}".format(value))
+
+            if attr.color_selector is not None and (color := attr.color_selector(item)):
+                brush = qtg.QBrush()
+                brush.setColor(color)
+                foreground.append(brush)
             else:
-                return True, val
+                foreground.append(None)
 
-        self._items = sorted(
-            self._items,
-            key=key_fn,
-            reverse=(order == qtc.Qt.SortOrder.DescendingOrder),
+            button_text.append("")
+            button_enabled.append(False)
+
+        return _RenderedRow(
+            display=tuple(display),
+            foreground=tuple(foreground),
+            button_text=tuple(button_text),
+            button_enabled=tuple(button_enabled),
         )
 
+    def _rendered_row(self, /, row_num: int) -> _RenderedRow:
+        item = self._items[row_num]
+
+        key = getattr(item, self._key_attr_name)
+
+        rendered_row = self._rendered_row_by_key.get(key)
+        if rendered_row is None:
+            rendered_row = self._render(item)
+            self._rendered_row_by_key[key] = rendered_row
+
+        return rendered_row
+
+    def _insert_rows(self, *, new_items: list[Item], row_nums: list[int]) -> None:
+        # the rows before each range already match new_items, so each range goes in at its final position
+        for first, last in _ranges(row_nums):
+            self.beginInsertRows(qtc.QModelIndex(), first, last)
+
+            for item in new_items[first : last + 1]:
+                self._forget_rendered(getattr(item, self._key_attr_name))
+
+            self._items[first:first] = new_items[first : last + 1]
+
+            self._reindex_rows(start=first)
+
+            self.endInsertRows()
+
+    def _forget_rendered(self, /, key: Key) -> None:
+        self._rendered_row_by_key.pop(key, None)
+        for sort_key_by_key in self._sort_key_by_key_by_col_num.values():
+            sort_key_by_key.pop(key, None)
+
+    def _reindex_rows(self, *, start: int = 0) -> None:
+        if start == 0:
+            self._row_num_by_key.clear()
+
+        for row_num in range(start, len(self._items)):
+            key = getattr(self._items[row_num], self._key_attr_name)
+            self._row_num_by_key[key] = row_num
+
+    def _remove_rows(self, /, row_nums: list[int]) -> None:
+        # from the bottom up, so the row numbers of the ranges still to go don't move
+        for first, last in reversed(_ranges(row_nums)):
+            self.beginRemoveRows(qtc.QModelIndex(), first, last)
+
+            for item in self._items[first : last + 1]:
+                key = getattr(item, self._key_attr_name)
+                self._row_num_by_key.pop(key, None)
+                self._forget_rendered(key)
+
+            del self._items[first : last + 1]
+
+            self._reindex_rows(start=first)
+
+            self.endRemoveRows()
+
+    def _reorder_rows(self, /, keys: list[Key]) -> None:
+        if [getattr(item, self._key_attr_name) for item in self._items] == keys:
+            return None
+
+        self.layoutAboutToBeChanged.emit()
+
+        # the view's selection and current index hold on to persistent indexes, point them at the rows' new positions
+        persistent_indexes = self.persistentIndexList()
+        persistent_keys = [getattr(self._items[index.row()], self._key_attr_name) for index in persistent_indexes]
+
+        self._items = [self._items[self._row_num_by_key[key]] for key in keys]
+
         self._reindex_rows()
 
-        # self.modelReset.emit()
+        self.changePersistentIndexList(
+            persistent_indexes,
+            [
+                self.index(self._row_num_by_key[key], index.column())
+                for key, index in zip(persistent_keys, persistent_indexes)
+            ],
+        )
 
         self.layoutChanged.emit()
 
-    def update_item(self, /, updated_item: Item) -> None:
-        key = getattr(updated_item, self._key_attr_name)
-        row_num = self._row_num_by_key[key]
-        self._items[row_num] = updated_item
-        last_col = len(self._column_header)
-        start_index = self.index(row_num, 0)
-        end_index = self.index(row_num, last_col)
-        self.dataChanged.emit(start_index, end_index, [qtc.Qt.ItemDataRole.DisplayRole])
+    def _replace_items(self, /, items: list[Item]) -> None:
+        self.layoutAboutToBeChanged.emit()
 
-    def _reindex_rows(self) -> None:
-        self._row_num_by_key.clear()
-        for row_num, item in enumerate(self._items):
-            key = getattr(item, self._key_attr_name)
-            self._row_num_by_key[key] = row_num
+        self._items = items
+
+        self._rendered_row_by_key.clear()
+        self._sort_key_by_key_by_col_num.clear()
+
+        self._reindex_rows()
+
+        self.layoutChanged.emit()
+
+    def _sorted(self, /, items: list[Item]) -> list[Item]:
+        # a stable sort per column, from the least significant up, orders the rows on all the columns at once
+        items = list(items)
+        for col_num, order in reversed(self._sort_order):
+            sort_key = functools.partial(
+                self._sort_key,
+                attr=self._attr_by_col_num[col_num],
+                sort_key_by_key=self._sort_key_by_key_by_col_num.setdefault(col_num, {}),
+            )
+
+            items.sort(key=sort_key, reverse=(order == qtc.Qt.SortOrder.DescendingOrder))
+
+        return items
+
+    def _compare(self, /, item: Item, other: Item) -> int:
+        """-1 if item sorts before other on the columns the table is sorted on, 1 if after, 0 if they tie."""
+        for col_num, order in self._sort_order:
+            sort_key = functools.partial(
+                self._sort_key,
+                attr=self._attr_by_col_num[col_num],
+                sort_key_by_key=self._sort_key_by_key_by_col_num.setdefault(col_num, {}),
+            )
+
+            item_sort_key, other_sort_key = sort_key(item), sort_key(other)
+            if item_sort_key == other_sort_key:
+                continue
+
+            is_before = item_sort_key < other_sort_key
+            if order == qtc.Qt.SortOrder.DescendingOrder:
+                is_before = not is_before
+
+            return -1 if is_before else 1
+
+        return 0
+
+    def _sorted_row_num(self, /, item: Item) -> int:
+        if not self._sort_order:
+            return len(self._items)
+
+        # after the rows it ties with, where appending it and sorting the rows again would put it
+        sort_key = functools.cmp_to_key(self._compare)
+
+        return bisect.bisect_right(self._items, sort_key(item), key=sort_key)
+
+    def _sort_key(
+        self,
+        /,
+        item: Item,
+        *,
+        attr: Attr[Item, typing.Any],
+        sort_key_by_key: dict[Key, tuple[bool, typing.Any]],
+    ) -> tuple[bool, typing.Any]:
+        key = getattr(item, self._key_attr_name)
+
+        sort_key = sort_key_by_key.get(key)
+        if sort_key is None:
+            value = getattr(item, attr.name) if attr.value_selector is None else attr.value_selector(item)
+            sort_key = (False, None) if value is None else (True, value)
+            sort_key_by_key[key] = sort_key
+
+        return sort_key
+
+    def _update_changed_rows(self, *, new_item_by_key: dict[Key, Item], changed_keys: set[Key]) -> None:
+        changed_row_nums = sorted(self._row_num_by_key[key] for key in changed_keys)
+        for row_num in changed_row_nums:
+            key = getattr(self._items[row_num], self._key_attr_name)
+            self._items[row_num] = new_item_by_key[key]
+            self._forget_rendered(key)
+
+        last_col = len(self._column_header) - 1
+        for first, last in _ranges(changed_row_nums):
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_col))
+
+
+def _alignment(attr: Attr[typing.Any, typing.Any], /) -> qtc.Qt.AlignmentFlag:
+    match attr.alignment:
+        case "center":
+            return qtc.Qt.AlignmentFlag.AlignTop | qtc.Qt.AlignmentFlag.AlignHCenter
+        case "left":
+            return qtc.Qt.AlignmentFlag.AlignTop | qtc.Qt.AlignmentFlag.AlignLeft
+        case "right":
+            return qtc.Qt.AlignmentFlag.AlignTop | qtc.Qt.AlignmentFlag.AlignRight
+        case _:
+            return qtc.Qt.AlignmentFlag.AlignTop
+
+
+def _ranges(row_nums: list[int], /) -> list[tuple[int, int]]:
+    """Group ascending row numbers into (first, last) ranges of consecutive rows."""
+    ranges: list[tuple[int, int]] = []
+    for row_num in row_nums:
+        if ranges and ranges[-1][1] == row_num - 1:
+            ranges[-1] = (ranges[-1][0], row_num)
+        else:
+            ranges.append((row_num, row_num))
+    return ranges
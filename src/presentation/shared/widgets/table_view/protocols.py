@@ -3,7 +3,7 @@ import typing
 # noinspection PyPep8Naming
 from PyQt6 import QtCore as qtc, QtGui as qtg
 
-from src.presentation.shared.widgets.table_view.item import Item
+from src.presentation.shared.widgets.table_view.item import ContravariantItem
 from src.presentation.shared.widgets.table_view.value import Value
 
 __all__ = (
@@ -13,16 +13,16 @@ __all__ = (
 )
 
 
-class EnabledSelector(typing.Protocol[Item]):
-    def __call__(self, /, item: Item) -> bool:
+class EnabledSelector(typing.Protocol[ContravariantItem]):
+    def __call__(self, /, item: ContravariantItem) -> bool:
         raise NotImplementedError
 
 
-class TextColorSelector(typing.Protocol[Item]):
-    def __call__(self, /, item: Item) -> qtg.QColor | qtc.Qt.GlobalColor | None:
+class TextColorSelector(typing.Protocol[ContravariantItem]):
+    def __call__(self, /, item: ContravariantItem) -> qtg.QColor | qtc.Qt.GlobalColor | None:
         raise NotImplementedError
 
 
-class ValueSelector(typing.Protocol[Item, Value]):
-    def __call__(self, /, item: Item) -> Value:
+class ValueSelector(typing.Protocol[ContravariantItem, Value]):
+    def __call__(self, /, item: ContravariantItem) -> Value:
         raise NotImplementedError
@@ -13,6 +13,11 @@ from src.presentation.shared.widgets.table_view.model import TableViewModel
 
 __all__ = ("TableView",)
 
+_MAX_ROW_HEIGHT: typing.Final[int] = 300
+
+# the row heights are cached by what the rows display, this keeps a long session of refreshes from growing it forever
+_MAX_CACHED_ROW_HEIGHTS: typing.Final[int] = 10_000
+
 
 class TableView(qtw.QTableView, typing.Generic[Item, Key]):
     button_clicked = qtc.pyqtSignal(ButtonClickedEvent)
@@ -28,6 +33,7 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
         parent: qtw.QWidget | None,
         date_format: str = "%m/%d/%Y",
         datetime_format: str = "%m/%d/%Y %I:%M %p",
+        size_rows_lazily: bool = False,
     ) -> None:
         super().__init__(parent=parent)
 
@@ -37,6 +43,12 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
         self._bold_font: typing.Final[qtg.QFont] = bold_font
         self._date_format: typing.Final[str] = date_format
         self._datetime_format: typing.Final[str] = datetime_format
+        # measure rows as they scroll into view instead of all of them whenever the items change, so a refresh costs
+        # the same however long the list is
+        self._size_rows_lazily: typing.Final[bool] = size_rows_lazily
+
+        self._row_height_by_display_texts: dict[tuple[str | None, ...], int] = {}
+        self._is_sizing_rows = False
 
         self._view_model: typing.Final[TableViewModel[Item, Key]] = TableViewModel(
             parent=self,
@@ -77,25 +89,31 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
 
                 self.setItemDelegateForColumn(col_num, btn_delegate)
 
+        # enabling sorting sorts on the header's sort indicator straight away, which is the first column unless it's
+        # cleared first
+        if horizontal_header := self.horizontalHeader():
+            horizontal_header.setSortIndicator(-1, qtc.Qt.SortOrder.AscendingOrder)
+
         self.setSortingEnabled(True)
         self.setAlternatingRowColors(True)
         self.setMouseTracking(True)
         self.setWordWrap(True)
 
-        self._col_widths: typing.Final[dict[int, int]] = {}
-        for col_num, attr in enumerate(self._attrs):
-            if attr.width:
-                col_width = attr.width
-            else:
-                if attr.data_type == "date":
-                    col_width = qtg.QFontMetrics(self._normal_font).boundingRect("   88/88/8888   ").width()
+        if horizontal_header := self.horizontalHeader():
+            # set once, so a column the user resizes keeps its width across refreshes
+            for col_num, attr in enumerate(self._attrs):
+                if attr.width:
+                    col_width = attr.width
                 else:
-                    col_width = qtg.QFontMetrics(self._bold_font).boundingRect(attr.display_name + "    ").width()
+                    if attr.data_type == "date":
+                        col_width = qtg.QFontMetrics(self._normal_font).boundingRect("   88/88/8888   ").width()
+                    else:
+                        col_width = qtg.QFontMetrics(self._bold_font).boundingRect(attr.display_name + "    ").width()
 
-            self._col_widths[col_num] = col_width
+                horizontal_header.resizeSection(col_num, col_width)
 
-        if horizontal_header := self.horizontalHeader():
             horizontal_header.setDefaultAlignment(qtc.Qt.AlignmentFlag.AlignHCenter | qtc.Qt.AlignmentFlag.AlignBottom)
+            horizontal_header.sectionResized.connect(self._on_column_resized)
 
         self.setCornerButtonEnabled(False)
 
@@ -107,6 +125,13 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
 
         self._view_model.layoutChanged.connect(self._resize_rows)
 
+        if self._size_rows_lazily:
+            if scroll_bar := self.verticalScrollBar():
+                scroll_bar.valueChanged.connect(self._resize_visible_rows)
+
+            # removing a row scrolls the ones below it up into view
+            self._view_model.rowsRemoved.connect(self._resize_visible_rows)
+
         self._resize_rows()
 
     @property
@@ -120,6 +145,9 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
         if row is not None:
             self._resize_row(row)
 
+    def clear_render_cache(self) -> None:
+        self._view_model.clear_render_cache()
+
     def clear_selection(self) -> None:
         if model := self.selectionModel():
             model.clear()
@@ -143,12 +171,20 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
     def selected_item(self) -> Item | None:
         if selection_model := self.selectionModel():
             if indices := selection_model.selectedIndexes():
-                return self._view_model.items[indices[0].row()]
+                return self._view_model.get_item_for_row(indices[0].row())
 
         return None
 
+    def resizeEvent(self, event: qtg.QResizeEvent | None) -> None:
+        super().resizeEvent(event)
+
+        if self._size_rows_lazily:
+            self._resize_visible_rows()
+
     def set_items(self, /, items: typing.Iterable[Item]) -> None:
         self._view_model.set_items(items)
+
+        # the heights are cached by what the rows display, so only the inserted and changed rows are measured
         self._resize_rows()
 
     def update_item(self, /, item: Item) -> None:
@@ -168,10 +204,10 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
 
         if attr.data_type == "button":
             if attr.enabled_selector is None:
-                item = self._view_model.items[index.row()]
+                item = self._view_model.get_item_for_row(index.row())
                 self.button_clicked.emit(ButtonClickedEvent(attr=attr, item=item))
             else:
-                item = self._view_model.items[index.row()]
+                item = self._view_model.get_item_for_row(index.row())
                 if attr.enabled_selector(item):
                     self.button_clicked.emit(ButtonClickedEvent(attr=attr, item=item))
         # else:
@@ -181,32 +217,57 @@ class TableView(qtw.QTableView, typing.Generic[Item, Key]):
     def _on_double_click(self, *, index: qtc.QModelIndex) -> None:
         attr = self._view_model.get_attr_for_column_number(index.column())
 
-        item = self._view_model.items[index.row()]
+        item = self._view_model.get_item_for_row(index.row())
         if item:
             event = DoubleClickedEvent(attr=attr, item=item)
             self.double_clicked.emit(event)
 
-    def _resize_row(self, /, row: int) -> None:
-        default_row_height = qtg.QFontMetrics(self._normal_font).height()
-        self.setRowHeight(row, default_row_height)
-        self.resizeRowToContents(row)
-        if self.rowHeight(row) > 300:
-            self.setRowHeight(row, 300)
+    def _on_column_resized(self, /, *_: int) -> None:
+        # the heights were measured with the text wrapped to the old widths
+        self._row_height_by_display_texts.clear()
 
-    def _resize_rows(self) -> None:
-        default_row_height = qtg.QFontMetrics(self._normal_font).height()
+        if self._size_rows_lazily:
+            self._resize_visible_rows()
 
-        for row_num in range(self._view_model.rowCount()):
-            self.setRowHeight(row_num, default_row_height)
+    def _resize_row(self, /, row: int) -> None:
+        display_texts = self._view_model.get_display_texts(row)
 
-            self.resizeRowToContents(row_num)
+        row_height = self._row_height_by_display_texts.get(display_texts)
+        if row_height is None:
+            self.setRowHeight(row, qtg.QFontMetrics(self._normal_font).height())
+            self.resizeRowToContents(row)
+            row_height = min(self.rowHeight(row), _MAX_ROW_HEIGHT)
 
-            if self.rowHeight(row_num) > 300:
-                self.setRowHeight(row_num, 300)
+            if len(self._row_height_by_display_texts) >= _MAX_CACHED_ROW_HEIGHTS:
+                self._row_height_by_display_texts.clear()
+            self._row_height_by_display_texts[display_texts] = row_height
 
-        if header := self.horizontalHeader():
-            for col_num, col_width in self._col_widths.items():
-                header.resizeSection(col_num, col_width)
+        self.setRowHeight(row, row_height)
+
+    def _resize_rows(self) -> None:
+        if self._size_rows_lazily:
+            self._resize_visible_rows()
+        else:
+            for row_num in range(self._view_model.rowCount()):
+                self._resize_row(row_num)
 
         # if vertical_header := self.verticalHeader():
         #     vertical_header.setHidden(True)
+
+    def _resize_visible_rows(self) -> None:
+        # sizing a row moves the rows below it, which can scroll the view and land back here
+        if self._is_sizing_rows:
+            return None
+
+        viewport = self.viewport()
+        if viewport is None:
+            return None
+
+        self._is_sizing_rows = True
+        try:
+            row_num = max(self.rowAt(0), 0)
+            while row_num < self._view_model.rowCount() and self.rowViewportPosition(row_num) < viewport.height():
+                self._resize_row(row_num)
+                row_num += 1
+        finally:
+            self._is_sizing_rows = False
@@ -0,0 +1,56 @@
+import time
+import typing
+
+# noinspection PyPep8Naming
+from PyQt6 import QtCore as qtc
+from loguru import logger
+
+from src import domain
+
+__all__ = ("TodoChangeWatcher",)
+
+
+class TodoChangeWatcher(qtc.QObject):
+    """Waits on TodoService.wait_for_changes in its own thread and emits the new change cursor whenever todos change.
+
+    Writes made by this client are reported too, the dashboard skips cursors it has already caught up to.
+    """
+
+    changed = qtc.pyqtSignal(int)
+
+    def __init__(self, *, todo_service: domain.TodoService, timeout_seconds: float = 2.0):
+        super().__init__()
+
+        self._todo_service: typing.Final[domain.TodoService] = todo_service
+        self._timeout_seconds: typing.Final[float] = timeout_seconds
+
+        self._stopped = False
+
+    def run(self) -> None:
+        logger.debug(f"{self.__class__.__name__}.run()")
+
+        cursor: int | domain.Error = self._todo_service.change_cursor()
+
+        while not self._stopped:
+            if isinstance(cursor, domain.Error):
+                logger.error(f"{self.__class__.__name__}.run() failed: {cursor!s}")
+
+                # the database may be unreachable for a while, so back off rather than spin
+                time.sleep(self._timeout_seconds)
+
+                # writes made during the outage went unseen, let the dashboard catch up on them
+                cursor = self._todo_service.change_cursor()
+                if isinstance(cursor, int):
+                    self.changed.emit(cursor)
+
+                continue
+
+            latest_cursor = self._todo_service.wait_for_changes(cursor=cursor, timeout_seconds=self._timeout_seconds)
+            if isinstance(latest_cursor, int) and latest_cursor != cursor:
+                self.changed.emit(latest_cursor)
+
+            cursor = latest_cursor
+
+    def stop(self) -> None:
+        """Ask run() to return, it does so within timeout_seconds."""
+        self._stopped = True
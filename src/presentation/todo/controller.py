@@ -1,3 +1,4 @@
+import datetime
 import typing
 
 # noinspection PyPep8Naming
@@ -37,6 +38,8 @@ class TodoController(qtc.QObject):
         self._dash_requests.delete.connect(self._on_delete_request)
         self._dash_requests.edit.connect(self._on_edit_request)
         self._dash_requests.refresh.connect(self._on_refresh_request)
+        self._dash_requests.refresh_display_windows.connect(self._on_refresh_display_windows_request)
+        self._dash_requests.sync.connect(self._on_sync_request)
         self._form_requests.back.connect(self._on_back_request)
         self._form_requests.save.connect(self._on_save_request)
 
@@ -60,15 +63,22 @@ class TodoController(qtc.QObject):
 
         try:
             if request.todo.should_display():
-                self._todo_service.mark_complete(
+                toggle_result = self._todo_service.mark_complete(
                     todo_id=request.todo.todo_id,
                     user=self._current_user,
                 )
                 status = "complete"
             else:
-                self._todo_service.mark_incomplete(todo_id=request.todo.todo_id)
+                toggle_result = self._todo_service.mark_incomplete(todo_id=request.todo.todo_id)
                 status = "incomplete"
 
+            if isinstance(toggle_result, domain.Error):
+                logger.error(
+                    f"{self.__class__.__name__}._on_toggle_completed_request({request=!r}) failed: {toggle_result!s}"
+                )
+                self._set_status(toggle_result.error_message)
+                return None
+
             todo = self._todo_service.get(todo_id=request.todo.todo_id)
             if isinstance(todo, domain.Error):
                 logger.error(f"{self.__class__.__name__}._on_toggle_completed_request({request=!r}) failed: {todo!s}")
@@ -135,15 +145,14 @@ class TodoController(qtc.QObject):
         try:
             self._set_status("Refreshing Todos...")
 
-            if request.category:
-                category_id: str | domain.Unspecified = request.category.category_id
-            else:
-                category_id = domain.Unspecified()
+            category_id, user_id = _filter_ids(request)
 
-            if request.user:
-                user_id: str | domain.Unspecified = request.user.user_id
-            else:
-                user_id = domain.Unspecified()
+            # read before the todos, so a write that lands in between is fetched again by the next sync
+            change_cursor = self._todo_service.change_cursor()
+            if isinstance(change_cursor, domain.Error):
+                logger.error(f"{self.__class__.__name__}._on_refresh_request({request=!r}): {change_cursor!s}")
+                self._set_status(change_cursor.error_message)
+                return None
 
             todos = self._todo_service.where(
                 description_like=request.description,
@@ -157,10 +166,18 @@ class TodoController(qtc.QObject):
                 self._set_status(todos.error_message)
                 return None
 
+            next_appearance = self._next_appearance(request)
+            if isinstance(next_appearance, domain.Error):
+                logger.error(f"{self.__class__.__name__}._on_refresh_request({request=!r}): {next_appearance!s}")
+                self._set_status(next_appearance.error_message)
+                return None
+
             self.states.emit(
                 TodoState(
                     dash_state=dash.TodoDashState(
                         todos=tuple(todos),
+                        change_cursor=change_cursor,
+                        next_appearance=next_appearance,
                         status="Todos refreshed.",
                     )
                 )
@@ -170,6 +187,66 @@ class TodoController(qtc.QObject):
 
             self._set_status(str(e))
 
+    def _on_refresh_display_windows_request(self) -> None:
+        logger.debug(f"{self.__class__.__name__}._on_refresh_display_windows_request()")
+
+        try:
+            refresh_result = self._todo_service.refresh_display_windows()
+            if isinstance(refresh_result, domain.Error):
+                logger.error(f"{self.__class__.__name__}._on_refresh_display_windows_request(): {refresh_result!s}")
+                self._set_status(refresh_result.error_message)
+                return None
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}._on_refresh_display_windows_request() failed: {e!s}")
+
+            self._set_status(str(e))
+
+    def _on_sync_request(self, /, request: dash.requests.SyncRequest) -> None:
+        logger.debug(f"{self.__class__.__name__}._on_sync_request({request=!r})")
+
+        try:
+            category_id, user_id = _filter_ids(request.refresh_request)
+
+            changes = self._todo_service.changes_since(
+                cursor=request.cursor,
+                description_like=request.refresh_request.description,
+                due_filter=request.refresh_request.is_due,
+                category_id_filter=category_id,
+                user_id_filter=user_id,
+            )
+            if isinstance(changes, domain.Error):
+                logger.error(f"{self.__class__.__name__}._on_sync_request({request=!r}): {changes!s}")
+                self._set_status(changes.error_message)
+                return None
+
+            # another client may have added, completed or rescheduled a todo that isn't due now, when nothing was
+            # written the date worked out by the last refresh or sync still stands
+            if changes.upserted or changes.deleted_todo_ids:
+                next_appearance: datetime.date | None | domain.Unspecified | domain.Error = self._next_appearance(
+                    request.refresh_request
+                )
+            else:
+                next_appearance = domain.Unspecified()
+
+            if isinstance(next_appearance, domain.Error):
+                logger.error(f"{self.__class__.__name__}._on_sync_request({request=!r}): {next_appearance!s}")
+                self._set_status(next_appearance.error_message)
+                return None
+
+            self.states.emit(
+                TodoState(
+                    dash_state=dash.TodoDashState(
+                        changes=changes,
+                        change_cursor=changes.cursor,
+                        next_appearance=next_appearance,
+                    )
+                )
+            )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}._on_sync_request({request=!r}) failed: {e!s}")
+
+            self._set_status(str(e))
+
     def _on_back_request(self) -> None:
         logger.debug(f"{self.__class__.__name__}._on_back_request()")
 
@@ -187,68 +264,29 @@ class TodoController(qtc.QObject):
                 )
                 return None
 
-            preexisting_todo = self._todo_service.get(todo_id=request.todo.todo_id)
-            if isinstance(preexisting_todo, domain.Error):
-                logger.error(f"{self.__class__.__name__}._on_save_request({request=!r}): {preexisting_todo!s}.")
-                self._set_status(preexisting_todo.error_message)
+            saved_todo = self._todo_service.save(todo=request.todo)
+            if isinstance(saved_todo, domain.Error):
+                logger.error(f"{self.__class__.__name__}._on_save_request({request=!r}): {saved_todo!s}.")
+                self._set_status(saved_todo.error_message)
                 return None
 
-            if preexisting_todo:
-                update_result = self._todo_service.update(todo=request.todo)
-                if isinstance(update_result, domain.Error):
-                    logger.error(f"{self.__class__.__name__}._on_save_request({request=!r}): {update_result!s}.")
-                    self._set_status(update_result.error_message)
-                    return None
-
-                updated_todo = self._todo_service.get(todo_id=request.todo.todo_id)
-                if isinstance(updated_todo, domain.Error):
-                    logger.error(f"{self.__class__.__name__}._on_save_request({request=!r}): {updated_todo!s}.")
-                    self._set_status(updated_todo.error_message)
-                    return None
-
-                if updated_todo is None:
-                    logger.error(
-                        f"{self.__class__.__name__}._on_save_request({request=!r}): after update todo was not found "
-                        f"in the database."
-                    )
-                    self._set_status("An error occurred while fetching the updated Todo from the database.")
-                    return None
-
+            # a freshly inserted todo has never been updated
+            if saved_todo.date_updated is None:
                 self.states.emit(
                     TodoState(
                         dash_state=dash.TodoDashState(
-                            updated_todo=updated_todo,
-                            status=f"Updated {request.todo.description}.",
+                            added_todo=saved_todo,
+                            status=f"Added {request.todo.description}.",
                         ),
                         dash_active=True,
                     )
                 )
             else:
-                add_result = self._todo_service.add(todo=request.todo)
-                if isinstance(add_result, domain.Error):
-                    logger.error(f"{self.__class__.__name__}._on_save_request({request=!r}): {add_result!s}.")
-                    self._set_status("An error occurred while adding Todo to the database.")
-                    return None
-
-                todo = self._todo_service.get(todo_id=request.todo.todo_id)
-                if isinstance(todo, domain.Error):
-                    logger.error(f"{self.__class__.__name__}._on_save_request({request=!r}): {todo!s}.")
-                    self._set_status("An error occurred while fetching the new Todo from the database.")
-                    return None
-
-                if todo is None:
-                    logger.error(
-                        f"{self.__class__.__name__}._on_save_request({request=!r}): after adding todo it was not found "
-                        f"in the database."
-                    )
-                    self._set_status("An error occurred while fetching the new Todo from the database.")
-                    return None
-
                 self.states.emit(
                     TodoState(
                         dash_state=dash.TodoDashState(
-                            added_todo=todo,
-                            status=f"Added {request.todo.description}.",
+                            updated_todo=saved_todo,
+                            status=f"Updated {request.todo.description}.",
                         ),
                         dash_active=True,
                     )
@@ -258,5 +296,36 @@ class TodoController(qtc.QObject):
 
             popup.error_message(message=str(e))
 
+    def _next_appearance(
+        self,
+        /,
+        request: dash.requests.RefreshRequest,
+    ) -> datetime.date | None | domain.Error:
+        # without the due filter every todo is already on the dashboard, each row tracks its own changes
+        if not request.is_due:
+            return None
+
+        category_id, user_id = _filter_ids(request)
+
+        return self._todo_service.next_appearance(
+            description_like=request.description,
+            category_id_filter=category_id,
+            user_id_filter=user_id,
+        )
+
     def _set_status(self, /, status: str) -> None:
         self.states.emit(TodoState.set_status(status))
+
+
+def _filter_ids(request: dash.requests.RefreshRequest, /) -> tuple[str | domain.Unspecified, str | domain.Unspecified]:
+    if request.category:
+        category_id: str | domain.Unspecified = request.category.category_id
+    else:
+        category_id = domain.Unspecified()
+
+    if request.user:
+        user_id: str | domain.Unspecified = request.user.user_id
+    else:
+        user_id = domain.Unspecified()
+
+    return category_id, user_id
@@ -1,9 +1,11 @@
 from src.presentation.todo.view.dash import requests
+from src.presentation.todo.view.dash.row import TodoDashRow
 from src.presentation.todo.view.dash.state import TodoDashState
 from src.presentation.todo.view.dash.view import TodoDashView
 
 __all__ = (
     "requests",
+    "TodoDashRow",
     "TodoDashState",
     "TodoDashView",
 )
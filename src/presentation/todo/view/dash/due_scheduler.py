@@ -0,0 +1,112 @@
+import datetime
+import heapq
+import typing
+
+from PyQt6 import QtCore as qtc  # noqa
+from loguru import logger
+
+from src import domain
+
+__all__ = ("DueScheduler",)
+
+# the timer is never armed further out than this, so a machine that sleeps through a transition or has its clock
+# changed catches up within the hour instead of waiting on a deadline worked out before
+_MAX_WAIT_MS: typing.Final[int] = 60 * 60 * 1000
+
+# a coarse timer can fire a little early, waking just after midnight saves rearming for the last few milliseconds
+_MIDNIGHT_SLACK_MS: typing.Final[int] = 1_000
+
+
+class DueScheduler(qtc.QObject):
+    """Tells the dashboard when the day a row's display state changes on has arrived, and when the date rolls over.
+
+    Each key is scheduled for the date it next changes on. The dates are kept in a min-heap and a single timer is armed
+    for the earliest one, or the next midnight if that comes first, so nothing runs between transitions however many
+    rows are tracked. Rescheduling or removing a key leaves its old heap entry in place, it's skipped when it reaches
+    the top.
+    """
+
+    due = qtc.pyqtSignal(tuple)
+    day_changed = qtc.pyqtSignal(datetime.date)
+
+    def __init__(self, *, parent: qtc.QObject | None):
+        super().__init__(parent=parent)
+
+        self._heap: list[tuple[datetime.date, str]] = []
+        self._date_by_key: dict[str, datetime.date] = {}
+        self._today: datetime.date = domain.clock.today()
+
+        self._timer: typing.Final[qtc.QTimer] = qtc.QTimer(parent=self)
+        self._timer.setSingleShot(True)
+
+        # noinspection PyUnresolvedReferences
+        self._timer.timeout.connect(self._on_timeout)
+
+    def clear(self) -> None:
+        self._heap = []
+        self._date_by_key = {}
+
+        self._arm()
+
+    def next_due(self) -> datetime.date | None:
+        self._discard_stale()
+
+        if self._heap:
+            return self._heap[0][0]
+        return None
+
+    def schedule(self, /, dates: typing.Iterable[tuple[str, datetime.date | None]]) -> None:
+        """Schedule each key for its date, replacing any earlier date. A key with a date of None is unscheduled."""
+        for key, date in dates:
+            if date is None:
+                self._date_by_key.pop(key, None)
+            else:
+                self._date_by_key[key] = date
+                heapq.heappush(self._heap, (date, key))
+
+        self._arm()
+
+    def unschedule(self, /, keys: typing.Iterable[str]) -> None:
+        for key in keys:
+            self._date_by_key.pop(key, None)
+
+        self._arm()
+
+    def _arm(self) -> None:
+        # the day counts on every row move at midnight, whether or not any row is due then
+        wake_date = self._today + datetime.timedelta(days=1)
+        if (next_due := self.next_due()) is not None:
+            wake_date = min(wake_date, next_due)
+
+        wait = datetime.datetime.combine(wake_date, datetime.time.min) - datetime.datetime.now()
+
+        self._timer.start(max(0, min(int(wait.total_seconds() * 1000) + _MIDNIGHT_SLACK_MS, _MAX_WAIT_MS)))
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._date_by_key.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _on_timeout(self) -> None:
+        today = domain.clock.today()
+
+        day_changed = today != self._today
+        self._today = today
+
+        due_keys: list[str] = []
+        while (next_due := self.next_due()) is not None and next_due <= today:
+            _, key = heapq.heappop(self._heap)
+            del self._date_by_key[key]
+            due_keys.append(key)
+
+        self._arm()
+
+        # ahead of the due rows, so whatever the rollover refreshes is current before they are looked at
+        if day_changed:
+            logger.debug(f"{self.__class__.__name__}: the date rolled over to {today}.")
+
+            self.day_changed.emit(today)
+
+        if due_keys:
+            logger.debug(f"{self.__class__.__name__}: {len(due_keys)} rows due as of {today}.")
+
+            self.due.emit(tuple(due_keys))
@@ -10,6 +10,7 @@ __all__ = (
     "DeleteTodo",
     "EditTodo",
     "RefreshRequest",
+    "SyncRequest",
     "ToggleCompleted",
     "TodoDashRequests",
 )
@@ -38,6 +39,14 @@ class RefreshRequest:
     user: domain.User
 
 
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class SyncRequest:
+    """Fetch what changed since cursor, filtered the way the todos on screen were."""
+
+    cursor: int
+    refresh_request: RefreshRequest
+
+
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class ToggleCompleted:
     todo: domain.Todo
@@ -48,4 +57,6 @@ class TodoDashRequests(qtc.QObject):
     delete = qtc.pyqtSignal(DeleteTodo)
     edit = qtc.pyqtSignal(EditTodo)
     refresh = qtc.pyqtSignal(RefreshRequest)
+    refresh_display_windows = qtc.pyqtSignal()
+    sync = qtc.pyqtSignal(SyncRequest)
     toggle_completed = qtc.pyqtSignal(ToggleCompleted)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import typing
+
+from src import domain
+
+__all__ = ("TodoDashRow",)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
+class TodoDashRow:
+    """What the dashboard table shows for a todo, worked out once when the todo is fetched.
+
+    The table reads these fields on every paint, so nothing here should need date_calc again. They hold until
+    next_transition, when the row has to be worked out again. Only the day count moves in between, so it's kept as the
+    date it counts down to.
+    """
+
+    todo: domain.Todo
+    todo_id: str
+    description: str
+    note: str
+    due_date: datetime.date
+    days_until: datetime.date | None
+    next_transition: datetime.date | None
+    should_display: bool
+    complete_button_text: str
+    user: str
+    category: str
+    frequency: str
+    completed: str
+    date_added: datetime.datetime
+    date_updated: datetime.datetime | None
+    search_text: str
+
+    @property
+    def days(self) -> int | None:
+        if self.days_until is None:
+            return None
+        return (self.days_until - domain.clock.today()).days
+
+    @staticmethod
+    def from_todo(todo: domain.Todo, /) -> TodoDashRow:
+        return TodoDashRow.from_todos((todo,))[0]
+
+    @staticmethod
+    def from_todos(todos: typing.Iterable[domain.Todo], /) -> list[TodoDashRow]:
+        todos = tuple(todos)
+
+        today = domain.clock.today()
+
+        columns = domain.date_calc_batch.FrequencyColumns.from_frequencies(todo.frequency for todo in todos)
+
+        due_dates = domain.date_calc_batch.due_dates(columns=columns, ref_date=today)
+
+        should_display_flags = domain.date_calc_batch.should_display(
+            columns=columns,
+            last_completed=[todo.last_completed or todo.prior_completed for todo in todos],
+            ref_date=today,
+        )
+
+        return [
+            _row(todo=todo, due_date=due_date or datetime.date(1900, 1, 1), should_display=should_display, today=today)
+            for todo, due_date, should_display in zip(todos, due_dates, should_display_flags)
+        ]
+
+
+def _row(*, todo: domain.Todo, due_date: datetime.date, should_display: bool, today: datetime.date) -> TodoDashRow:
+    return TodoDashRow(
+        todo=todo,
+        todo_id=todo.todo_id,
+        description=todo.description,
+        note=todo.note,
+        due_date=due_date,
+        days_until=_days_until(todo=todo, due_date=due_date),
+        next_transition=domain.date_calc.next_transition(frequency=todo.frequency, ref_date=today),
+        should_display=should_display,
+        complete_button_text="Complete" if should_display else "Incomplete",
+        user=todo.user.display_name,
+        category=todo.category.name,
+        frequency=_render_frequency(frequency=todo.frequency),
+        completed=_render_completed(todo=todo),
+        date_added=todo.date_added,
+        date_updated=todo.date_updated,
+        search_text="\n".join((todo.description, todo.note, todo.category.name, todo.user.display_name)).lower(),
+    )
+
+
+def _days_until(*, todo: domain.Todo, due_date: datetime.date) -> datetime.date | None:
+    # mirrors domain.Todo.days
+    if todo.last_completed and todo.last_completed >= (
+        due_date - datetime.timedelta(days=todo.frequency.advance_display_days)
+    ):
+        if todo.frequency.name == domain.FrequencyType.Once:
+            return None
+
+        return domain.date_calc.next_date(frequency=todo.frequency, ref_date=due_date)
+
+    return due_date
+
+
+def _render_completed(*, todo: domain.Todo) -> str:
+    if todo.last_completed_by:
+        last_completed_by = todo.last_completed_by.display_name
+    else:
+        last_completed_by = ""
+
+    if todo.last_completed:
+        last_completed = f"{todo.last_completed:%m/%d/%Y}"
+    else:
+        last_completed = ""
+
+    if last_completed_by and last_completed:
+        return f"{last_completed_by}\n{last_completed}"
+
+    return f"{last_completed_by}{last_completed}"
+
+
+def _render_frequency(*, frequency: domain.Frequency) -> str:
+    return {
+        domain.FrequencyType.Daily: lambda: "Daily",
+        domain.FrequencyType.Easter: lambda: "Easter",
+        domain.FrequencyType.MemorialDay: lambda: "Memorial Day",
+        domain.FrequencyType.Irregular: lambda: "Irregular",
+        domain.FrequencyType.Monthly: lambda: f"Monthly ({frequency.month_day})",
+        domain.FrequencyType.Once: lambda: f"{frequency.due_date:%m/%d/%Y}",
+        domain.FrequencyType.Weekly: lambda: f"Weekly ({frequency.week_day.short_name})",  # type: ignore
+        domain.FrequencyType.XDays: lambda: f"XDays ({frequency.days})",
+        domain.FrequencyType.Yearly: (
+            lambda: f"Yearly ({frequency.month.to_int()}/{frequency.month_day})"  # type: ignore
+        ),
+    }[frequency.name]()
@@ -1,4 +1,5 @@
 import dataclasses
+import datetime
 
 from src import domain
 
@@ -8,10 +9,13 @@ __all__ = ("TodoDashState",)
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class TodoDashState:
     added_todo: domain.Todo | None = None
+    change_cursor: int | domain.Unspecified = domain.Unspecified()
+    changes: domain.TodoChanges | None = None
     category_filter: domain.Category | domain.Unspecified = domain.Unspecified()
     deleted_todo: domain.Todo | None = None
     description_filter: str | domain.Unspecified = domain.Unspecified()
     due_filter: bool | domain.Unspecified = domain.Unspecified()
+    next_appearance: datetime.date | None | domain.Unspecified = domain.Unspecified()
     selected_todo: domain.Todo | None | domain.Unspecified = domain.Unspecified()
     todos: tuple[domain.Todo, ...] | domain.Unspecified = domain.Unspecified()
     updated_todo: domain.Todo | None = None
@@ -1,3 +1,4 @@
+import datetime
 import typing
 
 from PyQt6 import QtCore as qtc, QtGui as qtg, QtWidgets as qtw  # noqa
@@ -8,11 +9,19 @@ from src.presentation.category_selector import CategorySelectorWidget
 from src.presentation.shared.theme import font, icons
 from src.presentation.shared.widgets import table_view, StatusBar, popup
 from src.presentation.todo.view.dash import requests
+from src.presentation.todo.view.dash.due_scheduler import DueScheduler
+from src.presentation.todo.view.dash.row import TodoDashRow
 from src.presentation.todo.view.dash.state import TodoDashState
 from src.presentation.user_selector import UserSelectorWidget
 
 __all__ = ("TodoDashView",)
 
+# scheduled alongside the rows for the day a todo that isn't loaded comes due, which takes a refresh to pick up
+_NEXT_APPEARANCE: typing.Final[str] = "next-appearance"
+
+# how long typing in the description filter has to pause before the rows are filtered again
+_DESCRIPTION_FILTER_DEBOUNCE_MS: typing.Final[int] = 150
+
 
 class TodoDashView(qtw.QWidget):
     def __init__(
@@ -31,6 +40,16 @@ class TodoDashView(qtw.QWidget):
         self._user_selector: typing.Final[UserSelectorWidget] = user_selector
         self._user_is_admin: typing.Final[bool] = user_is_admin
 
+        # what the todos on screen were loaded with, so later changes can be fetched on top of them
+        self._last_refresh_request: requests.RefreshRequest | None = None
+        self._last_refresh_date: datetime.date | None = None
+        self._change_cursor: int | None = None
+
+        # every row the last refresh loaded, the table shows the ones that match the description filter
+        self._loaded_rows: dict[str, TodoDashRow] = {}
+
+        self._due_scheduler: typing.Final[DueScheduler] = DueScheduler(parent=self)
+
         refresh_btn_icon = icons.refresh_btn_icon(parent=self)
         self._refresh_btn = qtw.QPushButton(refresh_btn_icon, "")
         # self._refresh_btn = qtw.QPushButton(refresh_btn_icon, "Refresh")
@@ -67,6 +86,10 @@ class TodoDashView(qtw.QWidget):
         self._description_filter_txt = qtw.QLineEdit("")
         self._description_filter_txt.setMaximumWidth(200)
 
+        self._description_filter_timer: typing.Final[qtc.QTimer] = qtc.QTimer(parent=self)
+        self._description_filter_timer.setSingleShot(True)
+        self._description_filter_timer.setInterval(_DESCRIPTION_FILTER_DEBOUNCE_MS)
+
         toolbar_layout.addSpacerItem(
             qtw.QSpacerItem(10, 0, qtw.QSizePolicy.Policy.Minimum, qtw.QSizePolicy.Policy.Minimum)
         )
@@ -80,11 +103,12 @@ class TodoDashView(qtw.QWidget):
         toolbar_layout.addWidget(self._description_filter_txt)
         toolbar_layout.addStretch()
 
-        attrs: tuple[table_view.Attr[domain.Todo, typing.Any], ...] = (
+        # every column reads a field of TodoDashRow, so painting doesn't recalculate any dates
+        attrs: tuple[table_view.Attr[TodoDashRow, typing.Any], ...] = (
             table_view.button(
                 name="complete",
                 button_text="Complete",
-                text_selector=lambda todo: "Complete" if todo.should_display() else "Incomplete",
+                text_selector=lambda row: row.complete_button_text,
                 width=font.BOLD_FONT_METRICS.boundingRect("  Incomplete  ").width(),
             ),
             table_view.text(
@@ -95,32 +119,28 @@ class TodoDashView(qtw.QWidget):
             table_view.date(
                 name="due_date",
                 display_name="Due Date",
-                value_selector=lambda todo: todo.due_date(),
             ),
             table_view.integer(
                 name="days",
                 display_name="Days",
                 width=font.BOLD_FONT_METRICS.boundingRect("  Days  ").width(),
-                value_selector=lambda todo: 0 if (d := todo.days()) is None else d,
-                text_color_selector=lambda todo: _days_color_selector(todo.days()),
+                value_selector=lambda row: 0 if row.days is None else row.days,
+                text_color_selector=lambda row: _days_color_selector(row.days),
             ),
             table_view.text(
                 name="user",
                 display_name="User",
-                value_selector=lambda todo: todo.user.display_name,
                 width=140,
                 alignment="center",
             ),
             table_view.text(
                 name="category",
                 display_name="Category",
-                value_selector=lambda todo: todo.category.name,
                 alignment="center",
             ),
             table_view.text(
                 name="frequency",
                 display_name="Frequency",
-                value_selector=lambda todo: _render_frequency(frequency=todo.frequency),
                 alignment="center",
                 width=font.BOLD_FONT_METRICS.boundingRect("  Frequency  ").width(),
             ),
@@ -132,7 +152,6 @@ class TodoDashView(qtw.QWidget):
             table_view.text(
                 name="completed",
                 display_name="Completed",
-                value_selector=_complete_value_selector,  # type: ignore
                 alignment="center",
             ),
             table_view.date(
@@ -163,12 +182,13 @@ class TodoDashView(qtw.QWidget):
                 ),
             )
 
-        self._table: table_view.TableView[domain.Todo, str] = table_view.TableView(
+        self._table: table_view.TableView[TodoDashRow, str] = table_view.TableView(
             attrs=attrs,
             key_attr_name="todo_id",
             parent=self,
             normal_font=font.DEFAULT_FONT,
             bold_font=font.BOLD_FONT,
+            size_rows_lazily=True,
         )
 
         self._status_bar: typing.Final[StatusBar] = StatusBar(parent=self)
@@ -180,6 +200,11 @@ class TodoDashView(qtw.QWidget):
         self.setLayout(layout)
 
         self._table.button_clicked.connect(self._on_button_clicked)
+        self._due_scheduler.due.connect(self._on_rows_due)
+        self._due_scheduler.day_changed.connect(self._on_day_changed)
+        self._description_filter_txt.textChanged.connect(self._description_filter_timer.start)
+        # noinspection PyUnresolvedReferences
+        self._description_filter_timer.timeout.connect(self._on_description_filter_changed)
         # noinspection PyUnresolvedReferences
         self._refresh_btn.clicked.connect(self._on_refresh_btn_clicked)
         self._category_selector.item_selected.connect(self._refresh_btn.click)
@@ -193,8 +218,9 @@ class TodoDashView(qtw.QWidget):
             description_filter=self._description_filter_txt.text(),
             category_filter=self._category_selector.selected_item(),
             user_filter=self._user_selector.get_selected_item(),
-            selected_todo=self._table.selected_item,
-            todos=tuple(self._table.items),
+            selected_todo=selected_row.todo if (selected_row := self._table.selected_item) else None,
+            todos=tuple(row.todo for row in self._table.items),
+            change_cursor=domain.Unspecified() if self._change_cursor is None else self._change_cursor,
             added_todo=None,
             updated_todo=None,
             deleted_todo=None,
@@ -219,13 +245,29 @@ class TodoDashView(qtw.QWidget):
                 self._description_filter_txt.setText(state.description_filter)
 
             if not isinstance(state.todos, domain.Unspecified):
-                self._table.set_items(state.todos)
+                rows = TodoDashRow.from_todos(state.todos)
+
+                self._loaded_rows = {row.todo_id: row for row in rows}
+                self._show_matching_rows()
+
+                self._due_scheduler.clear()
+                self._due_scheduler.schedule((row.todo_id, row.next_transition) for row in rows)
+
+            if not isinstance(state.next_appearance, domain.Unspecified):
+                self._due_scheduler.schedule(((_NEXT_APPEARANCE, state.next_appearance),))
+
+            if state.changes is not None:
+                self._merge_changes(state.changes)
+
+            if isinstance(state.change_cursor, int):
+                self._change_cursor = state.change_cursor
 
             if state.deleted_todo:
-                self._table.delete_item(key=state.deleted_todo.todo_id)
+                self._remove_row(state.deleted_todo.todo_id)
+                self._due_scheduler.unschedule((state.deleted_todo.todo_id,))
 
             if state.added_todo or state.updated_todo:
-                self.refresh()
+                self.sync()
 
             if isinstance(state.selected_todo, domain.Todo):
                 self._table.select_item_by_key(key=state.selected_todo.todo_id)
@@ -242,65 +284,166 @@ class TodoDashView(qtw.QWidget):
 
             self._status_bar.set_status(str(e))
 
+    def on_todos_changed(self, /, change_cursor: int) -> None:
+        """Sync unless the todos on screen already include every change up to change_cursor.
+
+        While a refresh is in flight there is no cursor yet, and the refresh will pick the changes up anyway.
+        """
+        if self._change_cursor is None or change_cursor <= self._change_cursor:
+            return None
+
+        self.sync()
+
+    def sync(self) -> None:
+        """Fetch only the todos that changed since the last refresh, falling back to a full refresh.
+
+        The display windows behind the due filter move when the date changes without any todo being written, so a new
+        day always gets a full refresh.
+        """
+        if (
+            self._change_cursor is None
+            or self._last_refresh_request is None
+            or self._last_refresh_date != domain.clock.today()
+        ):
+            self.refresh()
+            return None
+
+        self._requests.sync.emit(
+            requests.SyncRequest(cursor=self._change_cursor, refresh_request=self._last_refresh_request)
+        )
+
+    def _merge_changes(self, /, changes: domain.TodoChanges) -> None:
+        for todo_id in changes.deleted_todo_ids:
+            self._remove_row(todo_id)
+
+        self._due_scheduler.unschedule(changes.deleted_todo_ids)
+
+        rows = TodoDashRow.from_todos(changes.upserted)
+        for row in rows:
+            self._upsert_row(row)
+
+        self._due_scheduler.schedule((row.todo_id, row.next_transition) for row in rows)
+
     def _on_add_btn_clicked(self, /, _: bool) -> None:
         logger.debug(f"{self.__class__.__name__}.on_add_btn_clicked()")
         if self._user_is_admin:
             self._requests.add.emit()
 
-    def _on_button_clicked(self, /, event: table_view.ButtonClickedEvent[domain.Todo, typing.Any]) -> None:
+    def _on_button_clicked(self, /, event: table_view.ButtonClickedEvent[TodoDashRow, typing.Any]) -> None:
         logger.debug(f"{self.__class__.__name__}._on_button_clicked({event=!r})")
 
         match event.attr.name:
             case "delete":
                 if self._user_is_admin:
                     if popup.confirm(question=f'Are you sure you want to delete "{event.item.description}"?'):
-                        request = requests.DeleteTodo(todo=event.item)
+                        request = requests.DeleteTodo(todo=event.item.todo)
 
                         self._requests.delete.emit(request)
             case "edit":
                 if self._user_is_admin:
-                    self._requests.edit.emit(requests.EditTodo(todo=event.item))
+                    self._requests.edit.emit(requests.EditTodo(todo=event.item.todo))
             case "complete":
-                self._requests.toggle_completed.emit(requests.ToggleCompleted(todo=event.item))
+                self._requests.toggle_completed.emit(requests.ToggleCompleted(todo=event.item.todo))
             case _:
                 logger.error(f"attr name, {event.attr.name!r}, not recognized.")
 
-    def _on_double_click(self, /, event: table_view.DoubleClickedEvent[domain.Todo, typing.Any]) -> None:
+    def _on_double_click(self, /, event: table_view.DoubleClickedEvent[TodoDashRow, typing.Any]) -> None:
         logger.debug(f"{self.__class__.__name__}._on_button_clicked({event=!r})")
 
         if self._user_is_admin:
-            edit_request = requests.EditTodo(todo=event.item)
+            edit_request = requests.EditTodo(todo=event.item.todo)
 
             self._requests.edit.emit(edit_request)
 
+    def _on_rows_due(self, /, todo_ids: tuple[str, ...]) -> None:
+        """Work out again the rows whose display state changes today, dropping the ones the due filter now hides."""
+        logger.debug(f"{self.__class__.__name__}._on_rows_due({len(todo_ids)} todo_ids)")
+
+        # only the database knows which of the todos that aren't loaded have come due
+        if _NEXT_APPEARANCE in todo_ids:
+            self.refresh()
+            return None
+
+        is_due_filtered = self._last_refresh_request is not None and self._last_refresh_request.is_due
+
+        due_rows = [row for todo_id in todo_ids if (row := self._loaded_rows.get(todo_id)) is not None]
+
+        for row in TodoDashRow.from_todos(row.todo for row in due_rows):
+            if is_due_filtered and not row.should_display:
+                self._remove_row(row.todo_id)
+            else:
+                self._upsert_row(row)
+                self._due_scheduler.schedule(((row.todo_id, row.next_transition),))
+
+    def _on_day_changed(self, /, today: datetime.date) -> None:
+        logger.debug(f"{self.__class__.__name__}._on_day_changed({today=!r})")
+
+        # the due filter reads the persisted display windows, which only move when they are refreshed
+        self._requests.refresh_display_windows.emit()
+
+        # the Days column counts down to each row's due date, so every cached rendering of it is a day out
+        self._table.clear_render_cache()
+
+    def _on_description_filter_changed(self) -> None:
+        """Filter the loaded rows again, or search the database when they aren't every todo the filter could match.
+
+        Without the due filter a refresh loads every todo the category and user filters match, so the description
+        filter only has to be applied to the loaded rows. With it only the todos that are due now are loaded, so the
+        description is searched for in the database instead.
+        """
+        logger.debug(f"{self.__class__.__name__}._on_description_filter_changed()")
+
+        if self._last_refresh_request is None or self._last_refresh_request.is_due:
+            self.refresh()
+            return None
+
+        # a refresh in flight filters its rows when they arrive
+        if self._change_cursor is None:
+            return None
+
+        self._show_matching_rows()
+
     def _on_refresh_btn_clicked(self, /, _: bool) -> None:
         logger.debug(f"{self.__class__.__name__}._on_refresh_btn_clicked()")
 
+        # without the due filter every row the other filters match is loaded, and the description filter is applied
+        # to them afterwards
+        is_due = self._due_chk.isChecked()
         request = requests.RefreshRequest(
-            is_due=self._due_chk.isChecked(),
-            description=self._description_filter_txt.text(),
+            is_due=is_due,
+            description=self._description_filter_txt.text().strip() if is_due else "",
             category=self._category_selector.selected_item(),
             user=self._user_selector.get_selected_item(),
         )
 
+        self._last_refresh_request = request
+        self._last_refresh_date = domain.clock.today()
+        self._change_cursor = None
+
         self._requests.refresh.emit(request)
 
+    def _remove_row(self, /, todo_id: str) -> None:
+        self._loaded_rows.pop(todo_id, None)
+
+        if self._table.get_item(key=todo_id) is not None:
+            self._table.delete_item(key=todo_id)
 
-def _complete_value_selector(todo: domain.Todo, /) -> str:
-    if todo.last_completed_by:
-        last_completed_by = todo.last_completed_by.display_name
-    else:
-        last_completed_by = ""
+    def _show_matching_rows(self) -> None:
+        search_text = self._description_filter_txt.text().strip().lower()
 
-    if todo.last_completed:
-        last_completed = f"{todo.last_completed:%m/%d/%Y}"
-    else:
-        last_completed = ""
+        self._table.set_items(row for row in self._loaded_rows.values() if search_text in row.search_text)
 
-    if last_completed and last_completed:
-        return f"{last_completed_by}\n{last_completed}"
+    def _upsert_row(self, /, row: TodoDashRow) -> None:
+        self._loaded_rows[row.todo_id] = row
 
-    return f"{last_completed_by}{last_completed}"
+        is_shown = self._table.get_item(key=row.todo_id) is not None
+        if self._description_filter_txt.text().strip().lower() in row.search_text:
+            if is_shown:
+                self._table.update_item(row)
+            else:
+                self._table.add_item(row)
+        elif is_shown:
+            self._table.delete_item(key=row.todo_id)
 
 
 def _days_color_selector(days: int | None, /) -> qtg.QColor | None:
@@ -316,22 +459,6 @@ def _days_color_selector(days: int | None, /) -> qtg.QColor | None:
     return None
 
 
-def _render_frequency(*, frequency: domain.Frequency) -> str:
-    return {
-        domain.FrequencyType.Daily: lambda: "Daily",
-        domain.FrequencyType.Easter: lambda: "Easter",
-        domain.FrequencyType.MemorialDay: lambda: "Memorial Day",
-        domain.FrequencyType.Irregular: lambda: "Irregular",
-        domain.FrequencyType.Monthly: lambda: f"Monthly ({frequency.month_day})",
-        domain.FrequencyType.Once: lambda: f"{frequency.due_date:%m/%d/%Y}",
-        domain.FrequencyType.Weekly: lambda: f"Weekly ({frequency.week_day.short_name})",  # type: ignore
-        domain.FrequencyType.XDays: lambda: f"XDays ({frequency.days})",
-        domain.FrequencyType.Yearly: (
-            lambda: f"Yearly ({frequency.month.to_int()}/{frequency.month_day})"  # type: ignore
-        ),
-    }[frequency.name]()
-
-
 # def _render_last_completed(
 #     *,
 #     last_completed: datetime.date | None,
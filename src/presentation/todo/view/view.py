@@ -58,6 +58,9 @@ class TodoView(qtw.QWidget):
     def refresh_dash(self) -> None:
         self.dash.refresh()
 
+    def on_todos_changed(self, /, change_cursor: int) -> None:
+        self.dash.on_todos_changed(change_cursor)
+
     def get_state(self) -> TodoState | domain.Error:
         try:
             dash_state = self.dash.get_state()
@@ -4,6 +4,7 @@ from PyQt6 import QtCore as qtc, QtGui as qtg, QtWidgets as qtw  # noqa
 
 from src import domain
 from src.presentation.category_selector import CategorySelectorWidget
+from src.presentation.todo.change_watcher import TodoChangeWatcher
 from src.presentation.todo.controller import TodoController
 from src.presentation.todo.view.dash.requests import TodoDashRequests
 from src.presentation.todo.view.form.requests import TodoFormRequests
@@ -83,6 +84,25 @@ class TodoWidget(qtw.QWidget):
         layout.addWidget(self._view)
         self.setLayout(layout)
 
+        self._change_watcher_thread = qtc.QThread(parent=self)
+
+        self._change_watcher: typing.Final[TodoChangeWatcher] = TodoChangeWatcher(todo_service=todo_service)
+        self._change_watcher.moveToThread(self._change_watcher_thread)
+
+        # a burst of writes from other clients is merged into one sync, at most one every half second
+        self._sync_timer = qtc.QTimer(parent=self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(500)
+
+        self._latest_change_cursor = 0
+
+        self._change_watcher_thread.started.connect(self._change_watcher.run)
+        self._change_watcher.changed.connect(self._on_todos_changed)
+        self._sync_timer.timeout.connect(self._on_sync_timer_timeout)
+
+        if app := qtw.QApplication.instance():
+            app.aboutToQuit.connect(self._stop_change_watcher)
+
     def current_view(self) -> typing.Literal["dash", "form"]:
         return self._view.current_view()
 
@@ -91,6 +111,7 @@ class TodoWidget(qtw.QWidget):
         self.refresh_users()
         self._dash_user_selector.select_item(self._current_user)
         self.refresh_dash()
+        self._change_watcher_thread.start()
 
     def refresh_categories(self) -> None:
         self._dash_category_selector.refresh()
@@ -105,3 +126,17 @@ class TodoWidget(qtw.QWidget):
 
     def save_form(self) -> None:
         self._view.save_form()
+
+    def _on_todos_changed(self, /, change_cursor: int) -> None:
+        self._latest_change_cursor = max(self._latest_change_cursor, change_cursor)
+
+        if not self._sync_timer.isActive():
+            self._sync_timer.start()
+
+    def _on_sync_timer_timeout(self) -> None:
+        self._view.on_todos_changed(self._latest_change_cursor)
+
+    def _stop_change_watcher(self) -> None:
+        self._change_watcher.stop()
+        self._change_watcher_thread.quit()
+        self._change_watcher_thread.wait()
@@ -2,6 +2,7 @@ import typing
 
 from PyQt6 import QtCore as qtc, QtGui as qtg, QtWidgets as qtw  # noqa
 
+from src.presentation.agenda.widget import AgendaWidget
 from src.presentation.category.widget import CategoryWidget
 from src.presentation.todo.widget import TodoWidget
 from src.presentation.user.widget import UserWidget
@@ -14,6 +15,7 @@ class MainView(qtw.QWidget):
         self,
         *,
         user_is_admin: bool,
+        agenda_widget: AgendaWidget,
         category_widget: CategoryWidget,
         todo_widget: TodoWidget,
         user_widget: UserWidget,
@@ -21,18 +23,20 @@ class MainView(qtw.QWidget):
         super().__init__()
 
         self._todos: typing.Final[TodoWidget] = todo_widget
+        self._agenda: typing.Final[AgendaWidget] = agenda_widget
+        self._categories: typing.Final[CategoryWidget] = category_widget
+        self._users: typing.Final[UserWidget] = user_widget
 
         self._tabs: typing.Final[qtw.QTabWidget] = qtw.QTabWidget()
         self._tabs.addTab(self._todos, "Todo")
+        self._tabs.addTab(self._agenda, "Agenda")
 
         if user_is_admin:
-            self._categories: typing.Final[CategoryWidget] = category_widget
-            self._users: typing.Final[UserWidget] = user_widget
-
             self._tabs.addTab(self._categories, "Category")
             self._tabs.addTab(self._users, "Users")
-            # noinspection PyUnresolvedReferences
-            self._tabs.currentChanged.connect(self._on_tab_changed)
+
+        # noinspection PyUnresolvedReferences
+        self._tabs.currentChanged.connect(self._on_tab_changed)
 
         layout = qtw.QVBoxLayout()
         layout.addWidget(self._tabs)
@@ -42,40 +46,46 @@ class MainView(qtw.QWidget):
         # noinspection PyUnresolvedReferences
         self.enter_key_shortcut.activated.connect(self._on_enter_key_pressed)
 
-        self._tabs_loaded: set[int] = set()
+        self._tabs_loaded: set[qtw.QWidget] = set()
 
     def on_load(self) -> None:
         self._todos.on_load()
-        self._tabs_loaded.add(0)
+        self._tabs_loaded.add(self._todos)
 
     def _on_enter_key_pressed(self) -> None:
-        if (ix := self._tabs.currentIndex()) == 0:
+        if (tab := self._tabs.currentWidget()) is self._todos:
             if self._todos.current_view() == "dash":
                 self._todos.refresh_dash()
             else:
                 self._todos.save_form()
-        elif ix == 1:
+        elif tab is self._agenda:
+            self._agenda.refresh()
+        elif tab is self._categories:
             if self._categories.current_view() == "dash":
                 self._categories.refresh_dash()
             else:
                 self._categories.save_form()
-        elif ix == 2:
+        elif tab is self._users:
             if self._users.current_view() == "dash":
                 self._users.refresh_dash()
             else:
                 self._users.save_form()
         else:
-            raise Exception(f"Unrecognized tab index: {ix}.")
+            raise Exception(f"Unrecognized tab: {tab!r}.")
 
     def _on_tab_changed(self) -> None:
-        current_tab = self._tabs.currentIndex()
-        if current_tab in self._tabs_loaded:
+        current_tab = self._tabs.currentWidget()
+        if current_tab is None or current_tab in self._tabs_loaded:
             return None
 
-        if current_tab == 0:
+        self._tabs_loaded.add(current_tab)
+
+        if current_tab is self._todos:
             if self._todos.current_view() == "dash":
                 self._todos.refresh_dash()
-        elif current_tab == 1:
+        elif current_tab is self._agenda:
+            self._agenda.on_load()
+        elif current_tab is self._categories:
             if self._categories.current_view() == "dash":
                 self._categories.refresh_dash()
         else:
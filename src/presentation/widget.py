@@ -3,6 +3,7 @@ from PyQt6 import QtGui as qtg, QtWidgets as qtw
 from loguru import logger
 
 from src import domain
+from src.presentation.agenda.widget import AgendaWidget
 from src.presentation.category.widget import CategoryWidget
 from src.presentation.todo.widget import TodoWidget
 from src.presentation.user.widget import UserWidget
@@ -51,6 +52,14 @@ class MainWidget(qtw.QMainWindow):
             parent=self,
         )
 
+        self._agenda_widget = AgendaWidget(
+            category_service=category_service,
+            todo_service=todo_service,
+            user_service=user_service,
+            current_user=current_user,
+            parent=self,
+        )
+
         self._user_widget = UserWidget(
             user_is_admin=user_is_admin,
             user_service=user_service,
@@ -59,6 +68,7 @@ class MainWidget(qtw.QMainWindow):
 
         self._view = MainView(
             user_is_admin=user_is_admin,
+            agenda_widget=self._agenda_widget,
             category_widget=self._category_widget,
             todo_widget=self._todo_widget,
             user_widget=self._user_widget,
@@ -76,8 +86,10 @@ class MainWidget(qtw.QMainWindow):
         logger.debug(f"{self.__class__.__name__}._on_category_widget_categories_updated()")
 
         self._todo_widget.refresh_categories()
+        self._agenda_widget.refresh_categories()
 
     def _on_users_widget_users_updated(self) -> None:
         logger.debug(f"{self.__class__.__name__}._on_users_widget_users_updated()")
 
         self._todo_widget.refresh_users()
+        self._agenda_widget.refresh_users()
@@ -28,13 +28,15 @@ class CategoryService(domain.CategoryService):
                 if isinstance(add_result, domain.Error):
                     return add_result
 
+            adapter.lookup_cache.invalidate_categories(schema=self._schema, engine=self._engine)
+
             return None
         except Exception as e:
             return domain.Error.new(str(e), category=category)
 
     def add_default_categories(self) -> None | domain.Error:
         with self._engine.begin() as con:
-            categories = adapter.category_repo.where(
+            categories = adapter.lookup_cache.categories(
                 schema=self._schema,
                 con=con,
                 active=False,
@@ -52,12 +54,14 @@ class CategoryService(domain.CategoryService):
                     if isinstance(add_result, domain.Error):
                         return add_result
 
+        adapter.lookup_cache.invalidate_categories(schema=self._schema, engine=self._engine)
+
         return None
 
     def all(self) -> list[domain.Category] | domain.Error:
         try:
             with self._engine.begin() as con:
-                return adapter.category_repo.where(
+                return adapter.lookup_cache.categories(
                     schema=self._schema,
                     con=con,
                     active=True,
@@ -86,6 +90,7 @@ class CategoryService(domain.CategoryService):
                     user_id=domain.Unspecified(),
                     description_like=domain.Unspecified(),
                     template_todo_id=domain.Unspecified(),
+                    due_on=domain.Unspecified(),
                 )
                 if isinstance(matching_todos, domain.Error):
                     return matching_todos
@@ -104,7 +109,9 @@ class CategoryService(domain.CategoryService):
                 if isinstance(delete_result, domain.Error):
                     return delete_result
 
-                return None
+            adapter.lookup_cache.invalidate_categories(schema=self._schema, engine=self._engine)
+
+            return None
         except Exception as e:
             return domain.Error.new(str(e), category_id=category_id)
 
@@ -130,6 +137,8 @@ class CategoryService(domain.CategoryService):
                 if isinstance(update_result, domain.Error):
                     return update_result
 
+            adapter.lookup_cache.invalidate_categories(schema=self._schema, engine=self._engine)
+
             return None
         except Exception as e:
             return domain.Error.new(str(e), category=category)
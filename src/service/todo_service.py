@@ -1,5 +1,6 @@
 import dataclasses
 import datetime
+import time
 import typing
 
 import sqlalchemy as sa
@@ -9,6 +10,9 @@ from src import adapter, domain
 
 __all__ = ("TodoService",)
 
+# how often wait_for_changes reads the change counter where the database can't announce writes
+_POLL_INTERVAL_SECONDS = 1.0
+
 
 class TodoService(domain.TodoService):
     def __init__(
@@ -22,6 +26,10 @@ class TodoService(domain.TodoService):
         self._engine: typing.Final[sa.engine.Engine] = engine
         self._username: typing.Final[str] = username
 
+        self._change_listener: adapter.todo_change_listener.TodoChangeListener | None = None
+        if engine.dialect.name == "postgresql":
+            self._change_listener = adapter.todo_change_listener.TodoChangeListener(schema=schema, engine=engine)
+
     def add(self, *, todo: domain.Todo) -> None | domain.Error:
         try:
             with self._engine.begin() as con:
@@ -35,6 +43,71 @@ class TodoService(domain.TodoService):
 
             return domain.Error.new(str(e), todo=todo)
 
+    def add_many(self, *, todos: typing.Iterable[domain.Todo], chunk_size: int = 500) -> None | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.add_many(
+                    schema=self._schema,
+                    con=con,
+                    todos=todos,
+                    chunk_size=chunk_size,
+                )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.add_many(..., {chunk_size=!r}) failed: {e!s}")
+
+            return domain.Error.new(str(e), chunk_size=chunk_size)
+
+    def change_cursor(self) -> int | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.change_cursor(schema=self._schema, con=con)
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.change_cursor() failed: {e!s}")
+
+            return domain.Error.new(str(e))
+
+    def changes_since(
+        self,
+        *,
+        cursor: int,
+        due_filter: bool | domain.Unspecified,
+        description_like: str | domain.Unspecified,
+        category_id_filter: str | domain.Unspecified,
+        user_id_filter: str | domain.Unspecified,
+    ) -> domain.TodoChanges | domain.Error:
+        try:
+            today = domain.clock.today()
+
+            # refresh_display_windows doesn't bump the change sequence, callers reload fully when the date changes
+            due_on: datetime.date | domain.Unspecified = today if due_filter else domain.Unspecified()
+
+            with self._engine.begin() as con:
+                changes = adapter.todo_repo.changes_since(
+                    schema=self._schema,
+                    con=con,
+                    cursor=cursor,
+                    category_id=category_id_filter,
+                    user_id=user_id_filter,
+                    description_like=description_like,
+                    due_on=due_on,
+                )
+
+            return changes
+        except Exception as e:
+            logger.error(
+                f"{self.__class__.__name__}.changes_since({cursor=!r}, {due_filter=!r}, {description_like=!r}, "
+                f"{category_id_filter=!r}, {user_id_filter=!r}) failed: {e!s}"
+            )
+
+            return domain.Error.new(
+                str(e),
+                cursor=cursor,
+                due_filter=due_filter,
+                description_like=description_like,
+                category_id_filter=category_id_filter,
+                user_id_filter=user_id_filter,
+            )
+
     # def add_default_holidays_for_all_users(self) -> None | domain.Error:
     #     try:
     #         with self._engine.begin() as con:
@@ -80,6 +153,44 @@ class TodoService(domain.TodoService):
     #     except Exception as e:
     #         return domain.Error.new(str(e))
 
+    def completion_history(self, *, todo_id: str) -> list[domain.TodoCompletion] | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_completion_repo.history(schema=self._schema, con=con, todo_id=todo_id)
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.completion_history({todo_id=!r}) failed: {e!s}")
+
+            return domain.Error.new(str(e), todo_id=todo_id)
+
+    def completions(
+        self,
+        *,
+        user_id_filter: str | domain.Unspecified,
+        completed_from: datetime.date,
+        completed_to: datetime.date,
+    ) -> list[domain.TodoCompletion] | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_completion_repo.where(
+                    schema=self._schema,
+                    con=con,
+                    user_id=user_id_filter,
+                    completed_from=completed_from,
+                    completed_to=completed_to,
+                )
+        except Exception as e:
+            logger.error(
+                f"{self.__class__.__name__}.completions({user_id_filter=!r}, {completed_from=!r}, "
+                f"{completed_to=!r}) failed: {e!s}"
+            )
+
+            return domain.Error.new(
+                str(e),
+                user_id_filter=user_id_filter,
+                completed_from=completed_from,
+                completed_to=completed_to,
+            )
+
     def delete(self, *, todo_id: str) -> None | domain.Error:
         try:
             with self._engine.begin() as con:
@@ -93,6 +204,20 @@ class TodoService(domain.TodoService):
 
             return domain.Error.new(str(e), todo_id=todo_id)
 
+    def delete_many(self, *, todo_ids: typing.Iterable[str], chunk_size: int = 500) -> None | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.delete_many(
+                    schema=self._schema,
+                    con=con,
+                    todo_ids=todo_ids,
+                    chunk_size=chunk_size,
+                )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.delete_many(..., {chunk_size=!r}) failed: {e!s}")
+
+            return domain.Error.new(str(e), chunk_size=chunk_size)
+
     def get(self, *, todo_id: str) -> domain.Todo | None | domain.Error:
         try:
             with self._engine.begin() as con:
@@ -106,6 +231,19 @@ class TodoService(domain.TodoService):
 
             return domain.Error.new(str(e), todo_id=todo_id)
 
+    def get_many(self, *, todo_ids: typing.Iterable[str]) -> list[domain.Todo] | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.get_many(
+                    schema=self._schema,
+                    con=con,
+                    todo_ids=todo_ids,
+                )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.get_many(...) failed: {e!s}")
+
+            return domain.Error.new(str(e))
+
     def get_by_template_id_and_user_id(
         self,
         *,
@@ -121,6 +259,7 @@ class TodoService(domain.TodoService):
                     user_id=user_id,
                     description_like=domain.Unspecified(),
                     template_todo_id=template_todo_id,
+                    due_on=domain.Unspecified(),
                 )
                 if isinstance(todos, domain.Error):
                     return todos
@@ -150,43 +289,37 @@ class TodoService(domain.TodoService):
     ) -> None | domain.Error:
         try:
             with self._engine.begin() as con:
-                todo = adapter.todo_repo.get(
+                return adapter.todo_repo.mark_complete(
                     schema=self._schema,
                     con=con,
                     todo_id=todo_id,
+                    completed_by_user_id=None if user is None else user.user_id,
+                    completed_on=domain.clock.today(),
                 )
-                if isinstance(todo, domain.Error):
-                    return todo
-
-                if todo is None:
-                    return None
-
-                if todo.last_completed:
-                    prior_completed = todo.last_completed
-                    prior_completed_by = todo.last_completed_by
-                else:
-                    prior_completed = None
-                    prior_completed_by = None
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.mark_complete({todo_id=!r}, {user=!r}) failed: {e!s}")
 
-                updated_todo = dataclasses.replace(
-                    todo,
-                    last_completed=datetime.date.today(),
-                    prior_completed=prior_completed,
-                    last_completed_by=user,
-                    prior_completed_by=prior_completed_by,
-                )
+            return domain.Error.new(str(e), todo_id=todo_id, user=user)
 
-                adapter.todo_repo.update(
+    def mark_complete_many(
+        self,
+        *,
+        todo_ids: typing.Iterable[str],
+        user: domain.User | None,
+    ) -> None | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.mark_complete_many(
                     schema=self._schema,
                     con=con,
-                    todo=updated_todo,
+                    todo_ids=todo_ids,
+                    completed_by_user_id=None if user is None else user.user_id,
+                    completed_on=domain.clock.today(),
                 )
-
-            return None
         except Exception as e:
-            logger.error(f"{self.__class__.__name__}.mark_complete({todo_id=!r}, {user=!r}) failed: {e!s}")
+            logger.error(f"{self.__class__.__name__}.mark_complete_many(..., {user=!r}) failed: {e!s}")
 
-            return domain.Error.new(str(e), todo_id=todo_id, user=user)
+            return domain.Error.new(str(e), user=user)
 
     def where(
         self,
@@ -197,32 +330,27 @@ class TodoService(domain.TodoService):
         user_id_filter: str | domain.Unspecified,
     ) -> list[domain.Todo] | domain.Error:
         try:
+            today = domain.clock.today()
+
             with self._engine.begin() as con:
-                todos: typing.Iterable[domain.Todo] | domain.Error = adapter.todo_repo.where(
+                # consume the stream while the connection is open
+                todos: list[domain.Todo] = []
+                for todo in adapter.todo_repo.iter_where(
                     schema=self._schema,
                     con=con,
                     category_id=category_id_filter,
                     user_id=user_id_filter,
                     description_like=description_like,
                     template_todo_id=domain.Unspecified(),
-                )
-                if isinstance(todos, domain.Error):
-                    return todos
+                    due_on=today if due_filter else domain.Unspecified(),
+                    occurs_between=domain.Unspecified(),
+                ):
+                    if isinstance(todo, domain.Error):
+                        return todo
 
-            if due_filter:
-                todos = (todo for todo in todos if todo.should_display())
-
-            today = datetime.date.today()
-            return sorted(
-                todos,
-                key=(
-                    lambda todo: domain.date_calc.due_date(
-                        frequency=todo.frequency,
-                        ref_date=today,
-                    )
-                    or datetime.date(1900, 1, 1)
-                ),
-            )
+                    todos.append(todo)
+
+            return todos
         except Exception as e:
             logger.error(
                 f"{self.__class__.__name__}.where({due_filter=!r}, {description_like=!r}, {category_id_filter=!r}, "
@@ -240,41 +368,165 @@ class TodoService(domain.TodoService):
     def mark_incomplete(self, *, todo_id: str) -> None | domain.Error:
         try:
             with self._engine.begin() as con:
-                todo = adapter.todo_repo.get(
+                return adapter.todo_repo.mark_incomplete(
                     schema=self._schema,
                     con=con,
                     todo_id=todo_id,
                 )
-                if isinstance(todo, domain.Error):
-                    return todo
-
-                if todo is None:
-                    return None
-
-                if todo.last_completed is not None:
-                    if todo.prior_completed:
-                        last_completed: datetime.date | None = todo.prior_completed
-                    else:
-                        last_completed = None
-
-                    updated_todo = dataclasses.replace(
-                        todo,
-                        last_completed=last_completed,
-                        prior_completed=None,
-                    )
-
-                    return adapter.todo_repo.update(
-                        schema=self._schema,
-                        con=con,
-                        todo=updated_todo,
-                    )
-
-            return None
         except Exception as e:
             logger.error(f"{self.__class__.__name__}.mark_incomplete({todo_id=!r}) failed: {e!s}")
 
             return domain.Error.new(str(e), todo_id=todo_id)
 
+    def mark_incomplete_many(self, *, todo_ids: typing.Iterable[str]) -> None | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.mark_incomplete_many(
+                    schema=self._schema,
+                    con=con,
+                    todo_ids=todo_ids,
+                )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.mark_incomplete_many(...) failed: {e!s}")
+
+            return domain.Error.new(str(e))
+
+    def next_appearance(
+        self,
+        *,
+        description_like: str | domain.Unspecified,
+        category_id_filter: str | domain.Unspecified,
+        user_id_filter: str | domain.Unspecified,
+    ) -> datetime.date | None | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.next_appearance(
+                    schema=self._schema,
+                    con=con,
+                    category_id=category_id_filter,
+                    user_id=user_id_filter,
+                    description_like=description_like,
+                    ref_date=domain.clock.today(),
+                )
+        except Exception as e:
+            logger.error(
+                f"{self.__class__.__name__}.next_appearance({description_like=!r}, {category_id_filter=!r}, "
+                f"{user_id_filter=!r}) failed: {e!s}"
+            )
+
+            return domain.Error.new(
+                str(e),
+                description_like=description_like,
+                category_id_filter=category_id_filter,
+                user_id_filter=user_id_filter,
+            )
+
+    def occurring_between(
+        self,
+        *,
+        start: datetime.date,
+        end: datetime.date,
+        category_id_filter: str | domain.Unspecified,
+        user_id_filter: str | domain.Unspecified,
+    ) -> list[domain.Todo] | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                # consume the stream while the connection is open
+                todos: list[domain.Todo] = []
+                for todo in adapter.todo_repo.iter_where(
+                    schema=self._schema,
+                    con=con,
+                    category_id=category_id_filter,
+                    user_id=user_id_filter,
+                    description_like=domain.Unspecified(),
+                    template_todo_id=domain.Unspecified(),
+                    due_on=domain.Unspecified(),
+                    occurs_between=(start, end),
+                ):
+                    if isinstance(todo, domain.Error):
+                        return todo
+
+                    todos.append(todo)
+
+            return todos
+        except Exception as e:
+            logger.error(
+                f"{self.__class__.__name__}.occurring_between({start=!r}, {end=!r}, {category_id_filter=!r}, "
+                f"{user_id_filter=!r}) failed: {e!s}"
+            )
+
+            return domain.Error.new(
+                str(e),
+                start=start,
+                end=end,
+                category_id_filter=category_id_filter,
+                user_id_filter=user_id_filter,
+            )
+
+    def refresh_display_windows(self) -> None | domain.Error:
+        try:
+            today = domain.clock.today()
+
+            with self._engine.begin() as con:
+                refresh_result = adapter.todo_repo.refresh_display_windows(
+                    schema=self._schema,
+                    con=con,
+                    ref_date=today,
+                )
+                if isinstance(refresh_result, domain.Error):
+                    return refresh_result
+
+            logger.debug(f"{self.__class__.__name__} refreshed {refresh_result} display windows as of {today}.")
+
+            return None
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.refresh_display_windows() failed: {e!s}")
+
+            return domain.Error.new(str(e))
+
+    def save(self, *, todo: domain.Todo) -> domain.Todo | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                return adapter.todo_repo.save(
+                    schema=self._schema,
+                    con=con,
+                    todo=todo,
+                )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.save({todo=!r}) failed: {e!s}")
+
+            return domain.Error.new(str(e), todo=todo)
+
+    def wait_for_changes(self, *, cursor: int, timeout_seconds: float) -> int | domain.Error:
+        try:
+            deadline = time.monotonic() + timeout_seconds
+
+            if self._change_listener is not None:
+                # listen before reading the counter, so a write in between is still announced
+                open_result = self._change_listener.open()
+                if isinstance(open_result, domain.Error):
+                    return open_result
+
+            while True:
+                current_cursor = self.change_cursor()
+                if isinstance(current_cursor, domain.Error) or current_cursor != cursor:
+                    return current_cursor
+
+                remaining_seconds = deadline - time.monotonic()
+                if remaining_seconds <= 0:
+                    return current_cursor
+
+                if self._change_listener is None:
+                    time.sleep(min(_POLL_INTERVAL_SECONDS, remaining_seconds))
+                else:
+                    wait_result = self._change_listener.wait(timeout_seconds=remaining_seconds)
+                    if isinstance(wait_result, domain.Error):
+                        return wait_result
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.wait_for_changes({cursor=!r}, {timeout_seconds=!r}) failed: {e!s}")
+
+            return domain.Error.new(str(e), cursor=cursor, timeout_seconds=timeout_seconds)
+
     def update(self, *, todo: domain.Todo) -> None | domain.Error:
         try:
             with self._engine.begin() as con:
@@ -291,3 +543,19 @@ class TodoService(domain.TodoService):
             logger.error(f"{self.__class__.__name__}.update({todo=!r}) failed: {e!s}")
 
             return domain.Error.new(str(e), todo=todo)
+
+    def update_many(self, *, todos: typing.Iterable[domain.Todo], chunk_size: int = 500) -> None | domain.Error:
+        try:
+            with self._engine.begin() as con:
+                date_updated = datetime.datetime.now()
+
+                return adapter.todo_repo.update_many(
+                    schema=self._schema,
+                    con=con,
+                    todos=(dataclasses.replace(todo, date_updated=date_updated) for todo in todos),
+                    chunk_size=chunk_size,
+                )
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}.update_many(..., {chunk_size=!r}) failed: {e!s}")
+
+            return domain.Error.new(str(e), chunk_size=chunk_size)
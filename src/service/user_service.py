@@ -27,11 +27,15 @@ class UserService(domain.UserService):
         try:
             if self._user_is_admin:
                 with self._engine.begin() as con:
-                    adapter.user_repo.add(
+                    add_result = adapter.user_repo.add(
                         schema=self._schema,
                         con=con,
                         user=user,
                     )
+                    if isinstance(add_result, domain.Error):
+                        return add_result
+
+                adapter.lookup_cache.invalidate_users(schema=self._schema, engine=self._engine)
 
             return None
         except Exception as e:
@@ -42,7 +46,7 @@ class UserService(domain.UserService):
     def get_current_user(self) -> domain.User | domain.Error:
         try:
             with self._engine.begin() as con:
-                users = adapter.user_repo.where(
+                users = adapter.lookup_cache.users(
                     schema=self._schema,
                     con=con,
                     active=True,
@@ -73,7 +77,9 @@ class UserService(domain.UserService):
                     if isinstance(add_result, domain.Error):
                         return add_result
 
-                    return new_user
+            adapter.lookup_cache.invalidate_users(schema=self._schema, engine=self._engine)
+
+            return new_user
         except Exception as e:
             logger.error(f"{self.__class__.__name__}.get_current_user() failed: {e!s}")
 
@@ -91,6 +97,8 @@ class UserService(domain.UserService):
                     if isinstance(delete_result, domain.Error):
                         return delete_result
 
+                adapter.lookup_cache.invalidate_users(schema=self._schema, engine=self._engine)
+
             return None
         except Exception as e:
             logger.error(f"{self.__class__.__name__}.delete({user_id=!r}) failed: {e!s}")
@@ -115,11 +123,15 @@ class UserService(domain.UserService):
         try:
             if self._user_is_admin:
                 with self._engine.begin() as con:
-                    return adapter.user_repo.update(
+                    update_result = adapter.user_repo.update(
                         schema=self._schema,
                         con=con,
                         user=user,
                     )
+                    if isinstance(update_result, domain.Error):
+                        return update_result
+
+                adapter.lookup_cache.invalidate_users(schema=self._schema, engine=self._engine)
 
             return None
         except Exception as e:
@@ -130,7 +142,7 @@ class UserService(domain.UserService):
     def where(self, *, active: bool) -> list[domain.User] | domain.Error:
         try:
             with self._engine.begin() as con:
-                return adapter.user_repo.where(
+                return adapter.lookup_cache.users(
                     schema=self._schema,
                     con=con,
                     active=active,
@@ -0,0 +1,132 @@
+import datetime
+import pathlib
+
+import sqlalchemy as sa
+
+from src import adapter, domain
+
+
+def test_create_tables_upgrades_existing_todo_table() -> None:
+    engine = sa.create_engine("sqlite://")
+
+    with engine.begin() as con:
+        # the todo table as it was before display windows and indexes were added
+        con.execute(
+            sa.text(
+                "CREATE TABLE todo (todo_id TEXT PRIMARY KEY, description TEXT NOT NULL, note TEXT NOT NULL, "
+                "user_id TEXT NOT NULL, category_id TEXT NOT NULL, advance_days INTEGER NOT NULL, "
+                "expire_days INTEGER NOT NULL, start_date DATE NOT NULL, last_completed DATE, "
+                "last_completed_by TEXT, prior_completed DATE, prior_completed_by TEXT, template_todo_id TEXT, "
+                "date_added DATETIME NOT NULL, date_updated DATETIME, date_deleted DATETIME, "
+                "frequency TEXT NOT NULL, month INTEGER, week_day INTEGER, week_number INTEGER, "
+                "month_day INTEGER, days INTEGER, due_date DATE)"
+            )
+        )
+
+        con.execute(
+            sa.text(
+                "INSERT INTO todo (todo_id, description, note, user_id, category_id, advance_days, expire_days, "
+                "start_date, date_added, frequency) VALUES ('1', 'Wash dishes', '', '1', '1', 0, 0, '2010-01-01', "
+                "'2010-01-01 00:00:00', 'daily')"
+            )
+        )
+
+    assert adapter.db.create_tables(schema=None, engine=engine) is None
+
+    inspector = sa.inspect(engine)
+
+    column_names = {column["name"] for column in inspector.get_columns("todo")}
+    assert {"display_start", "display_end", "display_as_of"} <= column_names
+
+    index_names = {index["name"] for index in inspector.get_indexes("todo")}
+    assert {index.name for index in adapter.db.todo(schema=None).indexes} <= index_names
+
+    # todos written before the search index existed are indexed when it's created
+    with engine.begin() as con:
+        assert con.execute(sa.text("SELECT todo_id FROM todo_fts WHERE todo_fts MATCH 'dish'")).scalars().all() == ["1"]
+
+    # running it again is a no-op
+    assert adapter.db.create_tables(schema=None, engine=engine) is None
+
+
+def test_todo_repo_where_uses_indexes(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        user_plan = adapter.todo_repo.explain_where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id="1" * 32,
+            description_like=domain.Unspecified(),
+            template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
+        )
+        assert isinstance(user_plan, list)
+        assert any("ix_todo_active_user_id_category_id" in step for step in user_plan), user_plan
+
+        category_plan = adapter.todo_repo.explain_where(
+            schema=None,
+            con=con,
+            category_id="1" * 32,
+            user_id=domain.Unspecified(),
+            description_like=domain.Unspecified(),
+            template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
+        )
+        assert isinstance(category_plan, list)
+        assert any("ix_todo_active_category_id" in step for step in category_plan), category_plan
+
+        template_plan = adapter.todo_repo.explain_where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id="1" * 32,
+            description_like=domain.Unspecified(),
+            template_todo_id="2" * 32,
+            due_on=domain.Unspecified(),
+        )
+        assert isinstance(template_plan, list)
+        assert any("ix_todo_active_template_todo_id_user_id" in step for step in template_plan), template_plan
+
+        due_plan = adapter.todo_repo.explain_where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id=domain.Unspecified(),
+            description_like=domain.Unspecified(),
+            template_todo_id=domain.Unspecified(),
+            due_on=datetime.date(2024, 1, 1),
+        )
+        assert isinstance(due_plan, list)
+        assert any("ix_todo_active_display_start_display_end" in step for step in due_plan), due_plan
+
+
+def test_user_repo_delete_uses_index(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        plan = adapter.user_repo.explain_delete(schema=None, con=con, user_id="1" * 32)
+        assert isinstance(plan, list)
+        assert any("ix_todo_active_user_id_category_id" in step for step in plan), plan
+
+
+def test_create_engine_applies_sqlite_pragmas(tmp_path: pathlib.Path) -> None:
+    engine = adapter.db.create_engine(
+        url=f"sqlite:///{tmp_path / 'todo.db'}",
+        settings={"sqlite": {"busy-timeout-ms": 1234}, "postgresql": {"pool-size": 1}},
+    )
+    assert isinstance(engine, sa.Engine)
+    assert isinstance(engine.pool, sa.pool.QueuePool)
+
+    with engine.connect() as con:
+        assert con.execute(sa.text("PRAGMA journal_mode")).scalar_one() == "wal"
+        assert con.execute(sa.text("PRAGMA synchronous")).scalar_one() == 1  # NORMAL
+        assert con.execute(sa.text("PRAGMA busy_timeout")).scalar_one() == 1234
+        assert con.execute(sa.text("PRAGMA foreign_keys")).scalar_one() == 1
+        cache_size_kib = adapter.db.SQLITE_ENGINE_DEFAULTS["cache-size-kib"]
+        assert con.execute(sa.text("PRAGMA cache_size")).scalar_one() == -cache_size_kib
+
+
+def test_create_engine_rejects_invalid_sqlite_settings(tmp_path: pathlib.Path) -> None:
+    engine = adapter.db.create_engine(
+        url=f"sqlite:///{tmp_path / 'todo.db'}",
+        settings={"sqlite": {"journal-mode": "wal; DROP TABLE todo"}},
+    )
+    assert isinstance(engine, domain.Error)
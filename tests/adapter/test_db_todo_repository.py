@@ -76,6 +76,7 @@ def test_round_trip(engine: sa.Engine) -> None:
             user_id=domain.Unspecified(),
             description_like=domain.Unspecified(),
             template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
         )
         assert isinstance(todos, list)
         assert len(todos) == 3
@@ -95,6 +96,7 @@ def test_round_trip(engine: sa.Engine) -> None:
             user_id=domain.Unspecified(),
             description_like=domain.Unspecified(),
             template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
         )
         assert isinstance(todos, list)
         assert len(todos) == 3
@@ -108,8 +110,298 @@ def test_round_trip(engine: sa.Engine) -> None:
             user_id=domain.Unspecified(),
             description_like=domain.Unspecified(),
             template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
         )
         assert isinstance(todos, list)
         assert len(todos) == 2
 
     return None
+
+
+USER_1 = domain.User(
+    user_id="a" * 32,
+    username="jdoe",
+    display_name="Jane Doe",
+    is_admin=False,
+    date_added=datetime.datetime(2010, 1, 2, 3, 4, 5, 6),
+    date_updated=None,
+)
+
+USER_2 = domain.User(
+    user_id="b" * 32,
+    username="jsmith",
+    display_name="John Smith",
+    is_admin=True,
+    date_added=datetime.datetime(2010, 1, 2, 3, 4, 5, 6),
+    date_updated=None,
+)
+
+
+def test_get_hydrates_todo_in_one_statement(engine: sa.Engine) -> None:
+    todo_3 = dataclasses.replace(TODO_3, user=USER_1, last_completed_by=USER_2, prior_completed_by=USER_1)
+
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY)
+        adapter.user_repo.add(schema=None, con=con, user=USER_1)
+        adapter.user_repo.add(schema=None, con=con, user=USER_2)
+
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_1) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=todo_3) is None
+
+        statements: list[str] = []
+        sa.event.listen(con, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        todo = adapter.todo_repo.get(schema=None, con=con, todo_id=todo_3.todo_id)
+        assert isinstance(todo, domain.Todo)
+        assert len(statements) == 1
+
+        users = adapter.user_repo.where(schema=None, con=con, active=True)
+        assert isinstance(users, list)
+        user_by_id = {user.user_id: user for user in users}
+
+        assert todo.user == user_by_id[USER_1.user_id]
+        assert todo.last_completed_by == user_by_id[USER_2.user_id]
+        assert todo.prior_completed_by == user_by_id[USER_1.user_id]
+        assert todo.category == domain.TODO_CATEGORY
+        assert todo.frequency == todo_3.frequency
+
+        todos = adapter.todo_repo.get_many(
+            schema=None,
+            con=con,
+            todo_ids=[TODO_1.todo_id, todo_3.todo_id, "missing"],
+        )
+        assert isinstance(todos, list)
+        assert {t.todo_id for t in todos} == {TODO_1.todo_id, todo_3.todo_id}
+        assert next(t for t in todos if t.todo_id == TODO_1.todo_id).user == domain.DEFAULT_USER
+
+
+def _assert_save_inserts_then_updates(*, engine: sa.Engine, expected_statements: int) -> None:
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY)
+
+        statements: list[str] = []
+        sa.event.listen(con, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        added_todo = adapter.todo_repo.save(schema=None, con=con, todo=TODO_2)
+        assert isinstance(added_todo, domain.Todo)
+        assert added_todo.date_added == TODO_2.date_added
+        assert added_todo.date_updated is None
+
+        edited_todo = dataclasses.replace(
+            TODO_2,
+            description="Clean attic",
+            date_added=datetime.datetime(2020, 1, 1),
+        )
+
+        statements.clear()
+
+        updated_todo = adapter.todo_repo.save(schema=None, con=con, todo=edited_todo)
+        assert isinstance(updated_todo, domain.Todo)
+        # handing out the change sequence number isn't part of the save itself
+        assert len([statement for statement in statements if "change_counter" not in statement]) == expected_statements
+        assert updated_todo.description == "Clean attic"
+        assert updated_todo.date_added == TODO_2.date_added
+        assert updated_todo.date_updated is not None
+
+        persisted_todo = adapter.todo_repo.get(schema=None, con=con, todo_id=TODO_2.todo_id)
+        assert persisted_todo == updated_todo
+
+
+def test_save_upserts_in_one_statement(engine: sa.Engine) -> None:
+    _assert_save_inserts_then_updates(engine=engine, expected_statements=1)
+
+
+def test_save_without_returning_support(engine: sa.Engine) -> None:
+    engine.dialect.insert_returning = False
+
+    _assert_save_inserts_then_updates(engine=engine, expected_statements=2)
+
+
+def test_iter_where_streams_todos(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY)
+
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_1) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_2) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_3) is None
+
+        todos = adapter.todo_repo.iter_where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id=domain.Unspecified(),
+            description_like=domain.Unspecified(),
+            template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
+            occurs_between=domain.Unspecified(),
+            batch_size=1,
+        )
+
+        first_todo = next(todos)
+        assert isinstance(first_todo, domain.Todo)
+
+        # stopping early releases the cursor, so the connection can be used again
+        todos.close()
+
+        streamed_todos = list(
+            adapter.todo_repo.iter_where(
+                schema=None,
+                con=con,
+                category_id=domain.Unspecified(),
+                user_id=domain.Unspecified(),
+                description_like=domain.Unspecified(),
+                template_todo_id=domain.Unspecified(),
+                due_on=domain.Unspecified(),
+                occurs_between=domain.Unspecified(),
+                batch_size=2,
+            )
+        )
+        assert {todo.todo_id for todo in streamed_todos if isinstance(todo, domain.Todo)} == {
+            TODO_1.todo_id,
+            TODO_2.todo_id,
+            TODO_3.todo_id,
+        }
+
+
+def test_fast_row_decoding_matches_strict_decoding(engine: sa.Engine) -> None:
+    todo_3 = dataclasses.replace(TODO_3, user=USER_1, last_completed_by=USER_2, template_todo_id="4" * 32)
+
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY)
+        adapter.user_repo.add(schema=None, con=con, user=USER_1)
+        adapter.user_repo.add(schema=None, con=con, user=USER_2)
+
+        for todo in (TODO_1, TODO_2, todo_3):
+            assert adapter.todo_repo.add(schema=None, con=con, todo=todo) is None
+
+        lookups = adapter.todo_repo._Lookups.load(schema=None, con=con)
+        assert isinstance(lookups, adapter.todo_repo._Lookups)
+
+        rows = con.execute(sa.select(adapter.db.todo(schema=None))).fetchall()
+        assert len(rows) == 3
+
+        for row in rows:
+            fast_todo = adapter.todo_repo._decode_row(row, lookups=lookups)
+            strict_todo = adapter.todo_repo._strict_decode_row(row, lookups=lookups)
+            assert fast_todo is not None
+            assert fast_todo == strict_todo
+
+        # SQLite doesn't enforce column types, so a bad value gets through to the decoder as-is
+        con.execute(
+            sa.update(adapter.db.todo(schema=None))
+            .where(adapter.db.todo(schema=None).c.todo_id == TODO_2.todo_id)
+            .values(advance_days=sa.literal_column("'soon'"))
+        )
+
+        todos = adapter.todo_repo.where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id=domain.Unspecified(),
+            description_like=domain.Unspecified(),
+            template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
+        )
+        assert isinstance(todos, domain.Error)
+        assert "advance_days" in todos.error_message
+
+
+def test_categories_and_users_added_since_the_lookup_cache_was_loaded_are_found(engine: sa.Engine) -> None:
+    def where(con: sa.Connection) -> list[domain.Todo]:
+        todos = adapter.todo_repo.where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id=domain.Unspecified(),
+            description_like=domain.Unspecified(),
+            template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
+        )
+        assert isinstance(todos, list)
+        return todos
+
+    chores = domain.Category(
+        category_id="c" * 32,
+        name="Chores",
+        note="",
+        date_added=datetime.datetime(2011, 1, 2, 3, 4, 5),
+        date_updated=None,
+        date_deleted=None,
+    )
+
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY)
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_1) is None
+
+        # loads the lookup cache
+        assert len(where(con)) == 1
+
+    # written the way another client would, without invalidating this process's cache
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=chores)
+        adapter.user_repo.add(schema=None, con=con, user=USER_1)
+        assert (
+            adapter.todo_repo.add(
+                schema=None,
+                con=con,
+                todo=dataclasses.replace(TODO_2, category=chores, user=USER_1, last_completed_by=USER_1),
+            )
+            is None
+        )
+
+    with engine.begin() as con:
+        todo_2 = next(todo for todo in where(con) if todo.todo_id == TODO_2.todo_id)
+
+    assert todo_2.category.category_id == chores.category_id
+    assert todo_2.user.user_id == USER_1.user_id
+    assert todo_2.last_completed_by is not None
+    assert todo_2.last_completed_by.user_id == USER_1.user_id
+
+
+def test_where_searches_description_and_note(engine: sa.Engine) -> None:
+    def search(con: sa.Connection, text: str) -> list[str]:
+        todos = adapter.todo_repo.where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id=domain.Unspecified(),
+            description_like=text,
+            template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
+        )
+        assert isinstance(todos, list)
+        return [todo.todo_id for todo in todos]
+
+    with engine.begin() as con:
+        adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY)
+
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_1) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_2) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=TODO_3) is None
+
+        assert search(con, "DISH") == [TODO_1.todo_id]
+        assert search(con, "todo_2 note") == [TODO_2.todo_id]
+        assert search(con, 'say "hi"') == []
+
+        # too short for the trigram index
+        assert search(con, "ar") == [TODO_2.todo_id]
+
+        plan = adapter.todo_repo.explain_where(
+            schema=None,
+            con=con,
+            category_id=domain.Unspecified(),
+            user_id=domain.Unspecified(),
+            description_like="dish",
+            template_todo_id=domain.Unspecified(),
+            due_on=domain.Unspecified(),
+        )
+        assert isinstance(plan, list)
+        assert any("todo_fts" in step for step in plan), plan
+
+        dusted_todo = dataclasses.replace(TODO_1, description="Dust")
+        assert adapter.todo_repo.update(schema=None, con=con, todo=dusted_todo) is None
+        assert search(con, "dish") == []
+        assert search(con, "dust") == [TODO_1.todo_id]
+
+        assert adapter.todo_repo.delete(schema=None, con=con, todo_id=TODO_3.todo_id) is None
+        assert search(con, "taxes") == []
@@ -0,0 +1,37 @@
+import dataclasses
+import datetime
+
+from src import domain
+
+
+def test_agenda_merges_todos_in_date_order() -> None:
+    start = datetime.date(2024, 1, 1)
+
+    weekly = dataclasses.replace(
+        domain.DEFAULT_TODO,
+        todo_id="weekly",
+        description="b",
+        frequency=domain.Frequency.weekly(
+            week_day=domain.Weekday.Monday,
+            advance_display_days=0,
+            expire_display_days=1,
+            start_date=start,
+        ),
+    )
+    every_third_day = dataclasses.replace(
+        domain.DEFAULT_TODO,
+        todo_id="xdays",
+        description="a",
+        frequency=domain.Frequency.xdays(days=3, advance_display_days=0, expire_display_days=1, start_date=start),
+    )
+
+    entries = list(domain.agenda.agenda(todos=[weekly, every_third_day], start=start, end=datetime.date(2024, 1, 10)))
+
+    assert [(entry.date.day, entry.todo.todo_id) for entry in entries] == [
+        (1, "xdays"),
+        (1, "weekly"),
+        (4, "xdays"),
+        (7, "xdays"),
+        (8, "weekly"),
+        (10, "xdays"),
+    ]
@@ -0,0 +1,121 @@
+import datetime
+
+import hypothesis
+from hypothesis import strategies
+
+from src import domain
+from src.domain import date_calc, date_calc_batch
+
+START_DATES = strategies.dates(min_value=datetime.date(1990, 1, 1), max_value=datetime.date(2060, 12, 31))
+
+REF_DATES = strategies.dates(min_value=datetime.date(2000, 1, 1), max_value=datetime.date(2050, 12, 31))
+
+ADVANCE_DAYS = strategies.integers(min_value=0, max_value=27)
+
+EXPIRE_DAYS = strategies.integers(min_value=1, max_value=27)
+
+FREQUENCIES = strategies.one_of(
+    strategies.builds(domain.Frequency.daily, start_date=START_DATES),
+    strategies.builds(
+        domain.Frequency.easter,
+        advance_display_days=ADVANCE_DAYS,
+        expire_display_days=EXPIRE_DAYS,
+        start_date=START_DATES,
+    ),
+    strategies.builds(
+        domain.Frequency.irregular,
+        month=strategies.sampled_from(domain.Month),
+        week_day=strategies.sampled_from(domain.Weekday),
+        week_number=strategies.integers(min_value=1, max_value=4),
+        advance_display_days=ADVANCE_DAYS,
+        expire_display_days=EXPIRE_DAYS,
+        start_date=START_DATES,
+    ),
+    strategies.builds(
+        domain.Frequency.memorial_day,
+        advance_display_days=ADVANCE_DAYS,
+        expire_display_days=EXPIRE_DAYS,
+        start_date=START_DATES,
+    ),
+    strategies.builds(
+        domain.Frequency.monthly,
+        month_day=strategies.integers(min_value=1, max_value=28),
+        advance_display_days=ADVANCE_DAYS,
+        expire_display_days=EXPIRE_DAYS,
+        start_date=START_DATES,
+    ),
+    strategies.builds(
+        domain.Frequency.once,
+        due_date=REF_DATES,
+        advance_display_days=ADVANCE_DAYS,
+        expire_display_days=EXPIRE_DAYS,
+        start_date=START_DATES,
+    ),
+    strategies.builds(
+        domain.Frequency.weekly,
+        week_day=strategies.sampled_from(domain.Weekday),
+        advance_display_days=strategies.integers(min_value=0, max_value=6),
+        expire_display_days=strategies.integers(min_value=1, max_value=6),
+        start_date=START_DATES,
+    ),
+    strategies.builds(
+        domain.Frequency.xdays,
+        days=strategies.integers(min_value=1, max_value=400),
+        advance_display_days=ADVANCE_DAYS,
+        expire_display_days=EXPIRE_DAYS,
+        start_date=START_DATES,
+    ),
+    strategies.builds(
+        domain.Frequency.yearly,
+        month=strategies.sampled_from(domain.Month),
+        month_day=strategies.integers(min_value=1, max_value=28),
+        advance_display_days=ADVANCE_DAYS,
+        expire_display_days=EXPIRE_DAYS,
+        start_date=START_DATES,
+    ),
+)
+
+
+@hypothesis.settings(deadline=None, max_examples=300)
+@hypothesis.given(frequencies=strategies.lists(FREQUENCIES, max_size=20), ref_date=REF_DATES)
+def test_due_dates_match_scalar_due_date(frequencies: list[domain.Frequency], ref_date: datetime.date) -> None:
+    columns = date_calc_batch.FrequencyColumns.from_frequencies(frequencies)
+
+    assert date_calc_batch.due_dates(columns=columns, ref_date=ref_date) == [
+        date_calc.due_date(frequency=frequency, ref_date=ref_date) for frequency in frequencies
+    ]
+
+
+@hypothesis.settings(deadline=None, max_examples=300)
+@hypothesis.given(
+    frequencies_and_last_completed=strategies.lists(
+        strategies.tuples(
+            FREQUENCIES,
+            strategies.one_of(
+                strategies.none(),
+                strategies.dates(
+                    min_value=datetime.date.today() - datetime.timedelta(days=400),
+                    max_value=datetime.date.today(),
+                ),
+            ),
+        ),
+        max_size=20,
+    ),
+)
+def test_should_display_matches_scalar_should_display(
+    frequencies_and_last_completed: list[tuple[domain.Frequency, datetime.date | None]],
+) -> None:
+    columns = date_calc_batch.FrequencyColumns.from_frequencies(
+        frequency for frequency, _ in frequencies_and_last_completed
+    )
+
+    actual = date_calc_batch.should_display(
+        columns=columns,
+        last_completed=[last_completed for _, last_completed in frequencies_and_last_completed],
+        ref_date=datetime.date.today(),
+    )
+
+    assert actual == [
+        date_calc.should_display(frequency=frequency, last_completed=last_completed)
+        for frequency, last_completed in frequencies_and_last_completed
+    ]
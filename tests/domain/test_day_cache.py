@@ -0,0 +1,53 @@
+import datetime
+
+from src import domain
+from src.domain import date_calc
+from src.domain.day_cache import DayCache
+
+DAILY = domain.Frequency.daily(start_date=datetime.date(2020, 1, 1))
+
+
+def test_day_cache_evicts_every_entry_when_the_day_rolls_over() -> None:
+    cache = DayCache()
+    day = datetime.date(2024, 1, 1)
+    next_day = day + datetime.timedelta(days=1)
+
+    assert cache.get(today=day, ref_date=day, key="a", compute=lambda: 1) == 1
+    assert cache.get(today=day, ref_date=day, key="a", compute=lambda: 2) == 1
+    # another reference date isn't cached
+    assert cache.get(today=day, ref_date=next_day, key="a", compute=lambda: 3) == 3
+
+    stats = cache.stats()
+    assert (stats.day, stats.size, stats.hits, stats.misses, stats.bypasses) == (day, 1, 1, 1, 1)
+
+    assert cache.get(today=next_day, ref_date=next_day, key="a", compute=lambda: 4) == 4
+
+    stats = cache.stats()
+    assert (stats.day, stats.size, stats.evictions) == (next_day, 1, 1)
+
+
+def test_day_cache_is_bounded() -> None:
+    cache = DayCache(max_entries=10)
+    day = datetime.date(2024, 1, 1)
+
+    for i in range(25):
+        assert cache.get(today=day, ref_date=day, key=i, compute=lambda: i) == i
+
+    assert cache.stats().size <= 10
+
+
+def test_should_display_follows_the_clock_across_midnight() -> None:
+    clock = domain.clock.FixedClock(today=datetime.date(2024, 1, 1))
+    prior_clock = domain.clock.set_clock(clock)
+    try:
+        date_calc.clear_cache()
+
+        assert date_calc.should_display(frequency=DAILY, last_completed=datetime.date(2024, 1, 1)) is False
+
+        clock.advance(days=1)
+
+        # completed yesterday, so it's due again today
+        assert date_calc.should_display(frequency=DAILY, last_completed=datetime.date(2024, 1, 1)) is True
+        assert date_calc.cache_stats().day == datetime.date(2024, 1, 2)
+    finally:
+        domain.clock.set_clock(prior_clock)
@@ -0,0 +1,30 @@
+import calendar
+import datetime
+
+import pytest
+
+from src import domain
+from src.domain.irregular import x_weekday_of_month
+
+
+@pytest.mark.parametrize("year", range(2020, 2029))
+def test_x_weekday_of_month_matches_a_day_by_day_count(year: int) -> None:
+    for month in range(1, 13):
+        for week_day in domain.Weekday:
+            occurrences = [
+                datetime.date(year, month, day)
+                for day in range(1, calendar.monthrange(year, month)[1] + 1)
+                if datetime.date(year, month, day).weekday() == week_day.to_int()
+            ]
+
+            for week_num in range(1, 7):
+                expected = occurrences[min(week_num, len(occurrences)) - 1]
+
+                assert x_weekday_of_month(year=year, month=month, week_num=week_num, week_day=week_day) == expected
+
+
+def test_x_weekday_of_month_includes_the_last_day_of_the_month() -> None:
+    fifth_friday = datetime.date(2025, 1, 31)
+
+    assert x_weekday_of_month(year=2025, month=1, week_num=5, week_day=domain.Weekday.Friday) == fifth_friday
+    assert x_weekday_of_month(year=2025, month=1, week_num=None, week_day=domain.Weekday.Friday) == fifth_friday
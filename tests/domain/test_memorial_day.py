@@ -11,3 +11,11 @@ def test_memorial_day() -> None:
     assert memorial_day == datetime.date(2030, 5, 27)
 
     return None
+
+
+def test_memorial_day_is_the_last_monday_in_may() -> None:
+    for year in range(1990, 2100):
+        memorial_day = calculate_memorial_day(year=year)
+        assert memorial_day.month == 5
+        assert memorial_day.weekday() == 0
+        assert (memorial_day + datetime.timedelta(days=7)).month == 6
@@ -0,0 +1,86 @@
+import datetime
+
+import hypothesis
+from hypothesis import strategies
+
+from src import domain
+from src.domain import date_calc
+from tests.domain.test_date_calc_batch import FREQUENCIES, REF_DATES
+
+
+@hypothesis.settings(deadline=None, max_examples=500)
+@hypothesis.given(
+    frequency=FREQUENCIES,
+    start=REF_DATES,
+    days=strategies.integers(min_value=0, max_value=800),
+)
+def test_occurrences_match_chained_next_date(frequency: domain.Frequency, start: datetime.date, days: int) -> None:
+    # next_date for a monthly frequency always skips to the following month, test_monthly_occurrences covers those
+    hypothesis.assume(frequency.name != domain.FrequencyType.Monthly)
+
+    end = start + datetime.timedelta(days=days)
+
+    expected: list[datetime.date] = []
+    dt = date_calc.next_date(frequency=frequency, ref_date=start - datetime.timedelta(days=1))
+    while dt is not None and dt <= end:
+        if dt >= frequency.start_date:
+            expected.append(dt)
+        dt = date_calc.next_date(frequency=frequency, ref_date=dt)
+
+    assert list(date_calc.occurrences(frequency=frequency, start=start, end=end)) == expected
+
+
+@hypothesis.settings(deadline=None)
+@hypothesis.given(
+    month_day=strategies.integers(min_value=1, max_value=31),
+    start=REF_DATES,
+    days=strategies.integers(min_value=0, max_value=800),
+)
+def test_monthly_occurrences(month_day: int, start: datetime.date, days: int) -> None:
+    frequency = domain.Frequency.monthly(
+        month_day=month_day,
+        advance_display_days=0,
+        expire_display_days=1,
+        start_date=datetime.date(2000, 1, 1),
+    )
+
+    end = start + datetime.timedelta(days=days)
+
+    expected = [start + datetime.timedelta(days=i) for i in range(days + 1)]
+
+    assert list(date_calc.occurrences(frequency=frequency, start=start, end=end)) == [
+        dt for dt in expected if dt.day == month_day
+    ]
+
+
+def test_occurrences_skip_months_without_the_month_day() -> None:
+    frequency = domain.Frequency.monthly(
+        month_day=31,
+        advance_display_days=0,
+        expire_display_days=1,
+        start_date=datetime.date(2020, 1, 1),
+    )
+
+    start, end = datetime.date(2024, 1, 1), datetime.date(2024, 6, 30)
+
+    actual = list(date_calc.occurrences(frequency=frequency, start=start, end=end))
+
+    assert actual == [datetime.date(2024, 1, 31), datetime.date(2024, 3, 31), datetime.date(2024, 5, 31)]
+
+
+@hypothesis.settings(deadline=None, max_examples=500)
+@hypothesis.given(frequency=FREQUENCIES, ref_date=REF_DATES)
+def test_nothing_changes_before_the_next_transition(frequency: domain.Frequency, ref_date: datetime.date) -> None:
+    transition = date_calc.next_transition(frequency=frequency, ref_date=ref_date)
+
+    window = date_calc.display_window(frequency=frequency, ref_date=ref_date)
+
+    last_checked = ref_date + datetime.timedelta(days=400)
+    if transition is not None:
+        assert transition > ref_date
+        last_checked = min(last_checked, transition - datetime.timedelta(days=1))
+
+    dt = ref_date + datetime.timedelta(days=1)
+    while dt <= last_checked:
+        assert date_calc.display_window(frequency=frequency, ref_date=dt) == window, dt
+        dt += datetime.timedelta(days=1)
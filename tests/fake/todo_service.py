@@ -1,4 +1,6 @@
 import dataclasses
+import datetime
+import typing
 
 from src import domain
 
@@ -8,23 +10,78 @@ __all__ = ("TodoService",)
 @dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class TodoService(domain.TodoService):
     add_result: None | domain.Error = None
+    add_many_result: None | domain.Error = None
+    change_cursor_result: int | domain.Error = 0
+    changes_since_result: domain.TodoChanges | domain.Error = domain.TodoChanges(
+        cursor=0,
+        upserted=(),
+        deleted_todo_ids=(),
+    )
+    completion_history_result: list[domain.TodoCompletion] | domain.Error = dataclasses.field(default_factory=list)
+    completions_result: list[domain.TodoCompletion] | domain.Error = dataclasses.field(default_factory=list)
     delete_result: None | domain.Error = None
+    delete_many_result: None | domain.Error = None
     get_result: domain.Todo | None | domain.Error = domain.DEFAULT_TODO
+    get_many_result: tuple[domain.Todo, ...] | domain.Error = (domain.DEFAULT_TODO,)
     get_by_template_id_and_user_id_result: None | domain.Error = None
     mark_as_completed_result: None | domain.Error = None
     where_result: tuple[domain.Todo, ...] | domain.Error = (domain.DEFAULT_TODO,)
     mark_incomplete_result: None | domain.Error = None
+    next_appearance_result: datetime.date | None | domain.Error = None
+    occurring_between_result: tuple[domain.Todo, ...] | domain.Error = (domain.DEFAULT_TODO,)
+    refresh_display_windows_result: None | domain.Error = None
+    save_result: domain.Todo | domain.Error = domain.DEFAULT_TODO
     update_result: None | domain.Error = None
+    update_many_result: None | domain.Error = None
+    wait_for_changes_result: int | domain.Error = 0
 
     def add(self, *, todo: domain.Todo) -> None | domain.Error:
         return self.add_result
 
+    def add_many(self, *, todos: typing.Iterable[domain.Todo], chunk_size: int = 500) -> None | domain.Error:
+        return self.add_many_result
+
+    def change_cursor(self) -> int | domain.Error:
+        return self.change_cursor_result
+
+    def changes_since(
+        self,
+        *,
+        cursor: int,
+        due_filter: bool | domain.Unspecified,
+        description_like: str | domain.Unspecified,
+        category_id_filter: str | domain.Unspecified,
+        user_id_filter: str | domain.Unspecified,
+    ) -> domain.TodoChanges | domain.Error:
+        return self.changes_since_result
+
+    def completion_history(self, *, todo_id: str) -> list[domain.TodoCompletion] | domain.Error:
+        return self.completion_history_result
+
+    def completions(
+        self,
+        *,
+        user_id_filter: str | domain.Unspecified,
+        completed_from: datetime.date,
+        completed_to: datetime.date,
+    ) -> list[domain.TodoCompletion] | domain.Error:
+        return self.completions_result
+
     def delete(self, *, todo_id: str) -> None | domain.Error:
         return self.delete_result
 
+    def delete_many(self, *, todo_ids: typing.Iterable[str], chunk_size: int = 500) -> None | domain.Error:
+        return self.delete_many_result
+
     def get(self, *, todo_id: str) -> domain.Todo | None | domain.Error:
         return self.get_result
 
+    def get_many(self, *, todo_ids: typing.Iterable[str]) -> list[domain.Todo] | domain.Error:
+        if isinstance(self.get_many_result, domain.Error):
+            return self.get_many_result
+
+        return list(self.get_many_result)
+
     def get_by_template_id_and_user_id(
         self,
         *,
@@ -41,6 +98,14 @@ class TodoService(domain.TodoService):
     ) -> None | domain.Error:
         return self.mark_as_completed_result
 
+    def mark_complete_many(
+        self,
+        *,
+        todo_ids: typing.Iterable[str],
+        user: domain.User | None,
+    ) -> None | domain.Error:
+        return self.mark_as_completed_result
+
     def where(
         self,
         *,
@@ -57,5 +122,42 @@ class TodoService(domain.TodoService):
     def mark_incomplete(self, *, todo_id: str) -> None | domain.Error:
         return self.mark_incomplete_result
 
+    def mark_incomplete_many(self, *, todo_ids: typing.Iterable[str]) -> None | domain.Error:
+        return self.mark_incomplete_result
+
+    def next_appearance(
+        self,
+        *,
+        description_like: str | domain.Unspecified,
+        category_id_filter: str | domain.Unspecified,
+        user_id_filter: str | domain.Unspecified,
+    ) -> datetime.date | None | domain.Error:
+        return self.next_appearance_result
+
+    def occurring_between(
+        self,
+        *,
+        start: datetime.date,
+        end: datetime.date,
+        category_id_filter: str | domain.Unspecified,
+        user_id_filter: str | domain.Unspecified,
+    ) -> list[domain.Todo] | domain.Error:
+        if isinstance(self.occurring_between_result, domain.Error):
+            return self.occurring_between_result
+
+        return list(self.occurring_between_result)
+
+    def refresh_display_windows(self) -> None | domain.Error:
+        return self.refresh_display_windows_result
+
+    def save(self, *, todo: domain.Todo) -> domain.Todo | domain.Error:
+        return self.save_result
+
+    def wait_for_changes(self, *, cursor: int, timeout_seconds: float) -> int | domain.Error:
+        return self.wait_for_changes_result
+
     def update(self, *, todo: domain.Todo) -> None | domain.Error:
         return self.update_result
+
+    def update_many(self, *, todos: typing.Iterable[domain.Todo], chunk_size: int = 500) -> None | domain.Error:
+        return self.update_many_result
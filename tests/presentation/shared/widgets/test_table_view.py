@@ -3,6 +3,7 @@ import datetime
 import random
 
 import hypothesis
+from PyQt6 import QtCore as qtc
 from hypothesis import strategies
 from pytestqt.qtbot import QtBot
 
@@ -102,3 +103,386 @@ def test_view(rows: list[Row], qtbot: QtBot) -> None:
             assert updated_item is not None
 
             assert updated_item.date_col == random_row_to_update.date_col + datetime.timedelta(days=1)
+
+
+def test_rendered_rows_are_cached_until_their_item_changes(qtbot: QtBot) -> None:
+    rendered_int_cols: list[int] = []
+
+    # named like ValueSelector's parameter, so it can be passed as a value_selector
+    def render_text(item: Row) -> str:
+        rendered_int_cols.append(item.int_col)
+        return item.text_col
+
+    view: table_view.TableView[Row, int] = table_view.TableView(
+        attrs=(
+            table_view.integer(name="int_col", display_name="Integer"),
+            table_view.text(name="text_col", display_name="Text", value_selector=render_text),
+        ),
+        key_attr_name="int_col",
+        normal_font=theme.font.DEFAULT_FONT,
+        bold_font=theme.font.BOLD_FONT,
+        parent=None,
+    )
+
+    qtbot.addWidget(view)
+
+    rows = [
+        Row(
+            date_col=datetime.date(2010, 1, 1),
+            datetime_col=datetime.datetime(2010, 1, 1),
+            int_col=i,
+            text_col=f" row {i}\n",
+        )
+        for i in range(3)
+    ]
+    view.set_items(rows)
+
+    model = view.model()
+    assert model is not None
+
+    def display_texts() -> list[str]:
+        return [model.data(model.index(row_num, 1)).value() for row_num in range(model.rowCount())]
+
+    assert display_texts() == ["row 0", "row 1", "row 2"]
+    assert display_texts() == ["row 0", "row 1", "row 2"]
+    assert sorted(rendered_int_cols) == [0, 1, 2]
+
+    rendered_int_cols.clear()
+
+    view.update_item(dataclasses.replace(rows[1], text_col="changed"))
+
+    assert display_texts() == ["row 0", "changed", "row 2"]
+    assert rendered_int_cols == [1]
+
+    rendered_int_cols.clear()
+
+    view.delete_item(key=0)
+
+    assert display_texts() == ["changed", "row 2"]
+    assert rendered_int_cols == []
+
+    view.clear_render_cache()
+
+    assert display_texts() == ["changed", "row 2"]
+    assert rendered_int_cols == [1, 2]
+
+
+def test_lazy_row_sizing_measures_only_the_rows_in_view(qtbot: QtBot) -> None:
+    view: table_view.TableView[Row, int] = table_view.TableView(
+        attrs=(
+            table_view.integer(name="int_col", display_name="Integer"),
+            table_view.text(name="text_col", display_name="Text"),
+        ),
+        key_attr_name="int_col",
+        normal_font=theme.font.DEFAULT_FONT,
+        bold_font=theme.font.BOLD_FONT,
+        parent=None,
+        size_rows_lazily=True,
+    )
+
+    qtbot.addWidget(view)
+
+    view.resize(400, 300)
+    view.show()
+
+    measured_row_nums: list[int] = []
+
+    def resize_row_to_contents(row_num: int, /) -> None:
+        measured_row_nums.append(row_num)
+        table_view.TableView.resizeRowToContents(view, row_num)
+
+    view.resizeRowToContents = resize_row_to_contents  # type: ignore
+
+    rows = [
+        Row(
+            date_col=datetime.date(2010, 1, 1),
+            datetime_col=datetime.datetime(2010, 1, 1),
+            int_col=i,
+            text_col=f"row {i}",
+        )
+        for i in range(1_000)
+    ]
+    view.set_items(rows)
+
+    assert 0 < len(measured_row_nums) < 100
+    assert max(measured_row_nums) < 100
+
+    view.scrollToBottom()
+    qtbot.wait(10)
+
+    assert max(measured_row_nums) == len(rows) - 1
+    assert len(measured_row_nums) < 200
+
+    # the heights are cached by content, so loading the same rows again measures nothing
+    measured_row_nums.clear()
+
+    view.set_items(rows)
+
+    assert measured_row_nums == []
+
+
+def test_column_widths_the_user_sets_survive_a_refresh(qtbot: QtBot) -> None:
+    view: table_view.TableView[Row, int] = table_view.TableView(
+        attrs=(
+            table_view.integer(name="int_col", display_name="Integer", width=80),
+            table_view.text(name="text_col", display_name="Text", width=120),
+        ),
+        key_attr_name="int_col",
+        normal_font=theme.font.DEFAULT_FONT,
+        bold_font=theme.font.BOLD_FONT,
+        parent=None,
+    )
+
+    qtbot.addWidget(view)
+
+    header = view.horizontalHeader()
+    assert header is not None
+    assert [header.sectionSize(0), header.sectionSize(1)] == [80, 120]
+
+    header.resizeSection(1, 300)
+
+    rows = [
+        Row(
+            date_col=datetime.date(2010, 1, 1),
+            datetime_col=datetime.datetime(2010, 1, 1),
+            int_col=i,
+            text_col=f"row {i}",
+        )
+        for i in range(3)
+    ]
+    view.set_items(rows)
+    view.set_items(rows[1:])
+
+    model = view.model()
+    assert model is not None
+    model.sort(0, qtc.Qt.SortOrder.DescendingOrder)
+
+    assert [header.sectionSize(0), header.sectionSize(1)] == [80, 300]
+
+
+def test_set_items_signals_only_what_changed(qtbot: QtBot) -> None:
+    view: table_view.TableView[Row, int] = table_view.TableView(
+        attrs=(
+            table_view.integer(name="int_col", display_name="Integer"),
+            table_view.text(name="text_col", display_name="Text"),
+        ),
+        key_attr_name="int_col",
+        normal_font=theme.font.DEFAULT_FONT,
+        bold_font=theme.font.BOLD_FONT,
+        parent=None,
+    )
+
+    qtbot.addWidget(view)
+
+    rows = [
+        Row(
+            date_col=datetime.date(2010, 1, 1),
+            datetime_col=datetime.datetime(2010, 1, 1),
+            int_col=i,
+            text_col=f"row {i}",
+        )
+        for i in range(10)
+    ]
+    view.set_items(rows)
+
+    model = view.model()
+    assert model is not None
+
+    signals: list[tuple[str, int, int]] = []
+    model.rowsInserted.connect(lambda _, first, last: signals.append(("inserted", first, last)))
+    model.rowsRemoved.connect(lambda _, first, last: signals.append(("removed", first, last)))
+    model.dataChanged.connect(lambda first, last, *_: signals.append(("changed", first.row(), last.row())))
+    model.layoutChanged.connect(lambda *_: signals.append(("layout", -1, -1)))
+
+    view.set_items([dataclasses.replace(row) for row in rows])
+
+    assert signals == []
+
+    # stands in for the view's selection and current index
+    persistent_index = qtc.QPersistentModelIndex(model.index(5, 1))
+
+    new_row = dataclasses.replace(rows[0], int_col=10, text_col="row 10")
+    updated_rows = [*rows[:2], new_row, *rows[4:7], dataclasses.replace(rows[7], text_col="changed"), *rows[8:]]
+
+    view.set_items(updated_rows)
+
+    assert signals == [("removed", 2, 3), ("changed", 5, 5), ("inserted", 2, 2)]
+    assert view.items == updated_rows
+    assert view.items[persistent_index.row()] == rows[5]
+
+    signals.clear()
+
+    view.set_items(updated_rows[::-1])
+
+    assert signals == [("layout", -1, -1)]
+    assert view.items == updated_rows[::-1]
+    assert view.items[persistent_index.row()] == rows[5]
+    assert view.get_item(key=10) == new_row
+
+
+@hypothesis.settings(
+    deadline=None,
+    suppress_health_check=[hypothesis.HealthCheck.function_scoped_fixture],
+)
+@hypothesis.given(
+    old_keys=strategies.lists(strategies.integers(0, 30), unique=True, max_size=30),
+    new_keys=strategies.lists(strategies.integers(0, 30), unique=True, max_size=30),
+    changed_keys=strategies.sets(strategies.integers(0, 30)),
+)
+def test_set_items_diff_ends_up_with_the_new_items(
+    old_keys: list[int],
+    new_keys: list[int],
+    changed_keys: set[int],
+    qtbot: QtBot,
+) -> None:
+    view: table_view.TableView[Row, int] = table_view.TableView(
+        attrs=(
+            table_view.integer(name="int_col", display_name="Integer"),
+            table_view.text(name="text_col", display_name="Text"),
+        ),
+        key_attr_name="int_col",
+        normal_font=theme.font.DEFAULT_FONT,
+        bold_font=theme.font.BOLD_FONT,
+        parent=None,
+    )
+
+    qtbot.addWidget(view)
+
+    def row(key: int, text: str) -> Row:
+        return Row(
+            date_col=datetime.date(2010, 1, 1),
+            datetime_col=datetime.datetime(2010, 1, 1),
+            int_col=key,
+            text_col=text,
+        )
+
+    view.set_items(row(key, "old") for key in old_keys)
+
+    new_rows = [row(key, "new" if key in changed_keys else "old") for key in new_keys]
+
+    view.set_items(new_rows)
+
+    model = view.model()
+    assert model is not None
+
+    assert view.items == new_rows
+    assert [model.data(model.index(row_num, 1)).value() for row_num in range(model.rowCount())] == [
+        r.text_col for r in new_rows
+    ]
+    assert all(view.get_item(key=key) == r for key, r in zip(new_keys, new_rows))
+
+
+def test_sort_keys_are_cached_and_the_sort_is_reapplied_to_new_items(qtbot: QtBot) -> None:
+    selected_int_cols: list[int] = []
+
+    def select_date(item: Row) -> datetime.date:
+        selected_int_cols.append(item.int_col)
+        return item.date_col
+
+    view: table_view.TableView[Row, int] = table_view.TableView(
+        attrs=(
+            table_view.date(name="date_col", display_name="Date", value_selector=select_date),
+            table_view.integer(name="int_col", display_name="Integer"),
+            table_view.text(name="text_col", display_name="Text"),
+        ),
+        key_attr_name="int_col",
+        normal_font=theme.font.DEFAULT_FONT,
+        bold_font=theme.font.BOLD_FONT,
+        parent=None,
+    )
+
+    qtbot.addWidget(view)
+
+    def row(key: int, days: int, text: str = "") -> Row:
+        return Row(
+            date_col=datetime.date(2010, 1, 1) + datetime.timedelta(days=days),
+            datetime_col=datetime.datetime(2010, 1, 1),
+            int_col=key,
+            text_col=text,
+        )
+
+    rows = [row(0, 2), row(1, 1), row(2, 2), row(3, 1)]
+    view.set_items(rows)
+
+    assert view.items == rows
+
+    model = view.model()
+    assert model is not None
+
+    model.sort(1, qtc.Qt.SortOrder.DescendingOrder)
+    model.sort(0, qtc.Qt.SortOrder.AscendingOrder)
+
+    # by date, ties broken by the integer column descending
+    assert [r.int_col for r in view.items] == [3, 1, 2, 0]
+
+    selected_int_cols.clear()
+
+    model.sort(1, qtc.Qt.SortOrder.AscendingOrder)
+    model.sort(0, qtc.Qt.SortOrder.DescendingOrder)
+
+    assert [r.int_col for r in view.items] == [0, 2, 1, 3]
+    assert selected_int_cols == []
+
+    view.set_items([row(4, 0), *rows[:2], row(2, 0, "changed")])
+
+    assert [r.int_col for r in view.items] == [0, 1, 2, 4]
+    assert set(selected_int_cols) == {2, 4}
+
+    model.sort(-1)
+
+    view.set_items([row(5, 3), *view.items])
+
+    assert [r.int_col for r in view.items] == [5, 0, 1, 2, 4]
+
+
+def test_add_item_inserts_the_item_where_the_sort_puts_it(qtbot: QtBot) -> None:
+    view: table_view.TableView[Row, int] = table_view.TableView(
+        attrs=(
+            table_view.date(name="date_col", display_name="Date"),
+            table_view.integer(name="int_col", display_name="Integer"),
+        ),
+        key_attr_name="int_col",
+        normal_font=theme.font.DEFAULT_FONT,
+        bold_font=theme.font.BOLD_FONT,
+        parent=None,
+    )
+
+    qtbot.addWidget(view)
+
+    def row(key: int, days: int) -> Row:
+        return Row(
+            date_col=datetime.date(2010, 1, 1) + datetime.timedelta(days=days),
+            datetime_col=datetime.datetime(2010, 1, 1),
+            int_col=key,
+            text_col="",
+        )
+
+    model = view.model()
+    assert model is not None
+
+    inserted_rows: list[tuple[int, int]] = []
+    model.rowsInserted.connect(lambda _, first, last: inserted_rows.append((first, last)))
+
+    view.set_items([row(0, 3), row(1, 1), row(2, 2)])
+
+    model.sort(1, qtc.Qt.SortOrder.AscendingOrder)
+    model.sort(0, qtc.Qt.SortOrder.DescendingOrder)
+
+    assert [r.int_col for r in view.items] == [0, 2, 1]
+
+    inserted_rows.clear()
+
+    view.add_item(row(3, 2))
+    view.add_item(row(4, 4))
+    view.add_item(row(5, 0))
+
+    # ties on the date are broken by the integer column
+    assert [r.int_col for r in view.items] == [4, 0, 2, 3, 1, 5]
+    assert inserted_rows == [(2, 2), (0, 0), (5, 5)]
+    assert all(view.get_item(key=r.int_col) == r for r in view.items)
+
+    model.sort(-1)
+
+    view.add_item(row(6, 5))
+
+    assert [r.int_col for r in view.items] == [4, 0, 2, 3, 1, 5, 6]
@@ -0,0 +1,67 @@
+import datetime
+
+from pytestqt.qtbot import QtBot
+
+from src import domain
+from src.presentation.todo.view.dash.due_scheduler import DueScheduler
+
+TODAY = datetime.date.today()
+
+
+def test_only_keys_whose_day_has_come_are_reported(qtbot: QtBot) -> None:
+    scheduler = DueScheduler(parent=None)
+
+    reported: list[tuple[str, ...]] = []
+    scheduler.due.connect(reported.append)
+
+    scheduler.schedule(
+        (
+            ("overdue", TODAY - datetime.timedelta(days=1)),
+            ("due", TODAY),
+            ("tomorrow", TODAY + datetime.timedelta(days=1)),
+            ("rescheduled", TODAY),
+            ("removed", TODAY),
+        )
+    )
+    scheduler.schedule((("rescheduled", TODAY + datetime.timedelta(days=2)),))
+    scheduler.unschedule(("removed",))
+
+    qtbot.wait(200)
+
+    assert reported == [("overdue", "due")]
+    assert scheduler.next_due() == TODAY + datetime.timedelta(days=1)
+
+
+def test_clear_forgets_every_key(qtbot: QtBot) -> None:
+    scheduler = DueScheduler(parent=None)
+
+    reported: list[tuple[str, ...]] = []
+    scheduler.due.connect(reported.append)
+
+    scheduler.schedule((("due", TODAY),))
+    scheduler.clear()
+
+    qtbot.wait(200)
+
+    assert reported == []
+    assert scheduler.next_due() is None
+
+
+def test_day_changed_is_reported_when_the_date_rolls_over(qtbot: QtBot) -> None:
+    clock = domain.clock.FixedClock(today=TODAY - datetime.timedelta(days=1))
+    prior_clock = domain.clock.set_clock(clock)
+    try:
+        scheduler = DueScheduler(parent=None)
+
+        days_changed: list[datetime.date] = []
+        scheduler.day_changed.connect(days_changed.append)
+
+        # the next midnight after the scheduler's day has already passed, so the timer fires straight away
+        clock.advance(days=1)
+        scheduler.clear()
+
+        qtbot.waitUntil(lambda: days_changed == [TODAY])
+
+        assert scheduler.next_due() is None
+    finally:
+        domain.clock.set_clock(prior_clock)
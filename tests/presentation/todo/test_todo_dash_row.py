@@ -0,0 +1,30 @@
+import dataclasses
+import datetime
+
+from src import domain
+from src.presentation.todo.view.dash import TodoDashRow
+
+TODAY = datetime.date.today()
+
+
+def test_rows_match_the_todo_methods_they_replace() -> None:
+    todos = [
+        dataclasses.replace(holiday, last_completed=last_completed, prior_completed=prior_completed)
+        for holiday in domain.HOLIDAYS
+        for last_completed, prior_completed in (
+            (None, None),
+            (TODAY, None),
+            (None, TODAY - datetime.timedelta(days=3)),
+            (TODAY - datetime.timedelta(days=200), TODAY - datetime.timedelta(days=400)),
+        )
+    ]
+
+    rows = TodoDashRow.from_todos(todos)
+
+    assert [row.todo for row in rows] == todos
+
+    for row, todo in zip(rows, todos):
+        assert row.due_date == todo.due_date()
+        assert row.days == todo.days()
+        assert row.should_display == todo.should_display()
+        assert row.complete_button_text == ("Complete" if todo.should_display() else "Incomplete")
@@ -0,0 +1,109 @@
+import dataclasses
+
+from pytestqt.qtbot import QtBot
+
+from src import domain
+from src.presentation.category_selector import CategorySelectorWidget
+from src.presentation.todo.view.dash.requests import RefreshRequest, TodoDashRequests
+from src.presentation.todo.view.dash.state import TodoDashState
+from src.presentation.todo.view.dash.view import TodoDashView
+from src.presentation.user_selector import UserSelectorWidget
+from tests import fake
+
+
+def test_description_filter_is_applied_to_the_loaded_rows(qtbot: QtBot) -> None:
+    dash_requests = TodoDashRequests()
+
+    refresh_requests: list[RefreshRequest] = []
+    dash_requests.refresh.connect(refresh_requests.append)
+
+    view = _create_view(dash_requests)
+    qtbot.addWidget(view)
+
+    view._due_chk.setChecked(False)
+    qtbot.waitUntil(lambda: len(refresh_requests) == 1)
+
+    # every row the other filters match is loaded, the description filter is applied to them afterwards
+    view._description_filter_txt.setText("dishes")
+    qtbot.wait(300)
+
+    assert [request.description for request in refresh_requests] == [""]
+
+    todos = (
+        dataclasses.replace(domain.DEFAULT_TODO, todo_id="1" * 32, description="Wash dishes", note=""),
+        dataclasses.replace(domain.DEFAULT_TODO, todo_id="2" * 32, description="Make bed", note="Fresh sheets"),
+        dataclasses.replace(domain.DEFAULT_TODO, todo_id="3" * 32, description="Dry DISHES", note=""),
+    )
+    view.set_state(TodoDashState(todos=todos, change_cursor=1))
+
+    assert [row.todo_id for row in view._table.items] == ["1" * 32, "3" * 32]
+
+    view._description_filter_txt.setText("sheets")
+    qtbot.waitUntil(lambda: [row.todo_id for row in view._table.items] == ["2" * 32])
+
+    view._description_filter_txt.setText("")
+    qtbot.waitUntil(lambda: len(view._table.items) == 3)
+
+    assert len(refresh_requests) == 1
+
+    # a change that no longer matches the filter drops off the table but stays loaded
+    view._description_filter_txt.setText("dishes")
+    qtbot.waitUntil(lambda: len(view._table.items) == 2)
+
+    view.set_state(
+        TodoDashState(
+            changes=domain.TodoChanges(
+                cursor=2,
+                upserted=(dataclasses.replace(todos[0], description="Wash windows"),),
+                deleted_todo_ids=(),
+            ),
+        )
+    )
+
+    assert [row.todo_id for row in view._table.items] == ["3" * 32]
+
+    view._description_filter_txt.setText("windows")
+    qtbot.waitUntil(lambda: [row.todo_id for row in view._table.items] == ["1" * 32])
+
+    assert len(refresh_requests) == 1
+
+
+def test_description_filter_goes_to_the_database_when_only_due_todos_are_loaded(qtbot: QtBot) -> None:
+    dash_requests = TodoDashRequests()
+
+    refresh_requests: list[RefreshRequest] = []
+    dash_requests.refresh.connect(refresh_requests.append)
+
+    view = _create_view(dash_requests)
+    qtbot.addWidget(view)
+
+    view._description_filter_txt.setText("dishes")
+    qtbot.waitUntil(lambda: len(refresh_requests) == 1)
+
+    view.set_state(TodoDashState(todos=(), change_cursor=1))
+
+    view._description_filter_txt.setText("sheets")
+    qtbot.waitUntil(lambda: len(refresh_requests) == 2)
+
+    assert [(request.is_due, request.description) for request in refresh_requests] == [
+        (True, "dishes"),
+        (True, "sheets"),
+    ]
+
+
+def _create_view(dash_requests: TodoDashRequests, /) -> TodoDashView:
+    return TodoDashView(
+        todo_dash_requests=dash_requests,
+        category_selector=CategorySelectorWidget(
+            category_service=fake.CategoryService(),
+            include_all_category=True,
+            parent=None,
+        ),
+        user_selector=UserSelectorWidget(
+            user_service=fake.UserService(),
+            include_all_user=True,
+            parent=None,
+        ),
+        user_is_admin=False,
+        parent=None,
+    )
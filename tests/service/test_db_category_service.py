@@ -62,3 +62,32 @@ def test_round_trip(engine: sa.Engine) -> None:
     categories = category_service.all()
     assert isinstance(categories, list)
     assert len(categories) == 2
+
+
+def test_categories_are_cached_until_written(engine: sa.Engine) -> None:
+    category_service = service.CategoryService(schema=None, engine=engine)
+
+    assert category_service.add(category=CATEGORY_1) is None
+
+    statements: list[str] = []
+    sa.event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert category_service.all() == [CATEGORY_1]
+    assert category_service.all() == [CATEGORY_1]
+    assert len([statement for statement in statements if "FROM category" in statement]) == 1
+
+    assert category_service.add(category=CATEGORY_2) is None
+    assert category_service.all() == [CATEGORY_1, CATEGORY_2]
+
+    updated_category_1 = dataclasses.replace(CATEGORY_1, name="Category 0")
+    assert category_service.update(category=updated_category_1) is None
+
+    categories = category_service.all()
+    assert isinstance(categories, list)
+    assert [category.name for category in categories] == ["Category 0", "Category 2"]
+
+    assert category_service.delete(category_id=CATEGORY_2.category_id) is None
+
+    categories = category_service.all()
+    assert isinstance(categories, list)
+    assert [category.category_id for category in categories] == [CATEGORY_1.category_id]
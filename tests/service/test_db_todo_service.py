@@ -0,0 +1,626 @@
+import dataclasses
+import datetime
+import pathlib
+import threading
+import time
+
+import sqlalchemy as sa
+
+from src import adapter, domain, service
+
+TODAY = datetime.date.today()
+
+# noinspection DuplicatedCode
+DAILY_TODO = domain.Todo.daily(
+    todo_id="1" * 32,
+    category=domain.TODO_CATEGORY,
+    description="Wash dishes",
+    note="",
+    start_date=datetime.date(2010, 1, 1),
+    date_added=datetime.datetime(2011, 1, 2, 3, 4, 5, 6),
+    date_updated=None,
+    last_completed=None,
+    prior_completed=None,
+    last_completed_by=None,
+    prior_completed_by=None,
+    template_todo_id=None,
+    user=domain.DEFAULT_USER,
+)
+
+COMPLETED_DAILY_TODO = dataclasses.replace(
+    DAILY_TODO,
+    todo_id="2" * 32,
+    description="Make bed",
+    last_completed=TODAY,
+)
+
+DUE_ONCE_TODO = domain.Todo.once(
+    todo_id="3" * 32,
+    category=domain.TODO_CATEGORY,
+    description="Call plumber",
+    due_date=TODAY + datetime.timedelta(days=2),
+    advance_display_days=5,
+    expire_display_days=10,
+    note="",
+    start_date=datetime.date(2010, 1, 1),
+    date_added=datetime.datetime(2011, 1, 2, 3, 4, 5, 6),
+    date_updated=None,
+    last_completed=None,
+    prior_completed=None,
+    last_completed_by=None,
+    prior_completed_by=None,
+    template_todo_id=None,
+    user=domain.DEFAULT_USER,
+)
+
+FUTURE_ONCE_TODO = dataclasses.replace(
+    DUE_ONCE_TODO,
+    todo_id="4" * 32,
+    description="Renew passport",
+    frequency=domain.Frequency.once(
+        due_date=TODAY + datetime.timedelta(days=60),
+        advance_display_days=5,
+        expire_display_days=10,
+        start_date=datetime.date(2010, 1, 1),
+    ),
+)
+
+EXPIRED_ONCE_TODO = dataclasses.replace(
+    DUE_ONCE_TODO,
+    todo_id="5" * 32,
+    description="Return library books",
+    frequency=domain.Frequency.once(
+        due_date=TODAY - datetime.timedelta(days=60),
+        advance_display_days=5,
+        expire_display_days=10,
+        start_date=datetime.date(2010, 1, 1),
+    ),
+)
+
+WEEKLY_TODO = domain.Todo.weekly(
+    todo_id="6" * 32,
+    category=domain.TODO_CATEGORY,
+    description="Take out trash",
+    week_day=domain.Weekday.from_date(TODAY + datetime.timedelta(days=1)),
+    advance_display_days=2,
+    expire_display_days=1,
+    note="",
+    start_date=datetime.date(2010, 1, 1),
+    date_added=datetime.datetime(2011, 1, 2, 3, 4, 5, 6),
+    date_updated=None,
+    last_completed=TODAY - datetime.timedelta(days=30),
+    prior_completed=None,
+    last_completed_by=None,
+    prior_completed_by=None,
+    template_todo_id=None,
+    user=domain.DEFAULT_USER,
+)
+
+TODOS = (DAILY_TODO, COMPLETED_DAILY_TODO, DUE_ONCE_TODO, FUTURE_ONCE_TODO, EXPIRED_ONCE_TODO, WEEKLY_TODO)
+
+
+def test_due_filter_matches_should_display(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    for todo in TODOS:
+        assert todo_service.add(todo=todo) is None
+
+    due_todos = todo_service.where(
+        due_filter=True,
+        description_like=domain.Unspecified(),
+        category_id_filter=domain.Unspecified(),
+        user_id_filter=domain.Unspecified(),
+    )
+    assert isinstance(due_todos, list)
+
+    assert {todo.todo_id for todo in due_todos} == {todo.todo_id for todo in TODOS if todo.should_display()}
+
+
+def test_where_returns_todos_in_due_date_order(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    for todo in TODOS:
+        assert todo_service.add(todo=todo) is None
+
+    todos = todo_service.where(
+        due_filter=False,
+        description_like=domain.Unspecified(),
+        category_id_filter=domain.Unspecified(),
+        user_id_filter=domain.Unspecified(),
+    )
+    assert isinstance(todos, list)
+
+    due_dates = [todo.due_date() for todo in todos]
+    assert due_dates == sorted(due_dates)
+    assert {todo.todo_id for todo in todos} == {todo.todo_id for todo in TODOS}
+
+
+def test_next_appearance_is_the_earliest_window_to_open_among_hidden_todos(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    def next_appearance() -> datetime.date | None | domain.Error:
+        return todo_service.next_appearance(
+            description_like=domain.Unspecified(),
+            category_id_filter=domain.Unspecified(),
+            user_id_filter=domain.Unspecified(),
+        )
+
+    for todo in (DUE_ONCE_TODO, FUTURE_ONCE_TODO, EXPIRED_ONCE_TODO):
+        assert todo_service.add(todo=todo) is None
+
+    # the due todo's window closing is the dashboard's business, the future todo's window opening isn't
+    assert next_appearance() == TODAY + datetime.timedelta(days=55)
+
+    assert todo_service.add(todo=COMPLETED_DAILY_TODO) is None
+
+    assert next_appearance() == TODAY + datetime.timedelta(days=1)
+
+    # the filters the dashboard was loaded with apply too
+    assert todo_service.next_appearance(
+        description_like=FUTURE_ONCE_TODO.description,
+        category_id_filter=domain.Unspecified(),
+        user_id_filter=domain.Unspecified(),
+    ) == TODAY + datetime.timedelta(days=55)
+
+
+def test_occurring_between_leaves_out_todos_that_cannot_fall_in_the_range(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    not_started_todo = dataclasses.replace(
+        WEEKLY_TODO,
+        todo_id="9" * 32,
+        frequency=dataclasses.replace(WEEKLY_TODO.frequency, start_date=TODAY + datetime.timedelta(days=31)),
+    )
+
+    for todo in (*TODOS, not_started_todo):
+        assert todo_service.add(todo=todo) is None
+
+    todos = todo_service.occurring_between(
+        start=TODAY,
+        end=TODAY + datetime.timedelta(days=30),
+        category_id_filter=domain.Unspecified(),
+        user_id_filter=domain.Unspecified(),
+    )
+    assert isinstance(todos, list)
+
+    assert {todo.todo_id for todo in todos} == {
+        DAILY_TODO.todo_id,
+        COMPLETED_DAILY_TODO.todo_id,
+        DUE_ONCE_TODO.todo_id,
+        WEEKLY_TODO.todo_id,
+    }
+
+
+def test_stale_display_windows_are_refreshed(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+
+        for todo in TODOS:
+            assert adapter.todo_repo.add(schema=None, con=con, todo=todo) is None
+
+        # simulate rows that were last calculated a long time ago
+        con.execute(
+            sa.update(adapter.db.todo(schema=None)).values(
+                display_start=None,
+                display_end=None,
+                display_as_of=datetime.date(2000, 1, 1),
+            )
+        )
+
+    def stale_row_count() -> int:
+        with engine.begin() as con:
+            return con.execute(
+                sa.select(sa.func.count())
+                .select_from(adapter.db.todo(schema=None))
+                .where(adapter.db.todo(schema=None).c.display_as_of != TODAY)
+            ).scalar_one()
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    def due_todo_ids() -> set[str]:
+        todos = todo_service.where(
+            due_filter=True,
+            description_like=domain.Unspecified(),
+            category_id_filter=domain.Unspecified(),
+            user_id_filter=domain.Unspecified(),
+        )
+        assert isinstance(todos, list)
+        return {todo.todo_id for todo in todos}
+
+    # reads leave the windows alone
+    assert due_todo_ids() == set()
+    assert stale_row_count() == len(TODOS)
+
+    assert todo_service.refresh_display_windows() is None
+    assert stale_row_count() == 0
+
+    assert due_todo_ids() == {todo.todo_id for todo in TODOS if todo.should_display()}
+
+    with engine.begin() as con:
+        assert adapter.todo_repo.refresh_display_windows(schema=None, con=con, ref_date=TODAY) == 0
+
+
+def test_mark_complete_and_mark_incomplete_shift_completion_columns(engine: sa.Engine) -> None:
+    user = domain.User(
+        user_id="a" * 32,
+        display_name="Mark",
+        username="mark",
+        is_admin=False,
+        date_added=datetime.datetime(2011, 1, 2, 3, 4, 5),
+        date_updated=None,
+    )
+    prior_completed = TODAY - datetime.timedelta(days=7)
+
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+        assert adapter.user_repo.add(schema=None, con=con, user=user) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=DAILY_TODO) is None
+        assert (
+            adapter.todo_repo.add(
+                schema=None,
+                con=con,
+                todo=dataclasses.replace(WEEKLY_TODO, last_completed=prior_completed, last_completed_by=user),
+            )
+            is None
+        )
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    assert todo_service.mark_complete_many(todo_ids=[DAILY_TODO.todo_id, WEEKLY_TODO.todo_id], user=None) is None
+
+    daily_todo = todo_service.get(todo_id=DAILY_TODO.todo_id)
+    assert isinstance(daily_todo, domain.Todo)
+    assert daily_todo.last_completed == TODAY
+    assert daily_todo.last_completed_by is None
+    assert daily_todo.prior_completed is None
+    assert daily_todo.prior_completed_by is None
+
+    weekly_todo = todo_service.get(todo_id=WEEKLY_TODO.todo_id)
+    assert isinstance(weekly_todo, domain.Todo)
+    assert weekly_todo.last_completed == TODAY
+    assert weekly_todo.last_completed_by is None
+    assert weekly_todo.prior_completed == prior_completed
+    assert weekly_todo.prior_completed_by is not None
+    assert weekly_todo.prior_completed_by.user_id == user.user_id
+
+    assert todo_service.mark_incomplete_many(todo_ids=[DAILY_TODO.todo_id, WEEKLY_TODO.todo_id]) is None
+
+    daily_todo = todo_service.get(todo_id=DAILY_TODO.todo_id)
+    assert isinstance(daily_todo, domain.Todo)
+    assert daily_todo.last_completed is None
+
+    weekly_todo = todo_service.get(todo_id=WEEKLY_TODO.todo_id)
+    assert isinstance(weekly_todo, domain.Todo)
+    assert weekly_todo.last_completed == prior_completed
+    assert weekly_todo.last_completed_by is not None
+    assert weekly_todo.last_completed_by.user_id == user.user_id
+    assert weekly_todo.prior_completed is None
+    assert weekly_todo.prior_completed_by is None
+
+    # undoing with nothing left to undo is a no-op
+    assert todo_service.mark_incomplete(todo_id=DAILY_TODO.todo_id) is None
+    assert todo_service.mark_complete(todo_id=DAILY_TODO.todo_id, user=user) is None
+
+    daily_todo = todo_service.get(todo_id=DAILY_TODO.todo_id)
+    assert isinstance(daily_todo, domain.Todo)
+    assert daily_todo.last_completed == TODAY
+    assert daily_todo.last_completed_by is not None
+    assert daily_todo.last_completed_by.user_id == user.user_id
+
+
+def test_completion_history_supports_undoing_more_than_one_completion(engine: sa.Engine) -> None:
+    user = domain.User(
+        user_id="a" * 32,
+        display_name="Mark",
+        username="mark",
+        is_admin=False,
+        date_added=datetime.datetime(2011, 1, 2, 3, 4, 5),
+        date_updated=None,
+    )
+    completion_dates = [TODAY - datetime.timedelta(days=days) for days in (14, 7, 0)]
+
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+        assert adapter.user_repo.add(schema=None, con=con, user=user) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=DAILY_TODO) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=WEEKLY_TODO) is None
+
+        for completed_on in completion_dates:
+            assert (
+                adapter.todo_repo.mark_complete_many(
+                    schema=None,
+                    con=con,
+                    todo_ids=[DAILY_TODO.todo_id],
+                    completed_by_user_id=user.user_id,
+                    completed_on=completed_on,
+                )
+                is None
+            )
+
+        assert (
+            adapter.todo_repo.mark_complete_many(
+                schema=None,
+                con=con,
+                todo_ids=[WEEKLY_TODO.todo_id],
+                completed_by_user_id=None,
+                completed_on=completion_dates[1],
+            )
+            is None
+        )
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    history = todo_service.completion_history(todo_id=DAILY_TODO.todo_id)
+    assert history == [
+        domain.TodoCompletion(todo_id=DAILY_TODO.todo_id, completed_on=completed_on, completed_by_user_id=user.user_id)
+        for completed_on in reversed(completion_dates)
+    ]
+
+    assert (
+        todo_service.completions(
+            user_id_filter=user.user_id,
+            completed_from=completion_dates[1],
+            completed_to=TODAY,
+        )
+        == history[:2]
+    )
+    assert [
+        completion.todo_id
+        for completion in todo_service.completions(  # type: ignore
+            user_id_filter=domain.Unspecified(),
+            completed_from=completion_dates[1],
+            completed_to=completion_dates[1],
+        )
+    ] == [DAILY_TODO.todo_id, WEEKLY_TODO.todo_id]
+
+    assert todo_service.mark_incomplete(todo_id=DAILY_TODO.todo_id) is None
+    assert todo_service.mark_incomplete(todo_id=DAILY_TODO.todo_id) is None
+
+    daily_todo = todo_service.get(todo_id=DAILY_TODO.todo_id)
+    assert isinstance(daily_todo, domain.Todo)
+    assert daily_todo.last_completed == completion_dates[0]
+    assert daily_todo.last_completed_by is not None
+    assert daily_todo.last_completed_by.user_id == user.user_id
+    assert daily_todo.prior_completed is None
+    assert daily_todo.prior_completed_by is None
+
+    assert todo_service.completion_history(todo_id=DAILY_TODO.todo_id) == history[2:]
+    assert (
+        todo_service.completions(user_id_filter=user.user_id, completed_from=completion_dates[1], completed_to=TODAY)
+        == []
+    )
+
+    # the log is read through its indexes rather than scanned
+    with engine.connect() as con:
+        plan = " ".join(
+            str(row[-1])
+            for row in con.execute(
+                sa.text("EXPLAIN QUERY PLAN SELECT * FROM todo_completion WHERE todo_id = :todo_id"),
+                {"todo_id": DAILY_TODO.todo_id},
+            )
+        )
+    assert "ix_todo_completion_todo_id_completed_on" in plan
+
+
+def test_saving_a_stale_copy_keeps_completions_and_deletes(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=DAILY_TODO) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=WEEKLY_TODO) is None
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    stale_daily_todo = todo_service.get(todo_id=DAILY_TODO.todo_id)
+    assert isinstance(stale_daily_todo, domain.Todo)
+
+    stale_weekly_todo = todo_service.get(todo_id=WEEKLY_TODO.todo_id)
+    assert isinstance(stale_weekly_todo, domain.Todo)
+
+    # another client completes one todo and deletes the other after this client read them
+    assert todo_service.mark_complete(todo_id=DAILY_TODO.todo_id, user=None) is None
+    assert todo_service.delete(todo_id=WEEKLY_TODO.todo_id) is None
+
+    saved_daily_todo = todo_service.save(todo=dataclasses.replace(stale_daily_todo, description="Wash all dishes"))
+    assert isinstance(saved_daily_todo, domain.Todo)
+    assert saved_daily_todo.description == "Wash all dishes"
+    assert saved_daily_todo.last_completed == TODAY
+
+    daily_todo = todo_service.get(todo_id=DAILY_TODO.todo_id)
+    assert isinstance(daily_todo, domain.Todo)
+    assert daily_todo.description == "Wash all dishes"
+    assert daily_todo.last_completed == TODAY
+    assert daily_todo.prior_completed is None
+
+    assert isinstance(todo_service.save(todo=stale_weekly_todo), domain.Todo)
+
+    remaining_todos = todo_service.where(
+        due_filter=False,
+        description_like=domain.Unspecified(),
+        category_id_filter=domain.Unspecified(),
+        user_id_filter=domain.Unspecified(),
+    )
+    assert isinstance(remaining_todos, list)
+    assert [todo.todo_id for todo in remaining_todos] == [DAILY_TODO.todo_id]
+
+
+def test_completing_missing_or_deleted_todos_logs_nothing(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=DAILY_TODO) is None
+        assert adapter.todo_repo.add(schema=None, con=con, todo=WEEKLY_TODO) is None
+        assert adapter.todo_repo.delete(schema=None, con=con, todo_id=WEEKLY_TODO.todo_id) is None
+
+        assert (
+            adapter.todo_repo.mark_complete_many(
+                schema=None,
+                con=con,
+                todo_ids=[DAILY_TODO.todo_id, WEEKLY_TODO.todo_id, "f" * 32],
+                completed_by_user_id=None,
+                completed_on=TODAY,
+            )
+            is None
+        )
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    assert [
+        completion.todo_id
+        for completion in todo_service.completions(  # type: ignore
+            user_id_filter=domain.Unspecified(),
+            completed_from=TODAY,
+            completed_to=TODAY,
+        )
+    ] == [DAILY_TODO.todo_id]
+
+
+def test_bulk_writes(engine: sa.Engine) -> None:
+    user = domain.User(
+        user_id="b" * 32,
+        display_name="Steve",
+        username="steve",
+        is_admin=False,
+        date_added=datetime.datetime(2011, 1, 2, 3, 4, 5),
+        date_updated=None,
+    )
+
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.HOLIDAY_CATEGORY) is None
+        assert adapter.user_repo.add(schema=None, con=con, user=user) is None
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    holidays = [
+        dataclasses.replace(holiday, todo_id=domain.create_uuid(), template_todo_id=holiday.todo_id)
+        for holiday in domain.HOLIDAYS
+    ]
+
+    assert todo_service.add_many(todos=holidays, chunk_size=3) is None
+
+    todos = todo_service.get_many(todo_ids=[holiday.todo_id for holiday in holidays])
+    assert isinstance(todos, list)
+    assert len(todos) == len(holidays)
+
+    update_result = todo_service.update_many(
+        todos=[dataclasses.replace(holiday, user=user) for holiday in holidays],
+        chunk_size=3,
+    )
+    assert update_result is None
+
+    todos = todo_service.get_many(todo_ids=[holiday.todo_id for holiday in holidays])
+    assert isinstance(todos, list)
+    assert all(todo.user.user_id == user.user_id for todo in todos)
+    assert all(todo.date_updated is not None for todo in todos)
+
+    assert todo_service.delete_many(todo_ids=[holiday.todo_id for holiday in holidays[1:]], chunk_size=3) is None
+
+    remaining_todos = todo_service.where(
+        due_filter=False,
+        description_like=domain.Unspecified(),
+        category_id_filter=domain.Unspecified(),
+        user_id_filter=domain.Unspecified(),
+    )
+    assert isinstance(remaining_todos, list)
+    assert [todo.todo_id for todo in remaining_todos] == [holidays[0].todo_id]
+
+
+def test_changes_since_returns_only_what_changed(engine: sa.Engine) -> None:
+    with engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+
+    todo_service = service.TodoService(schema=None, engine=engine, username="test")
+
+    assert todo_service.add(todo=DAILY_TODO) is None
+    assert todo_service.add(todo=WEEKLY_TODO) is None
+
+    cursor = todo_service.change_cursor()
+    assert isinstance(cursor, int)
+
+    def changes_since(cursor: int, /) -> domain.TodoChanges:
+        changes = todo_service.changes_since(
+            cursor=cursor,
+            due_filter=False,
+            description_like="dishes",
+            category_id_filter=domain.Unspecified(),
+            user_id_filter=domain.Unspecified(),
+        )
+        assert isinstance(changes, domain.TodoChanges)
+        return changes
+
+    # nothing written since the cursor was read
+    assert changes_since(cursor) == domain.TodoChanges(cursor=cursor, upserted=(), deleted_todo_ids=())
+
+    assert todo_service.add(todo=DUE_ONCE_TODO) is None
+    assert todo_service.update(todo=dataclasses.replace(DAILY_TODO, note="Use the good soap")) is None
+
+    changes = changes_since(cursor)
+    assert changes.cursor > cursor
+    assert [todo.todo_id for todo in changes.upserted] == [DAILY_TODO.todo_id]
+    assert changes.upserted[0].note == "Use the good soap"
+    # written, but outside the filters, so whoever is showing it should drop it
+    assert changes.deleted_todo_ids == (DUE_ONCE_TODO.todo_id,)
+
+    cursor = changes.cursor
+
+    assert todo_service.mark_complete(todo_id=DAILY_TODO.todo_id, user=None) is None
+
+    changes = changes_since(cursor)
+    assert [todo.last_completed for todo in changes.upserted] == [TODAY]
+
+    cursor = changes.cursor
+
+    assert todo_service.delete(todo_id=DAILY_TODO.todo_id) is None
+
+    changes = changes_since(cursor)
+    assert changes.upserted == ()
+    assert changes.deleted_todo_ids == (DAILY_TODO.todo_id,)
+    assert todo_service.change_cursor() == changes.cursor
+
+
+def test_wait_for_changes_sees_writes_from_another_client(tmp_path: pathlib.Path) -> None:
+    db_url = f"sqlite:///{tmp_path / 'todo.db'}"
+
+    # two engines on one file stand in for two running clients
+    this_engine = adapter.db.create_engine(url=db_url)
+    assert isinstance(this_engine, sa.Engine)
+    assert adapter.db.create_tables(schema=None, engine=this_engine) is None
+
+    other_engine = adapter.db.create_engine(url=db_url)
+    assert isinstance(other_engine, sa.Engine)
+
+    with other_engine.begin() as con:
+        assert adapter.category_repo.add(schema=None, con=con, category=domain.TODO_CATEGORY) is None
+
+    this_todo_service = service.TodoService(schema=None, engine=this_engine, username="test")
+    other_todo_service = service.TodoService(schema=None, engine=other_engine, username="test")
+
+    cursor = this_todo_service.change_cursor()
+    assert isinstance(cursor, int)
+
+    # nothing changed, so it waits out the timeout
+    assert this_todo_service.wait_for_changes(cursor=cursor, timeout_seconds=0.1) == cursor
+
+    writer = threading.Timer(0.2, lambda: other_todo_service.add(todo=DAILY_TODO))
+    writer.start()
+
+    started = time.monotonic()
+    new_cursor = this_todo_service.wait_for_changes(cursor=cursor, timeout_seconds=10)
+    writer.join()
+
+    assert isinstance(new_cursor, int)
+    assert new_cursor > cursor
+    assert time.monotonic() - started < 10
+
+    this_engine.dispose()
+    other_engine.dispose()